@@ -0,0 +1,54 @@
+""" Times the equations classes against their float kernels in fastequations.
+
+    python benchmarks/bench_equations.py [number]
+"""
+from __future__ import print_function
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))  # use the exodata in this repo
+
+setup = """
+import numpy as np
+from exodata import astroquantities as aq
+from exodata import equations as eq
+from exodata import fastequations as feq
+
+a, M_s, R_s, R_p, T_s = 0.05, 1.1, 1.2, 1.3, 5800.
+aQ, M_sQ, R_sQ, R_pQ, T_sQ = a * aq.au, M_s * aq.M_s, R_s * aq.R_s, R_p * aq.R_j, T_s * aq.K
+aArr = np.random.uniform(0.01, 5, 100000)
+"""
+
+benchmarks = (
+    ('KeplersThirdLaw.P',
+     'eq.KeplersThirdLaw(a=aQ, M_s=M_sQ).P',
+     'feq.KeplersThirdLaw.P(a=a, M_s=M_s)'),
+    ('MeanPlanetTemp.T_p',
+     'eq.MeanPlanetTemp(0.3, T_sQ, R_sQ, aQ).T_p',
+     'feq.MeanPlanetTemp.T_p(0.3, T_s, R_s, a)'),
+    ('TransitDepth.depth',
+     'eq.TransitDepth(R_s=R_sQ, R_p=R_pQ).depth',
+     'feq.TransitDepth.depth(R_s=R_s, R_p=R_p)'),
+    ('TransitDuration.Td',
+     'eq.TransitDuration(P=3. * aq.day, a=aQ, Rp=R_pQ, Rs=R_sQ, i=89. * aq.deg, e=0.1, w=30. * aq.deg).Td',
+     'feq.TransitDuration.Td(P=3., a=a, Rp=R_p, Rs=R_s, i=89., e=0.1, w=30.)'),
+)
+
+
+def run(number=2000):
+    print('{0:<22}{1:>14}{2:>14}{3:>10}'.format('equation', 'classes (us)', 'fast (us)', 'speedup'))
+
+    for name, classStmt, fastStmt in benchmarks:
+        classTime = min(timeit.repeat(classStmt, setup, number=number, repeat=3)) / number * 1e6
+        fastTime = min(timeit.repeat(fastStmt, setup, number=number, repeat=3)) / number * 1e6
+        print('{0:<22}{1:>14.2f}{2:>14.2f}{3:>9.0f}x'.format(name, classTime, fastTime, classTime / fastTime))
+
+    # 100000 periods in one call vs a loop over the classes
+    arrayTime = min(timeit.repeat('feq.KeplersThirdLaw.P(a=aArr, M_s=M_s)', setup, number=10, repeat=3)) / 10
+    print('\nKeplersThirdLaw.P on an array of 100000 values: {0:.2f} ms ({1:.3f} us per value)'.format(
+        arrayTime * 1e3, arrayTime / 100000 * 1e6))
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,313 @@
+""" Benchmark suite for loading, searching, derived values, equations, limb darkening, magnitudes and plotting.
+
+Everything runs offline against a catalogue generated with exodata.synthetic in a temporary directory (the same
+catalogue for the same options and --seed), use --systems to benchmark at larger scales. Each benchmark is timed over several repeats and its peak memory allocation is measured in a
+separate run with tracemalloc. Results are written as JSON so runs can be compared across commits
+
+    python benchmarks/run_benchmarks.py --output before.json
+    git checkout other-branch
+    python benchmarks/run_benchmarks.py --output after.json --compare before.json
+
+    python benchmarks/run_benchmarks.py --filter equations. --repeat 10
+"""
+from __future__ import print_function
+import os
+import io
+import sys
+import gc
+import json
+import gzip
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import warnings
+import subprocess
+import tracemalloc
+from timeit import default_timer
+
+import numpy as np
+
+import matplotlib
+
+if __name__ == '__main__':  # run as a script, so use the exodata in this repo without a display. Left alone when
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))  # imported, eg by the tests
+    matplotlib.use('Agg')
+
+import exodata
+from exodata import astroquantities as aq
+from exodata import equations as eq
+from exodata import plots
+from exodata import columns
+from exodata import limbdarkening
+from exodata import synthetic
+from exodata.astroclasses import Magnitude, HierarchyError
+from exodata.database import OECDatabase
+
+_spectralTypes = ('F5V', 'G2V', 'G8V', 'K2V', 'K5V', 'M2V')
+
+
+def _writeCatalogue(directory, args):
+    """ writes a synthetic catalogue as a systems folder and a gzipped stream, returns the stream path
+    """
+
+    systems = synthetic.generateSystems(args.systems, binaryFraction=args.binary_fraction,
+                                        multiPlanetFraction=args.multi_planet_fraction,
+                                        circumbinaryFraction=args.circumbinary_fraction,
+                                        missingRate=args.missing_rate, seed=args.seed)
+    synthetic.writeSystemsFolder(directory, systems)
+
+    return synthetic.writeSystemsStream(os.path.join(directory, '..', 'systems.xml.gz'), systems)
+
+
+class Benchmark(object):
+    """ a named statement to time, setup is called (untimed) before each repeat and its return value is passed to
+    run, ie to clear caches so every repeat measures the same work
+    """
+
+    def __init__(self, name, run, setup=None, number=1):
+        self.name = name
+        self.run = run
+        self.setup = setup
+        self.number = number
+
+    def _prepare(self):
+        return self.setup() if self.setup is not None else None
+
+    def measure(self, repeat):
+        times = []
+        for i in range(repeat):
+            state = self._prepare()
+            gc.collect()
+            start = default_timer()
+            for j in range(self.number):
+                self.run(state)
+            times.append((default_timer() - start) / self.number)
+
+        state = self._prepare()
+        gc.collect()
+        tracemalloc.start()
+        self.run(state)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        return {
+            'min': min(times),
+            'median': float(np.median(times)),
+            'mean': float(np.mean(times)),
+            'max': max(times),
+            'repeat': repeat,
+            'number': self.number,
+            'peakMemory': peak,
+        }
+
+
+def _plotBenchmark(name, create, method='plot', **kwargs):
+
+    def run(state):
+        with plots.headless():
+            plotter = create()
+            fig = getattr(plotter, method)(**kwargs)
+            if fig is None:  # most plot methods draw on plotter.fig
+                fig = plotter.fig
+            fig.savefig(io.BytesIO(), format='png')
+
+    return Benchmark(name, run)
+
+
+def _clearCaches(database):
+    for objects in (database.systems, database.binaries, database.stars, database.planets):
+        for obj in objects:
+            obj.clearCache()
+
+
+def buildBenchmarks(directory, streamPath):
+
+    systemsPath = os.path.join(directory, '')
+
+    def loadStream():
+        with gzip.open(streamPath, 'rb') as f:
+            return OECDatabase(f, stream=True)
+
+    database = OECDatabase(systemsPath)
+    planets = database.planets
+    stars = database.stars
+    planetNames = [planet.name for planet in planets[::max(len(planets) // 20, 1)]]
+
+    def accessAll(path):
+        get = columns.accessor(path)
+
+        def run(state):
+            values = []
+            for planet in planets:
+                try:
+                    values.append(get(planet))
+                except HierarchyError:  # ie star.d of a circumbinary planet
+                    values.append(np.nan)
+            return values
+        return run
+
+    def limbDarkening(state):
+        for star in stars:
+            try:
+                star.getLimbdarkeningCoeff()
+            except ValueError:  # no coefficients in the table for the star
+                pass
+
+    benchmarks = [
+        Benchmark('load.folder', lambda state: OECDatabase(systemsPath)),
+        Benchmark('load.stream', lambda state: loadStream()),
+        Benchmark('search.searchPlanet', lambda state: [database.searchPlanet(name) for name in planetNames]),
+        Benchmark('search.planetDict', lambda state: [database.planetDict[name] for name in planetNames], number=100),
+    ]
+
+    # derived values, cold after clearing the caches and warm once cached
+    for path in ('R', 'M', 'T', 'a', 'star.d', 'type()', 'isTransiting', 'calcTransitDuration()'):
+        benchmarks.append(Benchmark('properties.{0}.cold'.format(path.rstrip('()')), accessAll(path),
+                                    setup=lambda: _clearCaches(database)))
+    benchmarks.append(Benchmark('properties.T.warm', accessAll('T'), setup=lambda: [planet.T for planet in planets]))
+
+    a, M_s, R_s, T_s = 0.05 * aq.au, 1.1 * aq.M_s, 1.2 * aq.R_s, 5800. * aq.K
+    R_p, M_p, P = 1.3 * aq.R_j, 0.8 * aq.M_j, 3. * aq.day
+    equations = (
+        ('ScaleHeight', lambda: eq.ScaleHeight(T_eff=1200. * aq.K, mu=2.3 * aq.atomic_mass_unit,
+                                                g=25. * aq.m / aq.s**2).H),
+        ('MeanPlanetTemp', lambda: eq.MeanPlanetTemp(0.3, T_s, R_s, a).T_p),
+        ('StellarLuminosity', lambda: eq.StellarLuminosity(R=R_s, T=T_s).L),
+        ('KeplersThirdLaw', lambda: eq.KeplersThirdLaw(a=a, M_s=M_s).P),
+        ('SurfaceGravity', lambda: eq.SurfaceGravity(M=M_p, R=R_p).g),
+        ('Logg', lambda: eq.Logg(M=M_s, R=R_s).logg),
+        ('TransitDepth', lambda: eq.TransitDepth(R_s=R_s, R_p=R_p).depth),
+        ('Density', lambda: eq.Density(M=M_p, R=R_p).density),
+        ('TransitDuration', lambda: eq.TransitDuration(P=P, a=a, Rp=R_p, Rs=R_s, i=89. * aq.deg, e=0.1,
+                                                       w=30. * aq.deg).Td),
+        ('ImpactParameter', lambda: eq.ImpactParameter(a=a, R_s=R_s, i=89. * aq.deg).b),
+    )
+    for name, calculate in equations:
+        benchmarks.append(Benchmark('equations.{0}'.format(name), lambda state, calculate=calculate: calculate(),
+                                    number=200))
+
+    benchmarks += [
+        Benchmark('limbdarkening.getLimbdarkeningCoeff', limbDarkening,
+                  setup=lambda: (limbdarkening.loadGrid(), _clearCaches(database))),
+        Benchmark('magnitude.convert',
+                  lambda state: [magnitude.convert('K') for magnitude in state],
+                  setup=lambda: [Magnitude(spectralType, magV=10.) for spectralType in _spectralTypes * 50]),
+    ]
+
+    bins = (0, 0.1, 0.5, 1, 2, float('inf'))
+    benchmarks += [
+        _plotBenchmark('plots.GeneralPlotter.scatter', lambda: plots.GeneralPlotter(planets, 'R', 'M'),
+                       mode='scatter'),
+        _plotBenchmark('plots.GeneralPlotter.density', lambda: plots.GeneralPlotter(planets, 'R', 'M'),
+                       mode='density'),
+        _plotBenchmark('plots.DataPerParameterBin.bar', lambda: plots.DataPerParameterBin(planets, 'R', bins),
+                       method='plotBarChart'),
+        _plotBenchmark('plots.DataPerParameterBin.pie', lambda: plots.DataPerParameterBin(planets, 'R', bins),
+                       method='plotPieChart'),
+        _plotBenchmark('plots.DiscoveryMethodByYear', lambda: plots.DiscoveryMethodByYear(planets)),
+    ]
+
+    return benchmarks
+
+
+def _gitCommit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'], cwd=os.path.dirname(os.path.abspath(__file__)),
+                                       stderr=subprocess.STDOUT).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _metadata(args):
+    return {
+        'commit': _gitCommit(),
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'exodata': exodata.__version__,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'matplotlib': matplotlib.__version__,
+        'platform': platform.platform(),
+        'systems': args.systems,
+        'binaryFraction': args.binary_fraction,
+        'multiPlanetFraction': args.multi_planet_fraction,
+        'circumbinaryFraction': args.circumbinary_fraction,
+        'missingRate': args.missing_rate,
+        'seed': args.seed,
+    }
+
+
+def compare(results, baseline):
+    """ table of the change in median time and peak memory of each benchmark in both results
+    """
+
+    lines = ['{0:<40}{1:>12}{2:>12}{3:>9}{4:>12}'.format('benchmark', 'base (ms)', 'new (ms)', 'ratio', 'mem ratio')]
+    for name, new in results['benchmarks'].items():
+        try:
+            base = baseline['benchmarks'][name]
+        except KeyError:
+            continue
+        memoryRatio = new['peakMemory'] / float(base['peakMemory']) if base['peakMemory'] else float('nan')
+        lines.append('{0:<40}{1:>12.3f}{2:>12.3f}{3:>8.2f}x{4:>11.2f}x'.format(
+            name, base['median'] * 1e3, new['median'] * 1e3, new['median'] / base['median'], memoryRatio))
+
+    return '\n'.join(lines)
+
+
+def run(args):
+    tempDir = tempfile.mkdtemp()
+    try:
+        directory = os.path.join(tempDir, 'systems')
+        os.mkdir(directory)
+        streamPath = _writeCatalogue(directory, args)
+
+        results = {'metadata': _metadata(args), 'benchmarks': {}}
+        print('{0:<40}{1:>12}{2:>12}{3:>14}'.format('benchmark', 'min (ms)', 'median (ms)', 'peak mem (kB)'))
+
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')  # matplotlib layout warnings etc
+            for benchmark in buildBenchmarks(directory, streamPath):
+                if args.filter and args.filter not in benchmark.name:
+                    continue
+                result = benchmark.measure(args.repeat)
+                results['benchmarks'][benchmark.name] = result
+                print('{0:<40}{1:>12.3f}{2:>12.3f}{3:>14.1f}'.format(benchmark.name, result['min'] * 1e3,
+                                                                      result['median'] * 1e3,
+                                                                      result['peakMemory'] / 1e3))
+    finally:
+        shutil.rmtree(tempDir)
+
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--systems', type=int, default=500, help='number of systems in the generated catalogue')
+    parser.add_argument('--binary-fraction', type=float, default=0.1, help='fraction of binary systems')
+    parser.add_argument('--multi-planet-fraction', type=float, default=0.3, help='fraction of multi planet systems')
+    parser.add_argument('--circumbinary-fraction', type=float, default=0.1,
+                        help='fraction of binary systems whose planets orbit the binary')
+    parser.add_argument('--missing-rate', type=float, default=0.1, help='probability each value is missing')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the generated catalogue')
+    parser.add_argument('--repeat', type=int, default=5, help='number of times each benchmark is timed')
+    parser.add_argument('--filter', help='only run benchmarks whose name contains this')
+    parser.add_argument('--output', help='file to write the results to as JSON')
+    parser.add_argument('--compare', help='results JSON of an earlier run to compare to')
+    args = parser.parse_args(argv)
+
+    results = run(args)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+
+    if args.compare:
+        with open(args.compare) as f:
+            print('\n' + compare(results, json.load(f)))
+
+    return results
+
+
+if __name__ == '__main__':
+    main()
@@ -15,7 +15,30 @@ def test():
 # Exodata Imports
 import sys
 
-# Import package modules
-from . import assumptions, astroclasses, astroquantities, equations, example, flags, plots
-# import OEC database
-from .database import OECDatabase, load_db_from_url
+# Package modules are imported the first time they are used (ie exodata.plots) so that importing exodata doesn't import
+# matplotlib, astropy etc until they are needed. This uses a module __getattr__ (python 3.7+), older versions import
+# everything up front below
+_submodules = ('assumptions', 'astroclasses', 'astroquantities', 'columns', 'database', 'equations', 'example',
+               'fastequations', 'flags', 'instrumentation', 'limbdarkening', 'plots', 'render', 'synthetic')
+_databaseNames = ('OECDatabase', 'load_db_from_url')
+
+
+def __getattr__(name):
+    import importlib  # only called on python 3.7+, python 2.6 has no importlib
+
+    if name in _submodules:
+        return importlib.import_module('.' + name, __name__)
+    elif name in _databaseNames:  # import OEC database
+        return getattr(importlib.import_module('.database', __name__), name)
+
+    raise AttributeError("module {0!r} has no attribute {1!r}".format(__name__, name))
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_submodules) | set(_databaseNames))
+
+
+if sys.version_info < (3, 7):  # no module __getattr__, import everything as before
+    from . import assumptions, astroclasses, astroquantities, columns, equations, example, fastequations, flags, \
+        instrumentation, limbdarkening, plots, render, synthetic
+    from .database import OECDatabase, load_db_from_url
@@ -0,0 +1,50 @@
+""" Module attributes that are only created the first time they are used, so importing exodata doesn't read the data
+files or build objects that might never be needed.
+"""
+import sys
+
+
+class LazyAttributes(object):
+    """ Fills in module globals on first use.
+
+        _lazyTables = LazyAttributes(globals(), {'magDict': _loadMagDict})
+        __getattr__ = _lazyTables.moduleGetattr  # so module.magDict works from outside the module
+
+        _lazyTables('magDict')  # inside the module, global lookups don't go through the module __getattr__
+
+    Module __getattr__ is only used by python 3.7+, on older versions the attributes are created straight away so the
+    loaders must only use what is defined before this.
+
+    :param moduleGlobals: globals() of the module
+    :param loaders: dict of attribute name: function returning a dict of the attributes it creates. One loader can
+        create several attributes ie a table and its index.
+    """
+
+    def __init__(self, moduleGlobals, loaders):
+        self._globals = moduleGlobals
+        self._loaders = loaders
+
+        if sys.version_info < (3, 7):  # no module __getattr__
+            self.loadAll()
+
+    def loadAll(self):
+        """ creates every attribute that hasn't been yet
+        """
+
+        for name in self._loaders:
+            self(name)
+
+    def __call__(self, name):
+        try:
+            return self._globals[name]
+        except KeyError:
+            self._globals.update(self._loaders[name]())
+            return self._globals[name]
+
+    def __contains__(self, name):
+        return name in self._loaders
+
+    def moduleGetattr(self, name):
+        if name in self._loaders:
+            return self(name)
+        raise AttributeError("module {0!r} has no attribute {1!r}".format(self._globals['__name__'], name))
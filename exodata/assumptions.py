@@ -5,14 +5,145 @@ is defined or other characteristics. Im using a simple 'OK' method here, overwri
 this module and defining or changing the variables.
 
 If anyone has a good solution to this issue, please create it in a fork or email me!
+
+Changes to planetAssumptions are picked up automatically, the array classifiers and the cached values on the planets
+are recalculated the next time they are used. To compare results under different assumptions add a named profile with
+addProfile and switch to it with useProfile, values are cached separately for each profile. The assumptions in use
+(the profile from useProfile if there is one) are returned by currentAssumptions().
 """
+from collections import namedtuple, OrderedDict
+from contextlib import contextmanager
+import itertools
+
 import numpy as np
 
 from . import astroquantities as aq
+from .params import ContextVar, _ThreadScope
 
 # TODO open an issue about this module for community discussion
 
-planetAssumptions = {
+# Every version of an assumption has a token, a new one is given each time it's modified. They are compared by
+# assumptionsFingerprint to tell when cached values calculated from the assumptions are out of date
+_tokenCounter = itertools.count()
+
+
+class _AssumptionList(list):
+    """ a list assumption (ie the massType limits) which takes a new token each time it's modified in place
+    """
+
+    def __init__(self, *args):
+        list.__init__(self, *args)
+        self.token = next(_tokenCounter)
+
+    def __reduce__(self):  # a new token when unpickled
+        return self.__class__, (list(self),)
+
+
+class _AssumptionDict(dict):
+    """ a dict assumption (ie the albedo of each type) which takes a new token each time it's modified in place
+    """
+
+    def __init__(self, *args, **kwargs):
+        dict.__init__(self, *args, **kwargs)
+        self.token = next(_tokenCounter)
+
+    def __reduce__(self):
+        return self.__class__, (dict(self),)
+
+
+def _tokenModifier(method):
+
+    def modify(self, *args, **kwargs):
+        result = method(self, *args, **kwargs)
+        self.token = next(_tokenCounter)
+        return result
+
+    modify.__name__ = method.__name__
+    return modify
+
+
+for _cls, _names in (
+        (_AssumptionList, ('__setitem__', '__delitem__', '__setslice__', '__delslice__', '__iadd__', '__imul__',
+                           'append', 'extend', 'insert', 'pop', 'remove', 'reverse', 'sort', 'clear')),
+        (_AssumptionDict, ('__setitem__', '__delitem__', 'clear', 'pop', 'popitem', 'setdefault', 'update'))):
+    for _name in _names:
+        if hasattr(_cls.__bases__[0], _name):  # __setslice__ is python 2 only, list.clear python 3 only
+            setattr(_cls, _name, _tokenModifier(getattr(_cls.__bases__[0], _name)))
+del _cls, _names, _name
+
+
+def _trackedAssumption(value):
+    """ value as an assumption that is given a new token when it's modified, lists and dicts are copied into the
+    tracked versions. Other values (ie a single float) can't be modified in place and are returned as they are
+    """
+
+    if isinstance(value, (_AssumptionList, _AssumptionDict)):
+        return value
+    elif isinstance(value, list):
+        return _AssumptionList(value)
+    elif isinstance(value, dict):
+        return _AssumptionDict(value)
+    else:
+        return value
+
+
+class _Profile(dict):
+    """ A set of assumptions, assumption name -> value. Values set on it are stored as tracked copies (see
+    _trackedAssumption) so modifying them, or replacing them, changes the assumption token
+    """
+
+    def __init__(self, *args, **kwargs):
+        dict.__init__(self)
+        self._tokens = {}  # tokens of the values which aren't tracked themselves
+        self.update(*args, **kwargs)
+
+    def __setitem__(self, key, value):
+        value = _trackedAssumption(value)
+        if not hasattr(value, 'token'):
+            self._tokens[key] = next(_tokenCounter)
+        dict.__setitem__(self, key, value)
+
+    def __delitem__(self, key):
+        dict.__delitem__(self, key)
+        self._tokens.pop(key, None)
+
+    def update(self, *args, **kwargs):
+        if args and isinstance(args[0], _Profile):
+            self._tokens.update(args[0]._tokens)
+            dict.update(self, args[0])  # already tracked, shares the values and their tokens
+            args = args[1:]
+
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def pop(self, key, *default):
+        self._tokens.pop(key, None)
+        return dict.pop(self, key, *default)
+
+    def copy(self):
+        return _Profile(self)
+
+    def __reduce__(self):
+        return self.__class__, (dict(self),)
+
+    def token(self, key):
+        """ the token of the current version of the assumption key, None if there isn't one
+        """
+
+        try:
+            return dict.__getitem__(self, key).token
+        except AttributeError:
+            return self._tokens.get(key)
+        except KeyError:
+            return None
+
+
+planetAssumptions = _Profile({
     # Contains all planet assumptions, the key refers to the type of assumption and the format of the value can vary
     # based on the type of assumption
 
@@ -63,7 +194,7 @@ planetAssumptions = {
         'Neptune': 1.6 * aq.g / aq.cm**3,
         'Jupiter': 1.3 * aq.g / aq.cm**3
     }
-}
+})
 
 
 def planetMassType(mass):
@@ -73,7 +204,7 @@ def planetMassType(mass):
     if mass is np.nan:
         return None
 
-    for massLimit, massType in planetAssumptions['massType']:
+    for massLimit, massType in currentAssumptions()['massType']:
 
         if mass < massLimit:
             return massType
@@ -86,7 +217,7 @@ def planetRadiusType(radius):
     if radius is np.nan:
         return None
 
-    for radiusLimit, radiusType in planetAssumptions['radiusType']:
+    for radiusLimit, radiusType in currentAssumptions()['radiusType']:
 
         if radius < radiusLimit:
             return radiusType
@@ -96,7 +227,7 @@ def planetTempType(temperature):
     """ Returns the planet masstype given the temperature and using planetAssumptions['tempType']
     """
 
-    for tempLimit, tempType in planetAssumptions['tempType']:
+    for tempLimit, tempType in currentAssumptions()['tempType']:
 
         if temperature < tempLimit:
             return tempType
@@ -117,12 +248,240 @@ def planetType(temperature, mass, radius):
 
 
 def planetMu(sizeType):
-    return planetAssumptions['mu'][sizeType]
+    return currentAssumptions()['mu'][sizeType]
 
 
 def planetAlbedo(tempType):
-    return planetAssumptions['albedo'][tempType]
+    return currentAssumptions()['albedo'][tempType]
 
 
 def planetDensity(radiusType):
-     return planetAssumptions['density'][radiusType]
\ No newline at end of file
+     return currentAssumptions()['density'][radiusType]
+
+
+# Named sets of assumptions, see addProfile and useProfile. 'default' is the dict defined above
+profiles = {'default': planetAssumptions}
+
+# the profile set by useProfile in the current context (thread or asyncio task), None uses planetAssumptions
+if ContextVar is not None:
+    _profileScope = ContextVar('assumptionProfile', default=None)
+else:
+    _profileScope = _ThreadScope()
+
+
+def currentAssumptions():
+    """ Returns the assumptions in use, the profile from useProfile in the current context if there is one otherwise
+    planetAssumptions
+    """
+
+    profile = _profileScope.get()
+    return planetAssumptions if profile is None else profile
+
+
+def addProfile(name, base='default', **assumptions):
+    """ Adds a named assumption profile, a copy of the base profile with the assumptions given replaced. Assumptions
+    that aren't given are shared with the base profile so values that don't depend on them are not recalculated when
+    switching between the profiles.
+
+        >>> addProfile('bright', albedo=dict(planetAssumptions['albedo'], Hot=0.3, Jupiter=0.3))
+        >>> with useProfile('bright'):
+        ...     planet.T
+
+    :param name: name of the profile
+    :param base: name of the profile to copy
+    :param assumptions: assumptions to replace ie albedo={...}, in the same format as planetAssumptions
+
+    :return: the profile dict
+    """
+
+    profile = _Profile(profiles[base])
+    profile.update(assumptions)
+    profiles[name] = profile
+
+    return profile
+
+
+def setProfile(name):
+    """ Makes the named profile the default assumptions (planetAssumptions) for every thread. Use useProfile to
+    change them for part of your code only
+    """
+
+    global planetAssumptions
+
+    planetAssumptions = profiles[name]
+
+
+@contextmanager
+def useProfile(name):
+    """ Uses the named profile as the assumptions inside a with block (see currentAssumptions). This only applies to
+    the current thread (or asyncio task) so other threads can use different assumptions at the same time.
+    """
+
+    profile = profiles[name]
+    token = _profileScope.set(profile)
+    try:
+        yield profile
+    finally:
+        _profileScope.reset(token)
+
+
+def _assumptionToken(key):
+
+    profile = currentAssumptions()
+    try:
+        return profile.token(key)
+    except AttributeError:  # planetAssumptions replaced by a plain dict, changes to it can't be tracked so nothing
+        return next(_tokenCounter)  # calculated from it is cached
+
+
+def assumptionsFingerprint(keys=None):
+    """ Returns a tuple identifying the current value of each assumption in keys (all of the assumptions in use by
+    default) so it can be used as a cache key. It is made of the token of each assumption, a profile gives its list and
+    dict assumptions a new token whenever they are replaced or modified in place (ie a limit appended), so it changes
+    when an assumption is modified or a profile with different assumptions is used and is the same again when
+    switching back. Changing a quantity in place is not detected. If planetAssumptions has been replaced by a plain
+    dict every call gives a new fingerprint as its changes can't be tracked.
+    """
+
+    if keys is None:
+        keys = sorted(currentAssumptions())
+
+    return tuple(_assumptionToken(key) for key in keys)
+
+
+class Categorical(namedtuple('Categorical', ('codes', 'categories'))):
+    """ An array of type names stored as integer codes into categories, a code of -1 is None (the value couldn't be
+    classified)
+    """
+
+    __slots__ = ()
+
+    @property
+    def values(self):
+        """ the type name (or None) of each value as an object array
+        """
+        names = np.array(list(self.categories) + [None], dtype=object)
+        return names[self.codes]
+
+    def __len__(self):
+        return len(self.codes)
+
+
+def _codeType(categories):
+    return np.int8 if len(categories) < 128 else np.int32
+
+
+# (assumption key, unit) -> OrderedDict of assumption token -> (limits in unit, type names), for the most recently
+# used versions of the assumption (ie in each profile)
+_limitTables = {}
+_limitTableVersions = 4
+
+
+def _limitTable(key, unit):
+    """ the limits of the assumption key rescaled to unit as an array, and their type names. These are cached for the
+    last few versions of the assumption
+    """
+
+    versions = _limitTables.setdefault((key, aq._unitKey(unit)), OrderedDict())
+    token = _assumptionToken(key)
+
+    try:
+        table = versions.pop(token)
+    except KeyError:
+        assumption = currentAssumptions()[key]
+        limits = []
+        for limit, name in assumption:
+            try:
+                limits.append(aq.rescaledMagnitude(limit, unit))
+            except AttributeError:  # float('inf') is used as the last limit
+                limits.append(limit)
+
+        table = (np.array(limits, dtype=float), tuple(name for limit, name in assumption))
+
+    versions[token] = table  # most recently used
+    while len(versions) > _limitTableVersions:
+        versions.popitem(last=False)
+
+    return table
+
+
+def _asArray(values, unit):
+    """ values as a float array in unit, values without units are taken to be in unit already
+    """
+
+    try:
+        return np.asarray(aq.rescaledMagnitude(values, unit), dtype=float)
+    except AttributeError:
+        return np.asarray(values, dtype=float)
+
+
+def _classify(key, values, unit):
+
+    limits, names = _limitTable(key, unit)
+    values = _asArray(values, unit)
+
+    # the scalar versions return the first type with value < limit, which is side='right'
+    codes = np.searchsorted(limits, values, side='right')
+    codes[codes == len(limits)] = -1  # above every limit (or nan)
+    codes[np.isnan(values)] = -1
+
+    return Categorical(codes.astype(_codeType(names)), names)
+
+
+def planetMassTypes(masses, unit=aq.M_j):
+    """ Array version of planetMassType, classifies every mass at once
+
+    :param masses: array of masses as a quantity or floats in unit, nan for missing values
+    :param unit: the unit of masses if they are floats
+
+    :return: Categorical of the mass type names (None where the mass is nan)
+    """
+
+    return _classify('massType', masses, unit)
+
+
+def planetRadiusTypes(radii, unit=aq.R_j):
+    """ Array version of planetRadiusType, see planetMassTypes
+    """
+
+    return _classify('radiusType', radii, unit)
+
+
+def planetTempTypes(temperatures, unit=aq.K):
+    """ Array version of planetTempType, see planetMassTypes
+    """
+
+    return _classify('tempType', temperatures, unit)
+
+
+def planetTypes(temperatures, masses, radii, tempUnit=aq.K, massUnit=aq.M_j, radiusUnit=aq.R_j):
+    """ Array version of planetType, the size type is from the mass where it is known and the radius otherwise.
+
+    :return: Categorical of the planet type names as 'temperatureType sizeType' (None where the mass and radius are
+        both nan)
+    """
+
+    tempTypes = planetTempTypes(temperatures, tempUnit)
+    massTypes = planetMassTypes(masses, massUnit)
+    radiusTypes = planetRadiusTypes(radii, radiusUnit)
+
+    sizeNames = list(massTypes.categories)
+    sizeNames += [name for name in radiusTypes.categories if name not in sizeNames]
+    radiusToSize = np.array([sizeNames.index(name) for name in radiusTypes.categories] + [-1], dtype=int)
+
+    hasMass = ~np.isnan(_asArray(masses, massUnit))
+    hasRadius = ~np.isnan(_asArray(radii, radiusUnit))
+    sizeCodes = np.where(hasMass, massTypes.codes, radiusToSize[radiusTypes.codes])
+
+    # every combination of temperature and size name, including None as the scalar version formats it as 'None'
+    tempNames = list(tempTypes.categories) + [None]
+    sizeNames = sizeNames + [None]
+    categories = tuple('{0} {1}'.format(tempName, sizeName) for tempName in tempNames for sizeName in sizeNames)
+
+    tempCodes = np.where(tempTypes.codes == -1, len(tempNames) - 1, tempTypes.codes)
+    sizeCodes = np.where(sizeCodes == -1, len(sizeNames) - 1, sizeCodes)
+    codes = tempCodes * len(sizeNames) + sizeCodes
+    codes[~(hasMass | hasRadius)] = -1
+
+    return Categorical(codes.astype(_codeType(categories)), categories)
+
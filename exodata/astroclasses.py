@@ -3,26 +3,109 @@ structure with objects
 """
 import sys
 import math
-from pkg_resources import resource_stream
+from collections import OrderedDict
 import logging
 
 import numpy as np
-import astropy.coordinates
-import astropy.units as u
 
 from . import equations as eq
 from . import astroquantities as aq
 from . import assumptions as assum
 from . import flags
+from . import limbdarkening
 from . import params as ed_params
+from . import instrumentation as instr
+from ._lazy import LazyAttributes
 
 logger = logging.getLogger('')
 
 
+class _ParamDict(dict):
+    """ The params dictionary of an astro object. Any change to a parameter is reported to the owning object so cached
+    values that depend on it can be invalidated.
+    """
+
+    def __init__(self, owner=None, *args, **kwargs):
+        dict.__init__(self, *args, **kwargs)
+        self._owner = owner
+
+    def _changed(self, key):
+        global _changeGeneration
+
+        if self._owner is not None:
+            _changeGeneration += 1
+            self._owner._paramChanged(key)
+
+    def __setitem__(self, key, value):
+        dict.__setitem__(self, key, value)
+        self._changed(key)
+
+    def __delitem__(self, key):
+        dict.__delitem__(self, key)
+        self._changed(key)
+
+    def pop(self, key, *args):
+        value = dict.pop(self, key, *args)
+        self._changed(key)
+        return value
+
+    def popitem(self):
+        key, value = dict.popitem(self)
+        self._changed(key)
+        return key, value
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return dict.__getitem__(self, key)
+
+    def update(self, *args, **kwargs):
+        newParams = dict(*args, **kwargs)
+        dict.update(self, newParams)
+        for key in newParams:
+            self._changed(key)
+
+    def clear(self):
+        keys = list(self)
+        dict.clear(self)
+        for key in keys:
+            self._changed(key)
+
+    def __reduce__(self):  # otherwise unpickling calls __setitem__ before _owner exists
+        return _ParamDict, (None, dict(self)), {'_owner': self._owner}
+
+
+# Incremented whenever a change to the hierarchy could change the ancestors of existing objects, see _BaseObject.parent
+_hierarchyGeneration = 0
+
+# Incremented whenever a parameter of any object or any parent is changed, for caches of values calculated from many
+# objects at once (see columns.planetTypeColumns)
+_changeGeneration = 0
+
+
 class _BaseObject(object):
 
+    # Declares the values cached by _cachedValue and what they depend on. Keys are the cached value names, values are
+    # the parameter keys or cached value names they are calculated from. Parameters and cached values of an ancestor
+    # are given as 'ClassType.name' ie 'Star.mass'. Set by child classes, _cacheDependents is the inverse.
+    # Values calculated from the assumptions module depend on 'assumptions.key' ie 'assumptions.albedo',
+    # _assumptionKeys gives every assumption each cached value depends on (directly or through other cached values).
+    _cacheDependencies = {}
+    _cacheDependents = {}
+    _assumptionKeys = {}
+
+    # Whether this object estimates missing values, None follows params.estimateMissingValues. Set for every object in
+    # an OECDatabase by its estimateMissingValues setting
+    estimateMissingValues = None
+
+    # The ancestors found by _getParentClass are cached in _ancestors as classType -> object (or None for no ancestor
+    # of that type). They are valid while _ancestorGeneration matches _hierarchyGeneration
+    _ancestorGeneration = -1
+
     def __init__(self, params=None):
 
+        self._cache = {}
+        self._ancestors = {}
         self.children = []
         self.parent = False
         self.classType = 'BaseObject'
@@ -32,6 +115,37 @@ class _BaseObject(object):
         if params is not None:
             self._updateParams(params)  # TODO value validator?
 
+    @property
+    def params(self):
+        return self._params
+
+    @params.setter
+    def params(self, params):
+        global _changeGeneration
+
+        self._params = _ParamDict(self, params)
+        _changeGeneration += 1
+        self.clearCache()
+
+    @property
+    def parent(self):
+        return self._parent
+
+    @parent.setter
+    def parent(self, parent):
+        global _hierarchyGeneration, _changeGeneration
+
+        # Linking a new object to its parent (how the database loads the catalogue, top down) can't change the
+        # ancestors of any other object. Moving an object, or linking one that already has children, might so every
+        # cached ancestor is dropped
+        if getattr(self, '_parent', False) or self.children:
+            _hierarchyGeneration += 1
+
+        self._parent = parent
+        self._ancestors = {}
+        _changeGeneration += 1
+        self.clearCache()  # values calculated from the old ancestors, ie calcTemperature from the star
+
     def _addChild(self, child):
 
         self.children.append(child)
@@ -42,9 +156,129 @@ class _BaseObject(object):
 
         self.params.update(params)
 
+    def _estimating(self):
+        """ whether missing values should be estimated for this object, see params.estimating
+        """
+        return ed_params.estimating(self.estimateMissingValues)
+
+    def _cachedValue(self, name, calculate):
+        """ Returns the cached value name, calling calculate() to generate it if it isn't cached. Values are stored
+        separately for the estimating and not estimating modes (see _estimating) so changing it never returns a value
+        calculated under the other mode, values depending on the assumptions are also stored separately for each version of the
+        assumptions they use (see assumptions.useProfile). name must be declared in _cacheDependencies so it is
+        invalidated when its inputs change.
+        """
+
+        mode = self._estimating()
+        assumptionKeys = self._assumptionKeys.get(name)
+        if assumptionKeys:
+            mode = (mode, assum.assumptionsFingerprint(assumptionKeys))
+
+        if instr.enabled:
+            instr.count('estimate.' + name)
+
+        try:
+            return self._cache[name][mode]
+        except KeyError:
+            value = instr.timeCall('estimate.' + name, calculate) if instr.enabled else calculate()
+            self._cache.setdefault(name, {})[mode] = value
+            return value
+
+    def clearCache(self):
+        """ Removes all cached calculated and estimated values from this object and its children. Changes to
+        parameters and to assumptions.planetAssumptions are picked up automatically so this is only needed if you
+        change a value in place.
+        """
+
+        self._cache.clear()
+        for child in self.children:
+            child.clearCache()
+
+    def _paramChanged(self, key):
+        if self._cache or self.children:  # nothing to invalidate while loading
+            self._invalidate(key)
+
+    def _invalidate(self, key):
+        """ drops cached values depending on key (a parameter or cached value of this object) and then anything that
+        depends on those, including cached values of the children
+        """
+
+        self._invalidateDependents(key)
+
+        qualifiedKey = '{0}.{1}'.format(self.classType, key)
+        for child in self.children:
+            child._invalidateFromAncestor(qualifiedKey)
+
+    def _invalidateFromAncestor(self, qualifiedKey):
+
+        self._invalidateDependents(qualifiedKey)
+
+        for child in self.children:
+            child._invalidateFromAncestor(qualifiedKey)
+
+    def _invalidateDependents(self, key):
+
+        for dependent in self._cacheDependents.get(key, ()):
+            self._cache.pop(dependent, None)
+            self._invalidate(dependent)
+
     def _getParentClass(self, startClass, parentClass):
         """ gets the parent class by calling successive parent classes with .parent until parentclass is matched.
+        Lookups starting from this object or its parent are cached, see _ancestor.
+        """
+        if startClass is self:
+            if self.classType == parentClass:
+                return self
+            startClass = self._parent
+
+        if startClass is self._parent:
+            return self._ancestor(parentClass)
+
+        return self._walkParents(startClass, parentClass)
+
+    def _ancestor(self, parentClass):
+        """ the first ancestor with the classType parentClass, cached until the hierarchy changes. Raises HierarchyError
+        if there isn't one
+        """
+        if instr.enabled:
+            instr.count('astroclasses.ancestor')
+
+        if self._ancestorGeneration == _hierarchyGeneration:
+            ancestor = self._ancestors.get(parentClass, False)
+            if ancestor:
+                return ancestor
+        else:
+            self._ancestors = {}
+            self._ancestorGeneration = _hierarchyGeneration
+            ancestor = False
+
+        if ancestor is False:  # not cached yet, None is cached for no ancestor of that type
+            try:
+                ancestor = self._walkParents(self._parent, parentClass)
+            except HierarchyError:
+                ancestor = None
+
+            self._ancestors[parentClass] = ancestor
+
+        if ancestor is None:
+            raise HierarchyError('This object ({0}) has no {1} as a parent object'.format(self.name, parentClass))
+
+        return ancestor
+
+    def _resolveAncestors(self):
+        """ caches every ancestor of this object, used by the database once the object is linked
         """
+
+        for parentClass in ('System', 'Binary', 'Star'):
+            try:
+                self._ancestor(parentClass)
+            except HierarchyError:
+                pass
+
+    def _walkParents(self, startClass, parentClass):
+        if instr.enabled:
+            instr.count('astroclasses.walkParents')
+
         try:
             if not startClass:  # reached system with no hits
                 raise AttributeError
@@ -54,7 +288,7 @@ class _BaseObject(object):
         if startClass.classType == parentClass:
             return startClass
         else:
-            return self._getParentClass(startClass.parent, parentClass)
+            return self._walkParents(startClass._parent, parentClass)
 
     @property
     def name(self):  # TODO variable for altnames
@@ -94,7 +328,7 @@ class _BaseObject(object):
 
     @property
     def system(self):
-        return self._getParentClass(self.parent, 'System')
+        return self._ancestor('System')
 
 
 class System(_BaseObject):
@@ -125,7 +359,7 @@ class System(_BaseObject):
 
     @d.setter
     def d(self, d):
-        d = d.rescale(aq.pc)
+        d = aq.rescale(d, aq.pc)
         self.params['distance'] = d
 
     @property
@@ -152,7 +386,7 @@ class PlanetAndBinaryCommon(_BaseObject):
 
     @i.setter
     def i(self, i):
-        i = i.rescale(aq.deg)
+        i = aq.rescale(i, aq.deg)
         self.params['inclination'] = i
 
     @property
@@ -168,15 +402,15 @@ class PlanetAndBinaryCommon(_BaseObject):
         period = self.getParam('period')
         if period is not np.nan:
             return period
-        elif ed_params.estimateMissingValues:
+        elif self._estimating():
             self.flags.addFlag('Calculated Period')
-            return self.calcPeriod()
+            return self._cachedValue('calcPeriod', self.calcPeriod)
         else:
             return np.nan
 
     @P.setter
     def P(self, P):
-        P = P.rescale(aq.day)
+        P = aq.rescale(P, aq.day)
         self.params['period'] = P
 
     def calcPeriod(self):
@@ -185,9 +419,9 @@ class PlanetAndBinaryCommon(_BaseObject):
     @property
     def a(self):
         sma = self.getParam('semimajoraxis')
-        if sma is np.nan and ed_params.estimateMissingValues:
+        if sma is np.nan and self._estimating():
             if self.getParam('period') is not np.nan:
-                sma = self.calcSMA()  # calc using period
+                sma = self._cachedValue('calcSMA', self.calcSMA)  # calc using period
                 self.flags.addFlag('Calculated SMA')
                 return sma
             else:
@@ -197,7 +431,7 @@ class PlanetAndBinaryCommon(_BaseObject):
 
     @a.setter
     def a(self, a):
-        a = a.rescale(aq.au)
+        a = aq.rescale(a, aq.au)
         self.params['semimajoraxis'] = a
 
     def calcSMA(self):
@@ -344,7 +578,7 @@ class StarAndPlanetCommon(_BaseObject):
 
     @age.setter
     def age(self, age):
-        age = age.rescale(aq.Gyear)
+        age = aq.rescale(age, aq.Gyear)
         self.params['age'] = age
 
     @property  # allows stars and planets to access system values by propagating up
@@ -389,15 +623,15 @@ class StarAndPlanetCommon(_BaseObject):
 
         if not paramTemp is np.nan:
             return paramTemp
-        elif ed_params.estimateMissingValues:
+        elif self._estimating():
             self.flags.addFlag('Calculated Temperature')
-            return self.calcTemperature()
+            return self._cachedValue('calcTemperature', self.calcTemperature)
         else:
             return np.nan
 
     @T.setter
     def T(self, T):
-        T = T.rescale(aq.K)
+        T = aq.rescale(T, aq.K)
         self.params['temperature'] = T
 
     @property
@@ -406,7 +640,7 @@ class StarAndPlanetCommon(_BaseObject):
 
     @M.setter
     def M(self, M):
-        M = M.rescale(aq.M_j)
+        M = aq.rescale(M, aq.M_j)
         self.params['mass'] = M
 
     def calcTemperature(self):
@@ -456,6 +690,13 @@ class Binary(PlanetAndBinaryCommon, StarAndBinaryCommon):  # TODO add binary met
 
 class Star(StarAndPlanetCommon, StarAndBinaryCommon):
 
+    _cacheDependencies = {
+        'calcTemperature': ('mass',),
+        'estimateDistance': ('spectraltype', 'magV', 'convertmagV'),
+    }
+    _cacheDependencies.update(('convertmag' + letter, ('spectraltype', 'magB', 'magV', 'magI', 'magJ', 'magH', 'magK'))
+                              for letter in 'UBVJIHKLMN')
+
     def __init__(self, *args, **kwargs):
         StarAndPlanetCommon.__init__(self, *args, **kwargs)
         self.classType = 'Star'
@@ -467,9 +708,9 @@ class Star(StarAndPlanetCommon, StarAndBinaryCommon):
         """
         # TODO this will only work from a star or below. good thing?
         d = self.parent.d
-        if ed_params.estimateMissingValues:
+        if self._estimating():
             if d is np.nan:
-                d = self.estimateDistance()
+                d = self._cachedValue('estimateDistance', self.estimateDistance)
                 if d is not np.nan:
                     self.flags.addFlag('Estimated Distance')
             return d
@@ -490,7 +731,6 @@ class Star(StarAndPlanetCommon, StarAndBinaryCommon):
         :return:
         """
         allowed_mags = "UBVJIHKLMN"
-        catalogue_mags = 'BVIJHK'
 
         if mag_letter not in allowed_mags or not len(mag_letter) == 1:
             raise ValueError("Magnitude letter must be a single letter in {0}".format(allowed_mags))
@@ -498,23 +738,30 @@ class Star(StarAndPlanetCommon, StarAndBinaryCommon):
         mag_str = 'mag'+mag_letter
         mag_val = self.getParam(mag_str)
 
-        if isNanOrNone(mag_val) and ed_params.estimateMissingValues:  # then we need to estimate it!
-            # old style dict comprehension for python 2.6
-            mag_dict = dict(('mag'+letter, self.getParam('mag'+letter)) for letter in catalogue_mags)
-            mag_class = Magnitude(self.spectralType, **mag_dict)
-            try:
-                mag_conversion = mag_class.convert(mag_letter)
-                # logger.debug('Star Class: Conversion to {0} successful, got {1}'.format(mag_str, mag_conversion))
-                self.flags.addFlag('Estimated mag{0}'.format(mag_letter))
-                return mag_conversion
-            except ValueError as e:  # cant convert
-                logger.exception(e)
-                # logger.debug('Cant convert to {0}'.format(mag_letter))
-                return np.nan
+        if isNanOrNone(mag_val) and self._estimating():  # then we need to estimate it!
+            return self._cachedValue('convert' + mag_str, lambda: self._convert_magnitude(mag_letter))
         else:
             # logger.debug('returning {0}={1} from catalogue'.format(mag_str, mag_val))
             return mag_val
 
+    def _convert_magnitude(self, mag_letter):
+        """ Converts the catalogue magnitudes to mag_letter, flagging the star if it works
+        """
+        catalogue_mags = 'BVIJHK'
+
+        # old style dict comprehension for python 2.6
+        mag_dict = dict(('mag'+letter, self.getParam('mag'+letter)) for letter in catalogue_mags)
+        mag_class = Magnitude(self.spectralType, **mag_dict)
+        try:
+            mag_conversion = mag_class.convert(mag_letter)
+            # logger.debug('Star Class: Conversion to {0} successful, got {1}'.format(mag_str, mag_conversion))
+            self.flags.addFlag('Estimated mag{0}'.format(mag_letter))
+            return mag_conversion
+        except ValueError as e:  # cant convert
+            logger.exception(e)
+            # logger.debug('Cant convert to {0}'.format(mag_letter))
+            return np.nan
+
     @property
     def magU(self):
         return self._get_or_convert_magnitude('U')
@@ -584,44 +831,7 @@ class Star(StarAndPlanetCommon, StarAndBinaryCommon):
         :return: limb darkening coefficients 1 and 2
         """
         # TODO check this returns correct value - im not certain
-        # The intervals of values in the tables
-        tempind = [ 3500., 3750., 4000., 4250., 4500., 4750., 5000., 5250., 5500., 5750., 6000., 6250.,
-                 6500., 6750., 7000., 7250., 7500., 7750., 8000., 8250., 8500., 8750., 9000., 9250.,
-                 9500., 9750., 10000., 10250., 10500., 10750., 11000., 11250., 11500., 11750., 12000., 12250.,
-                 12500., 12750., 13000., 14000., 15000., 16000., 17000., 19000., 20000., 21000., 22000., 23000.,
-                 24000., 25000., 26000., 27000., 28000., 29000., 30000., 31000., 32000., 33000., 34000., 35000.,
-                 36000., 37000., 38000., 39000., 40000., 41000., 42000., 43000., 44000., 45000., 46000., 47000.,
-                 48000., 49000., 50000.]
-        lggind = [0., 0.5, 1., 1.5, 2., 2.5, 3., 3.5, 4., 4.5, 5.]
-        mhind = [-5., -4.5, -4., -3.5, -3., -2.5, -2., -1.5, -1., -0.5, -0.3, -0.2, -0.1, 0., 0.1, 0.2, 0.3, 0.5, 1.]
-
-        # Choose the values in the table nearest our parameters
-        tempselect = _findNearest(tempind, float(self.T))
-        lgselect = _findNearest(lggind, float(self.calcLogg()))
-        mhselect = _findNearest(mhind, float(self.Z))
-
-        quadratic_filepath = resource_stream(__name__, 'data/quadratic.dat')
-        coeffTable = np.loadtxt(quadratic_filepath)
-
-        foundValues = False
-        for i in range(len(coeffTable)):
-            if coeffTable[i, 2] == lgselect and coeffTable[i, 3] == tempselect and coeffTable[i, 4] == mhselect:
-                if coeffTable[i, 0] == 1:
-                    u1array = coeffTable[i, 8:]  # Limb darkening parameter u1 for each wl in waveind
-                    u2array = coeffTable[i+1, 8:]
-                    foundValues = True
-                    break
-
-        if not foundValues:
-            raise ValueError('No limb darkening values could be found')  # TODO replace with better exception
-
-        waveind = [0.365, 0.445, 0.551, 0.658, 0.806, 1.22, 1.63, 2.19, 3.45]  # Wavelengths available in table
-
-        # Interpolates the value at wavelength from values in the table (waveind)
-        u1AtWavelength = np.interp(wavelength, waveind, u1array, left=0, right=0)
-        u2AtWavelength = np.interp(wavelength, waveind, u2array, left=0, right=0)
-
-        return u1AtWavelength, u2AtWavelength
+        return limbdarkening.quadraticCoeffs(float(self.T), float(self.calcLogg()), float(self.Z), wavelength)
 
     def estimateAbsoluteMagnitude(self):
         return eq.estimateAbsoluteMagnitude(self.spectralType)
@@ -636,6 +846,15 @@ class Star(StarAndPlanetCommon, StarAndBinaryCommon):
 
 class Planet(StarAndPlanetCommon, PlanetAndBinaryCommon):
 
+    _cacheDependencies = {
+        'assumedAlbedo': ('temperature', 'mass', 'radius', 'assumptions.tempType', 'assumptions.massType',
+                          'assumptions.radiusType', 'assumptions.albedo'),
+        'calcTemperature': ('albedo', 'assumedAlbedo', 'semimajoraxis', 'period', 'calcSMA', 'Star.temperature',
+                            'Star.calcTemperature', 'Star.radius', 'Star.mass'),
+        'calcSMA': ('period', 'Star.mass'),
+        'calcPeriod': ('semimajoraxis', 'period', 'calcSMA', 'Star.mass'),
+    }
+
     def __init__(self, *args, **kwargs):
         StarAndPlanetCommon.__init__(self, *args, **kwargs)
         PlanetAndBinaryCommon.__init__(self, *args, **kwargs)
@@ -706,7 +925,7 @@ class Planet(StarAndPlanetCommon, PlanetAndBinaryCommon):
 
     @mu.setter
     def mu(self, mu):
-        mu = mu.rescale(aq.atomic_mass_unit)
+        mu = aq.rescale(mu, aq.atomic_mass_unit)
         self.params['moleight'] = mu
 
     @property
@@ -714,7 +933,13 @@ class Planet(StarAndPlanetCommon, PlanetAndBinaryCommon):
         albedo = self.getParam('albedo')
         if albedo is not np.nan:
             return albedo
-        elif self.getParam('temperature') is not np.nan:
+        else:
+            return self._cachedValue('assumedAlbedo', self._assumedAlbedo)
+
+    def _assumedAlbedo(self):
+        """ albedo from the assumptions module based on the planets temperature, mass or radius type
+        """
+        if self.getParam('temperature') is not np.nan:
             planetClass = self.tempType()
         elif self.M is not np.nan:
             planetClass = self.massType()
@@ -797,7 +1022,44 @@ class Planet(StarAndPlanetCommon, PlanetAndBinaryCommon):
 
     @property
     def star(self):
-        return self._getParentClass(self.parent, 'Star')
+        return self._ancestor('Star')
+
+
+def _invertDependencies(dependencies):
+    """ turns {cached value: (dependencies)} into {dependency: (cached values)}
+    """
+    dependents = {}
+    for name, dependencyKeys in dependencies.items():
+        for key in dependencyKeys:
+            dependents.setdefault(key, []).append(name)
+
+    return dict((key, tuple(names)) for key, names in dependents.items())
+
+
+def _assumptionKeys(dependencies):
+    """ gives the assumptions each cached value depends on, following the dependencies on other cached values
+    """
+
+    def keysFor(name, visited):
+        keys = set()
+        for key in dependencies.get(name, ()):
+            if key.startswith('assumptions.'):
+                keys.add(key.split('.', 1)[1])
+            elif key in dependencies and key not in visited:
+                keys |= keysFor(key, visited | set([key]))
+        return keys
+
+    assumptionKeys = {}
+    for name in dependencies:
+        keys = keysFor(name, set([name]))
+        if keys:
+            assumptionKeys[name] = tuple(sorted(keys))
+
+    return assumptionKeys
+
+Star._cacheDependents = _invertDependencies(Star._cacheDependencies)
+Planet._cacheDependents = _invertDependencies(Planet._cacheDependencies)
+Planet._assumptionKeys = _assumptionKeys(Planet._cacheDependencies)
 
 
 class Parameters(object):  # TODO would this subclassing dict be more preferable?
@@ -964,13 +1226,22 @@ class SpectralType(object):
     ignores non-typical star classes (ie ) and ignores extra statements like G8 V+
     """
 
+    _parseCache = None  # set below the class, (classLetter, classNumber, lumType) for each string parsed
+
     def __init__(self, classString):
         self.original = classString
-        self.lumType = ''
-        self.classLetter = ''
-        self.classNumber = ''
 
-        self._parseSpecType(classString)
+        try:
+            self.classLetter, self.classNumber, self.lumType = self._parseCache[classString]
+        except (KeyError, TypeError):  # TypeError - unhashable
+            self.lumType = ''
+            self.classLetter = ''
+            self.classNumber = ''
+
+            self._parseSpecType(classString)
+
+            if isinstance(classString, str):
+                self._parseCache[classString] = (self.classLetter, self.classNumber, self.lumType)
 
     @property
     def specClass(self):
@@ -1092,6 +1363,83 @@ class SpectralType(object):
             self.lumType = ''
             return False
 
+
+
+class _LRUCache(object):
+    """ A dict like cache holding at most maxsize items, the least recently used item is dropped when full
+    """
+
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._items = OrderedDict()
+
+    def __getitem__(self, key):
+        try:
+            value = self._items.pop(key)
+        except KeyError:
+            self.misses += 1
+            raise
+        self._items[key] = value  # move to the most recently used end
+        self.hits += 1
+        return value
+
+    def __setitem__(self, key, value):
+        self._items.pop(key, None)
+        self._items[key] = value
+        if len(self._items) > self.maxsize:
+            self._items.popitem(last=False)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def clear(self):
+        self._items.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def info(self):
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self._items), 'maxsize': self.maxsize}
+
+SpectralType._parseCache = _LRUCache(1024)
+
+
+def parseSpectralTypes(classStrings):
+    """ Parses a list of spectral type strings at once, each distinct string is parsed once.
+
+    :param classStrings: list of spectral types ie the spectraltype param of every star
+    :return: classLetters, classNumbers, lumTypes arrays. classLetters and lumTypes are object arrays of strings ('' if
+        not given), classNumbers is a float array with nan where there isn't a class number
+    """
+
+    length = len(classStrings)
+    classLetters = np.empty(length, dtype=object)
+    classNumbers = np.empty(length)
+    lumTypes = np.empty(length, dtype=object)
+
+    parsed = {}
+    for i, classString in enumerate(classStrings):
+        try:
+            classLetter, classNumber, lumType = parsed[classString]
+        except (KeyError, TypeError):
+            specType = SpectralType(classString)
+            classLetter, classNumber, lumType = specType.classLetter, specType.classNumber, specType.lumType
+            try:
+                parsed[classString] = (classLetter, classNumber, lumType)
+            except TypeError:
+                pass
+
+        classLetters[i] = classLetter
+        classNumbers[i] = np.nan if classNumber == '' else classNumber
+        lumTypes[i] = lumType
+
+    return classLetters, classNumbers, lumTypes
+
+
 _ExampleSystemCount = 1  # Used by example.py - put here to enable global
 
 #               main sequence
@@ -1135,18 +1483,7 @@ class Magnitude(object):
         self.magM = magM
         self.magN = magN
 
-        # For magDict, these should probably be grouped together
-        self.column_for_V_conversion = {
-        #   mag  column,  sign (most are V-Mag (+1), some are Mag-V (-1))
-            'U': (2,  -1),
-            'B': (3,  -1),
-            'J': (8, +1),
-            'H': (9, +1),
-            'K': (10, +1),
-            'L': (11, +1),
-            'M': (12, +1),
-            'N': (13, +1),
-        }
+        self.column_for_V_conversion = _columnForVConversion
 
     def convert(self, to_mag, from_mag=None):
         """ Converts magnitudes using UBVRIJHKLMNQ photometry in Taurus-Auriga (Kenyon+ 1995)
@@ -1217,8 +1554,8 @@ class Magnitude(object):
         if to_mag == 'V':
             col, sign = self.column_for_V_conversion[from_mag]
 
-            try:  # TODO replace with pandas table
-                offset = float(magDict[specClass][col])
+            try:
+                offset = _lazyTables('magTable')[_lazyTables('magTableRows')[specClass], col]
             except KeyError:
                 raise ValueError('No data available to convert those magnitudes for that spectral type')
 
@@ -1238,7 +1575,7 @@ class Magnitude(object):
 
             col, sign = self.column_for_V_conversion[to_mag]
             try:
-                offset = float(magDict[specClass][col])
+                offset = _lazyTables('magTable')[_lazyTables('magTableRows')[specClass], col]
             except KeyError:
                 raise ValueError('No data available to convert those magnitudes for that spectral type')
 
@@ -1250,25 +1587,143 @@ class Magnitude(object):
             raise ValueError('Can only convert from and to V magnitude. Use .convert() instead')
 
 
-def _createMagConversionDict():
-    """ loads magnitude_conversion.dat which is table A% 1995ApJS..101..117K
+def _createMagConversionTable(magDict):
+    """ The conversion table as floats so the strings aren't parsed on every conversion
+
+    :return: table (spectral class, column) array, dict of the row of each spectral class
+    """
+    specClasses = sorted(magDict)
+    table = np.array([[float(value) for value in magDict[specClass]] for specClass in specClasses])
+    rows = dict((specClass, row) for row, specClass in enumerate(specClasses))
+
+    return table, rows
+
+
+def _loadMagTable():
+    magTable, magTableRows = _createMagConversionTable(eq.magDict)
+    return {'magTable': magTable, 'magTableRows': magTableRows}
+
+# The conversion table is read on first use rather than when exodata is imported. magDict is the table loaded by
+# equations (the same file)
+_lazyTables = LazyAttributes(globals(), {
+    'magDict': lambda: {'magDict': eq.magDict},
+    'magTable': _loadMagTable,
+    'magTableRows': _loadMagTable,
+})
+__getattr__ = _lazyTables.moduleGetattr
+
+# For magTable
+_columnForVConversion = {
+#   mag  column,  sign (most are V-Mag (+1), some are Mag-V (-1))
+    'U': (2,  -1),
+    'B': (3,  -1),
+    'J': (8, +1),
+    'H': (9, +1),
+    'K': (10, +1),
+    'L': (11, +1),
+    'M': (12, +1),
+    'N': (13, +1),
+}
+
+
+def _magTableRowsFor(spectralTypes):
+    """ row of magTable for each spectral type, or -1 where the star can't be converted (not main sequence or no data)
     """
-    magnitude_conversion_filepath = resource_stream(__name__, 'data/magnitude_conversion.dat')
-    raw_table = np.loadtxt(magnitude_conversion_filepath, '|S5')
-
-    magDict = {}
-    for row in raw_table:
-        if sys.hexversion >= 0x03000000:
-            starClass = row[1].decode("utf-8")  # otherwise we get byte ints or b' caused by 2to3
-            tableData = [x.decode("utf-8") for x in row[3:]]
+
+    rowsBySpecType = {}  # catalogues share a small number of spectral types
+    rows = np.empty(len(spectralTypes), dtype=int)
+
+    for i, spectralType in enumerate(spectralTypes):
+        try:
+            rows[i] = rowsBySpecType[spectralType]
+            continue
+        except (KeyError, TypeError):  # TypeError - unhashable
+            pass
+
+        if isNanOrNone(spectralType):
+            row = -1
         else:
-            starClass = row[1]
-            tableData = row[3:]
-        magDict[starClass] = tableData
+            if not isinstance(spectralType, SpectralType):
+                spectralType = SpectralType(spectralType)
+            if spectralType.lumType in ('V', ''):
+                row = _lazyTables('magTableRows').get(spectralType.roundedSpecClass, -1)
+            else:
+                row = -1
+
+        try:
+            rowsBySpecType[spectralTypes[i]] = row
+        except TypeError:
+            pass
+        rows[i] = row
+
+    return rows
+
+
+def _magArray(values, length):
+    """ the magnitudes as a float array with nan for missing values (None, nan or no values given)
+    """
+    if values is None:
+        return np.full(length, np.nan)
+
+    return np.array([np.nan if isNanOrNone(value) else value for value in values], dtype=float)
 
-    return magDict
 
-magDict = _createMagConversionDict()
+def convertMagnitudes(to_mag, spectralTypes, **mags):
+    """ Vectorised Magnitude(spectralType, **mags).convert(to_mag) for many stars at once. As with Magnitude.convert a
+    measured V magnitude is used first, otherwise V is converted from the first of U, B, J, H, K, L, M, N that is
+    available. Only main sequence stars can be converted.
+
+        >>> convertMagnitudes('K', ['G5V', 'M2'], magV=[10.2, None], magJ=[9.1, 8.5])
+
+    :param to_mag: magnitude letter to convert to ie 'K'
+    :param spectralTypes: list of spectral types (strings or SpectralType)
+    :param mags: magU, magB, magV, ... lists or arrays of the measured magnitudes, nan or None where missing
+
+    :return: array of to_mag for each star, nan where it can't be converted
+    """
+
+    if to_mag != 'V' and to_mag not in _columnForVConversion:
+        raise ValueError("Can not convert to mag{0}, must be one of V{1}".format(
+            to_mag, ''.join(sorted(_columnForVConversion))))
+
+    length = len(spectralTypes)
+    rows = _magTableRowsFor(spectralTypes)
+
+    # an extra row of nan for stars that can't be converted (row -1)
+    magTable = _lazyTables('magTable')
+    table = np.vstack((magTable, np.full(magTable.shape[1], np.nan)))
+
+    def vOffset(mag_letter):
+        col, sign = _columnForVConversion[mag_letter]
+        return table[rows, col] * sign
+
+    magV = _magArray(mags.get('magV'), length)
+    for mag_letter in "UBJHKLMN":  # V is the intermediate step from the others
+        missing = np.isnan(magV)
+        if not missing.any():
+            break
+
+        fromMag = _magArray(mags.get('mag' + mag_letter), length)
+        magV[missing] = fromMag[missing] + vOffset(mag_letter)[missing]
+
+    if to_mag == 'V':
+        return magV
+    else:
+        return magV - vOffset(to_mag)  # other way to the conversion to V
+
+_magnitudeConversions = [(owner, name, plain, instr.timed('magnitude.' + name)(plain)) for owner, name, plain in (
+    (Magnitude, 'convert', Magnitude.__dict__['convert']),
+    (sys.modules[__name__], 'convertMagnitudes', convertMagnitudes))]
+
+
+def _timeMagnitudeConversions(enabled):
+    """ installs the timed conversions while instrumentation is enabled, as with the equations
+    """
+
+    for owner, name, plain, timed in _magnitudeConversions:
+        setattr(owner, name, timed if enabled else plain)
+
+instr.addToggleHook(_timeMagnitudeConversions)
 
 
 def isNanOrNone(val):
@@ -1292,6 +1747,9 @@ def _ra_string_to_unit(ra_string):
     hour, min, sec = ra_split
     ra_astropy_format = '{}h{}m{}s'.format(hour, min, sec)
 
+    import astropy.coordinates
+    import astropy.units as u
+
     ra_unit = astropy.coordinates.Longitude(ra_astropy_format, unit=u.deg)
 
     return ra_unit
@@ -1303,6 +1761,9 @@ def _dec_string_to_unit(dec_string):
     deg, arcmin, arcsec = deg_split
     deg_astropy_format = '{}d{}m{}s'.format(deg, arcmin, arcsec)
 
+    import astropy.coordinates
+    import astropy.units as u
+
     dec_unit = astropy.coordinates.Latitude(deg_astropy_format, unit=u.deg)
 
     return dec_unit
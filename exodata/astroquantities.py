@@ -1,7 +1,10 @@
 """ Temp module until astro units are added to quantities
 """
+from __future__ import division
 from quantities import *
 
+from . import instrumentation as instr
+
 L_s = solar_luminosity = UnitQuantity(
     'solar_luminosity',
     3.839*(10**26)*W,
@@ -79,4 +82,90 @@ kgm3 = CompoundUnit('kg /m**3')
 kgm3.latex_symbol = 'kg/m^3'
 
 ms2 = CompoundUnit('m/s**2')
-ms2.latex_symbol = 'm/s^2'
\ No newline at end of file
+ms2.latex_symbol = 'm/s^2'
+
+# Conversion factor cache
+#
+# Quantity.rescale works the conversion factor out from the unit definitions on every call which is slow when done
+# for every planet. These functions cache the factor for each (source unit, target unit) pair so rescaling is a multiply
+
+_conversionFactors = {}
+_conversionCacheStats = {'hits': 0, 'misses': 0}
+
+
+def _unitKey(unit):
+    # hashing the Dimensionality object builds its string which is slower than rescaling
+    return tuple(unit._dimensionality.items())
+
+
+def conversionFactor(fromUnit, toUnit):
+    """ The factor to multiply the magnitude of a quantity in fromUnit by to give it in toUnit. Factors are cached
+    for each pair of units
+
+    :param fromUnit: unit or quantity to convert from
+    :param toUnit: unit or quantity to convert to
+    :raises ValueError: if the units are not compatible
+    :raises AttributeError: if fromUnit is not a quantity (ie nan or a float)
+    """
+
+    key = (_unitKey(fromUnit), _unitKey(toUnit))
+    try:
+        factor = _conversionFactors[key]
+    except KeyError:
+        if instr.enabled:
+            instr.count('astroquantities.conversionFactor.miss')
+        factor = float(Quantity(1., fromUnit.dimensionality).rescale(toUnit))
+        _conversionFactors[key] = factor
+        _conversionCacheStats['misses'] += 1
+    else:
+        _conversionCacheStats['hits'] += 1
+
+    return factor
+
+
+def rescale(quantity, unit):
+    """ Equivalent to quantity.rescale(unit) but uses the cached conversion factor
+
+    :raises ValueError: if the units are not compatible
+    :raises AttributeError: if quantity is not a quantity (ie nan or a float), as with quantity.rescale
+    """
+
+    if instr.enabled:
+        instr.count('astroquantities.rescale')
+
+    return Quantity(quantity.magnitude * conversionFactor(quantity, unit), unit.dimensionality)
+
+
+def rescaledMagnitude(quantity, unit):
+    """ The magnitude of quantity in unit (a float or array) using the cached conversion factor
+    """
+
+    if instr.enabled:
+        instr.count('astroquantities.rescaledMagnitude')
+
+    return quantity.magnitude * conversionFactor(quantity, unit)
+
+
+def conversionCacheInfo():
+    """ Returns the hits, misses, size and hit rate of the conversion factor cache
+    """
+
+    hits = _conversionCacheStats['hits']
+    misses = _conversionCacheStats['misses']
+    total = hits + misses
+
+    return {
+        'hits': hits,
+        'misses': misses,
+        'size': len(_conversionFactors),
+        'hitRate': hits / total if total else 0.,
+    }
+
+
+def clearConversionCache():
+    """ Empties the conversion factor cache and resets the hit / miss counts
+    """
+
+    _conversionFactors.clear()
+    _conversionCacheStats['hits'] = 0
+    _conversionCacheStats['misses'] = 0
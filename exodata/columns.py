@@ -0,0 +1,678 @@
+""" Vectorised evaluation of derived parameters over whole lists of planets and stars.
+
+The properties on the astroclasses (Planet.T, Planet.a, Star.d etc) evaluate a single object at a time using quantities
+arithmetic. This module extracts the catalogue values into numpy arrays in fixed units and evaluates the same equations
+for every object in one pass. The same fallback rules as the properties are followed (measured, then calculated, then
+estimated) and every column is returned with a per row provenance code so you can tell where each value came from.
+
+    >>> from exodata import columns
+    >>> planetCols = columns.planetColumns(exocat.planets)
+    >>> planetCols['T'].values  # temperature of every planet in K
+    >>> planetCols['T'].provenance  # MEASURED, CALCULATED or MISSING for each planet
+
+Unlike the properties, flags are not added to the objects.
+"""
+from __future__ import division
+from collections import namedtuple, OrderedDict
+import numbers
+import operator
+import re
+
+import numpy as np
+
+from . import astroquantities as aq
+from . import assumptions as assum
+from . import equations as eq
+from . import fastequations as feq
+from . import params as ed_params
+
+# Provenance codes, these mirror the flags added by the properties ie 'Calculated Temperature', 'Estimated Distance'
+MISSING = 0
+MEASURED = 1
+CALCULATED = 2
+ESTIMATED = 3
+
+provenanceNames = {
+    MISSING: 'Missing',
+    MEASURED: 'Measured',
+    CALCULATED: 'Calculated',
+    ESTIMATED: 'Estimated',
+}
+
+Column = namedtuple('Column', ('values', 'provenance', 'unit'))
+
+
+def paramColumn(objects, paramKey, unit=None):
+    """ Extracts a parameter from the params dict of each object into a float array, rescaled to unit. Missing values,
+    missing objects (None) and values that can't be converted are NaN.
+
+    :param objects: list of astro objects (or None)
+    :param paramKey: key of the params dict ie 'radius'
+    :param unit: quantities unit to rescale to, None takes the magnitude as is
+    :return: numpy float array
+    """
+
+    values = np.empty(len(objects))
+    toFloat = _FloatConverter(unit)
+
+    for i, astroObject in enumerate(objects):
+        try:
+            value = astroObject.params[paramKey]
+        except (KeyError, AttributeError):  # AttributeError - no object
+            values[i] = np.nan
+            continue
+
+        values[i] = toFloat(value)
+
+    return values
+
+
+def _toFloat(value, unit):
+    """ converts value to a float in unit
+    """
+    return _FloatConverter(unit)(value)
+
+
+class _FloatConverter(object):
+    """ Converts values to floats in unit (see _toFloat). Columns are usually all in the same units so the conversion
+    factor for the units of the last value is kept, this avoids hashing the units for every value.
+    """
+
+    def __init__(self, unit, strict=False):
+        self.unit = unit
+        self.strict = strict  # raise ValueError for values in incompatible units rather than returning nan
+        self._lastValue = None  # keeps the units in _lastKey alive so their ids aren't reused
+        self._lastKey = None
+        self._factor = None
+
+    def __call__(self, value):
+        try:
+            dimensionality = value._dimensionality
+        except AttributeError:  # a plain number (assumed to be in unit) or a string
+            try:
+                return float(value)
+            except (TypeError, ValueError):
+                return np.nan
+
+        magnitude = float(value)  # the magnitude, quicker than value.magnitude
+        if self.unit is None:
+            return magnitude
+
+        if len(dimensionality) == 1:
+            (unit, power), = dict.items(dimensionality)
+            key = (id(unit), power)
+        else:
+            key = tuple((id(unit), power) for unit, power in dict.items(dimensionality))
+
+        if key != self._lastKey:
+            try:
+                self._factor = aq.conversionFactor(value, self.unit)
+            except ValueError:  # incompatible units
+                if self.strict:
+                    raise
+                return np.nan
+            self._lastKey = key
+            self._lastValue = value
+
+        return magnitude * self._factor
+
+
+_accessors = {}
+_accessorStep = re.compile(r'^([A-Za-z_]\w*)(\(\))?$')
+_expressionGlobals = {}
+
+
+def _expressionNamespace():
+    """ The globals expressions are evaluated with. These used to be evaluated inside the plots module so its names
+    (np, aq, math etc) are used along with the package as ed
+    """
+
+    if not _expressionGlobals:
+        import exodata as ed
+        from . import plots  # plots imports this module
+
+        _expressionGlobals.update(vars(plots))
+        _expressionGlobals.setdefault('ed', ed)
+    return _expressionGlobals
+
+
+def accessor(path):
+    """ Turns an attribute path as used by the plots ie 'R', 'star.magV' or 'calcDensity()' into a function that takes
+    the object and returns the value. Paths are compiled once and cached, anything more complex than a chain of
+    attributes and calls without arguments is compiled as an expression.
+
+    :param path: attribute path relative to the object
+    :return: function(object)
+    """
+
+    try:
+        return _accessors[path]
+    except KeyError:
+        pass
+
+    steps = []
+    attributes = []
+    for part in path.split('.'):
+        match = _accessorStep.match(part)
+        if match is None:
+            code = compile('astroObject.' + path, '<{0}>'.format(path), 'eval')
+            namespace = _expressionNamespace()
+            getter = lambda astroObject: eval(code, namespace, {'astroObject': astroObject})
+            break
+
+        name, called = match.groups()
+        if called:  # attributes before the call are fetched in one go
+            if attributes:
+                steps.append(operator.attrgetter('.'.join(attributes)))
+                attributes = []
+            steps.append(operator.methodcaller(name))
+        else:
+            attributes.append(name)
+    else:
+        if attributes:
+            steps.append(operator.attrgetter('.'.join(attributes)))
+
+        if len(steps) == 1:
+            getter = steps[0]
+        else:
+            def getter(astroObject):
+                for step in steps:
+                    astroObject = step(astroObject)
+                return astroObject
+
+    _accessors[path] = getter
+    return getter
+
+
+# Paths calculated for every object at once by the columns functions, (classType, path) -> (function, column key).
+# Paths whose calculation flags the objects can't be here, the columns functions don't set the flags. ie
+# calcTransitDuration() uses Planet.P and Planet.a which add the 'Calculated Period' and 'Calculated SMA' flags
+_columnarPaths = {
+    ('Planet', 'calcTransitDepth()'): ('planetColumns', 'transitDepth'),
+}
+
+
+def attributeColumn(objects, path, unit=None):
+    """ Evaluates an attribute path (see accessor) on every object into a float array. Objects that don't have the
+    ancestor the path needs (HierarchyError) or return None give nan. Paths the columns functions calculate in bulk
+    (ie 'calcTransitDepth()' for planets) are taken from them.
+
+    :param objects: list of astro objects of the same type
+    :param path: attribute path ie 'R', 'star.magV' or 'calcDensity()'
+    :param unit: unit to rescale to, values without a unit are assumed to be in it already. None uses the unit of the
+        first value with one
+    :return: (values, unit) where unit is None if none of the values had a unit
+    :raises ValueError: if a value can't be rescaled to unit
+    """
+
+    from .astroclasses import HierarchyError
+
+    if len(objects):
+        classType = getattr(objects[0], 'classType', None)
+        columnar = _columnarPaths.get((classType, path))
+        if columnar is not None and all(getattr(obj, 'classType', None) == classType for obj in objects):
+            functionName, key = columnar
+            column = globals()[functionName](objects)[key]
+            if unit is None:
+                return column.values, column.unit
+            return column.values * aq.conversionFactor(column.unit, unit), unit
+
+    getter = accessor(path)
+    values = np.empty(len(objects))
+    toFloat = None if unit is None else _FloatConverter(unit, strict=True)
+
+    for row, astroObject in enumerate(objects):
+        try:
+            value = getter(astroObject)
+        except HierarchyError:
+            values[row] = np.nan
+            continue
+
+        if value is None:
+            values[row] = np.nan
+        elif toFloat is not None:
+            values[row] = toFloat(value)
+        elif hasattr(value, 'units'):  # the first value with a unit sets it
+            unit = value.units
+            toFloat = _FloatConverter(unit, strict=True)
+            values[row] = toFloat(value)
+        else:
+            values[row] = float(value)
+
+    return values, unit
+
+
+def valueColumn(objects, path):
+    """ Evaluates an attribute path (see accessor) on every object into an object array without any conversion, ie
+    for strings like 'discoveryMethod'. Objects without the ancestor the path needs (HierarchyError) give nan.
+    """
+
+    from .astroclasses import HierarchyError
+
+    getter = accessor(path)
+    values = np.empty(len(objects), dtype=object)
+
+    for row, astroObject in enumerate(objects):
+        try:
+            values[row] = getter(astroObject)
+        except HierarchyError:
+            values[row] = np.nan
+
+    return values
+
+
+def factorize(values):
+    """ Encodes values as integer codes into their unique values.
+
+    * assumptions.Categorical columns keep their categories (in order) with None added for unclassified values
+    * numeric columns are sorted, with nan last
+    * anything else (ie strings) keeps the order the values first appear in, any nan values are grouped as np.nan
+
+    :return: (codes, uniques) where uniques[codes] == values
+    """
+
+    if isinstance(values, assum.Categorical):
+        codes = np.where(values.codes == -1, len(values.categories), values.codes)
+        return codes, np.array(list(values.categories) + [None], dtype=object)
+
+    if not isinstance(values, np.ndarray):
+        values = _objectArray(values)
+
+    if values.dtype == object and all(isinstance(value, numbers.Number) for value in values):
+        values = values.astype(float)  # numbers (ie years) stored as objects are sorted like a numeric column
+
+    if values.dtype.kind in 'biuf':
+        uniques, codes = np.unique(values, return_inverse=True)
+        return codes, uniques
+
+    codeOf = {}
+    codes = np.empty(len(values), dtype=int)
+    for row, value in enumerate(values):
+        if value != value:  # nan
+            value = np.nan
+        try:
+            codes[row] = codeOf[value]
+        except KeyError:
+            codes[row] = codeOf[value] = len(codeOf)
+
+    uniques = np.empty(len(codeOf), dtype=object)
+    for value, code in codeOf.items():
+        uniques[code] = value
+
+    return codes, uniques
+
+
+class GroupTable(namedtuple('GroupTable', ('keys', 'values'))):
+    """ The result of groupBy. keys is a list with the unique values of each key column, values is an array with an
+    axis per key column so values[i, j] is the aggregate of the rows with keys[0][i] and keys[1][j]
+    """
+
+    __slots__ = ()
+
+    def asDict(self):
+        """ the table as nested OrderedDicts ie {year: {method: count}}
+        """
+
+        def nest(axis, values):
+            if axis == len(self.keys):
+                return values.item()
+            return OrderedDict((key, nest(axis + 1, values[i])) for i, key in enumerate(self.keys[axis]))
+
+        return nest(0, self.values)
+
+
+_aggregates = ('count', 'sum', 'mean', 'min', 'max')
+
+
+def groupBy(keys, values=None, aggregate='count', mask=None):
+    """ Groups the rows by one or more key columns and aggregates each group in a single vectorised pass
+
+        >>> planets = exocat.planets
+        >>> table = groupBy([valueColumn(planets, 'discoveryYear'), valueColumn(planets, 'discoveryMethod')])
+        >>> table.asDict()[2010]['transit']  # number of planets found by transit in 2010
+
+    :param keys: list of key columns (arrays, lists or assumptions.Categorical) of the same length, see factorize
+    :param values: array of floats to aggregate, not needed to count
+    :param aggregate: 'count', 'sum', 'mean', 'min' or 'max'. nan values are ignored, empty groups are 0 when
+        counting or summing and nan otherwise
+    :param mask: boolean array of the rows to include, the keys only include the values of these rows
+    :return: GroupTable
+    """
+
+    if not len(keys):
+        raise ValueError('at least one key column is needed')
+    if aggregate not in _aggregates:
+        raise ValueError('aggregate must be one of {0}, got {1}'.format(_aggregates, aggregate))
+    if aggregate != 'count' and values is None:
+        raise ValueError('values are needed to {0}'.format(aggregate))
+
+    if mask is not None:
+        mask = np.asarray(mask, dtype=bool)
+        keys = [_maskColumn(key, mask) for key in keys]
+        if values is not None:
+            values = np.asarray(values, dtype=float)[mask]
+
+    factorized = [factorize(key) for key in keys]
+    uniques = [keyUniques for codes, keyUniques in factorized]
+    shape = tuple(len(keyUniques) for keyUniques in uniques)
+    size = int(np.prod(shape))
+
+    groups = np.ravel_multi_index([codes for codes, keyUniques in factorized], shape)
+
+    if values is not None:
+        values = np.asarray(values, dtype=float)
+        hasValue = ~np.isnan(values)
+        groups, values = groups[hasValue], values[hasValue]
+
+    counts = np.bincount(groups, minlength=size)
+
+    if aggregate == 'count':
+        result = counts
+    elif aggregate in ('sum', 'mean'):
+        result = np.bincount(groups, weights=values, minlength=size)
+        if aggregate == 'mean':
+            with np.errstate(invalid='ignore'):
+                result = result / counts
+    else:
+        result = np.full(size, np.inf if aggregate == 'min' else -np.inf)
+        (np.minimum if aggregate == 'min' else np.maximum).at(result, groups, values)
+        result[counts == 0] = np.nan
+
+    return GroupTable(uniques, result.reshape(shape))
+
+
+def _objectArray(values):
+    array = np.empty(len(values), dtype=object)
+    array[:] = list(values)
+    return array
+
+
+def _maskColumn(column, mask):
+    if isinstance(column, assum.Categorical):
+        return assum.Categorical(column.codes[mask], column.categories)
+    if not isinstance(column, np.ndarray):
+        column = _objectArray(column)
+    return column[mask]
+
+
+def _parents(objects, parentClass):
+    """ returns a list of the parentClass of each object, or None where the object has no such parent
+    """
+
+    from .astroclasses import HierarchyError
+
+    parents = []
+    for astroObject in objects:
+        try:
+            parents.append(astroObject._getParentClass(astroObject.parent, parentClass))
+        except HierarchyError:
+            parents.append(None)
+
+    return parents
+
+
+def _provenance(measured, fallback, fallbackCode):
+    """ generates the provenance codes given the measured values and the values used in their place
+    """
+
+    provenance = np.full(len(measured), MISSING, dtype=np.int8)
+    provenance[~np.isnan(fallback)] = fallbackCode
+    provenance[~np.isnan(measured)] = MEASURED
+
+    return provenance
+
+
+def _categoryValues(categorical, mapping):
+    """ looks up each category of categorical in mapping, nan for None or categories not in mapping
+    """
+
+    lookup = np.array([mapping.get(name, np.nan) for name in categorical.categories] + [np.nan], dtype=float)
+    return lookup[categorical.codes]
+
+
+def _planetAlbedo(albedo, M_p, R_p):
+    """ albedo from the catalogue, or the assumption for the planets mass or radius type. Matches Planet.albedo for
+    planets where the temperature is not in the catalogue (the only time it is used for the calculation)
+    """
+
+    albedos = assum.currentAssumptions()['albedo']
+    massAlbedo = _categoryValues(assum.planetMassTypes(M_p, aq.M_j), albedos)
+    radiusAlbedo = _categoryValues(assum.planetRadiusTypes(R_p, aq.R_j), albedos)
+    assumed = np.where(np.isnan(M_p), radiusAlbedo, massAlbedo)
+
+    return np.where(np.isnan(albedo), assumed, albedo)
+
+
+def _stellarTemperature(stars, estimate):
+    """ returns the (measured, estimated) temperature of the stars in K
+    """
+
+    T_meas = paramColumn(stars, 'temperature', aq.K)
+    if estimate:
+        M_s = paramColumn(stars, 'mass', aq.M_s)
+        T_est = np.where(np.isnan(T_meas), feq.estimateStellarTemperature(M_s), np.nan)
+    else:
+        T_est = np.full(len(stars), np.nan)
+
+    return T_meas, T_est
+
+
+def _estimateMode(estimate, objects):
+    """ estimate if it is given, otherwise the mode the objects use (see params.estimating)
+    """
+
+    if estimate is None:
+        setting = getattr(objects[0], 'estimateMissingValues', None) if len(objects) else None
+        estimate = ed_params.estimating(setting)
+
+    return estimate
+
+
+def planetColumns(planets, estimate=None):
+    """ Calculates the derived parameters for every planet in planets in one pass
+
+    :param planets: list of Planet objects
+    :param estimate: calculate missing values, defaults to the objects setting (see params.estimating)
+
+    :return: OrderedDict of Column(values, provenance, unit) with the keys
+        * 'P' - Planet.P in days
+        * 'a' - Planet.a in au
+        * 'T' - Planet.T in K
+        * 'transitDuration' - Planet.calcTransitDuration() in minutes
+        * 'transitDepth' - Planet.calcTransitDepth()
+    """
+
+    estimate = _estimateMode(estimate, planets)
+
+    n = len(planets)
+    stars = _parents(planets, 'Star')
+
+    P_meas = paramColumn(planets, 'period', aq.day)
+    a_meas = paramColumn(planets, 'semimajoraxis', aq.au)
+    T_meas = paramColumn(planets, 'temperature', aq.K)
+    R_p = paramColumn(planets, 'radius', aq.R_j)
+    i = paramColumn(planets, 'inclination', aq.deg)
+    e = paramColumn(planets, 'eccentricity')
+    w = paramColumn(planets, 'periastron', aq.deg)
+    w[np.isnan(w) & (e == 0)] = 0.  # see PlanetAndBinaryCommon.periastron
+
+    M_s = paramColumn(stars, 'mass', aq.M_s)
+    R_s = paramColumn(stars, 'radius', aq.R_s)
+
+    nans = np.full(n, np.nan)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        if estimate:
+            # calcPeriod uses a from the catalogue, calcSMA uses P from the catalogue so there is no cycle here
+            P_calc = np.where(np.isnan(P_meas), feq.KeplersThirdLaw.P(a=a_meas, M_s=M_s), np.nan)
+            a_calc = np.where(np.isnan(a_meas), feq.KeplersThirdLaw.a(M_s=M_s, P=P_meas), np.nan)
+        else:
+            P_calc = a_calc = nans
+
+        P = np.where(np.isnan(P_meas), P_calc, P_meas)
+        a = np.where(np.isnan(a_meas), a_calc, a_meas)
+
+        if estimate:
+            T_s_meas, T_s_est = _stellarTemperature(stars, estimate)
+            T_s = np.where(np.isnan(T_s_meas), T_s_est, T_s_meas)
+            albedo = _planetAlbedo(paramColumn(planets, 'albedo'), paramColumn(planets, 'mass', aq.M_j), R_p)
+
+            T_calc = feq.MeanPlanetTemp.T_p(albedo, T_s, R_s, a)
+            T_calc[~np.isnan(T_meas)] = np.nan
+        else:
+            T_calc = nans
+
+        T = np.where(np.isnan(T_meas), T_calc, T_meas)
+
+        transitDuration = feq.TransitDuration.Td(P=P, a=a, Rp=R_p, Rs=R_s, i=i, e=e, w=w)
+        transitDepth = feq.TransitDepth.depth(R_s=R_s, R_p=R_p)
+
+    columns = OrderedDict()
+    columns['P'] = Column(P, _provenance(P_meas, P_calc, CALCULATED), aq.day)
+    columns['a'] = Column(a, _provenance(a_meas, a_calc, CALCULATED), aq.au)
+    columns['T'] = Column(T, _provenance(T_meas, T_calc, CALCULATED), aq.K)
+    columns['transitDuration'] = Column(transitDuration, _provenance(nans, transitDuration, CALCULATED), aq.min)
+    columns['transitDepth'] = Column(transitDepth, _provenance(nans, transitDepth, CALCULATED), aq.dimensionless)
+
+    return columns
+
+
+# (planet ids, estimate mode, astroclasses._changeGeneration, assumptions fingerprint) -> (planets, planetTypeColumns),
+# the least recently used first. The planets are kept so their ids aren't reused while cached
+_planetTypeCache = OrderedDict()
+_planetTypeCacheSize = 8
+
+# the assumptions the planet types are classified with
+_typeAssumptions = ('massType', 'radiusType', 'tempType')
+
+
+def planetTypeColumns(planets, estimate=None):
+    """ Classifies every planet in planets using the assumptions module. The result is cached until a parameter of any
+    object or the assumptions it uses change (not ie the density), so classifying the same planets again (ie for several plots) is a lookup. The
+    cached Categorical arrays are shared so they are read only.
+
+    :param planets: list of Planet objects
+    :param estimate: use calculated temperatures where the catalogue has none, defaults to the objects setting (see
+        params.estimating)
+
+    :return: OrderedDict of assumptions.Categorical with the keys 'type', 'massType', 'radiusType' and 'tempType'
+        matching Planet.type() etc
+    """
+
+    from . import astroclasses as ac
+
+    estimate = _estimateMode(estimate, planets)
+    assumptionKeys = _typeAssumptions + (('albedo',) if estimate else ())  # estimated temperatures use the albedo
+    key = (tuple(id(planet) for planet in planets), estimate, ac._changeGeneration,
+           assum.assumptionsFingerprint(assumptionKeys))
+
+    try:
+        cachedPlanets, types = _planetTypeCache.pop(key)
+    except KeyError:
+        types = _classifyPlanets(planets, estimate)
+        for categorical in types.values():
+            categorical.codes.flags.writeable = False
+    else:
+        planets = cachedPlanets
+
+    _planetTypeCache[key] = (tuple(planets), types)  # most recently used
+    while len(_planetTypeCache) > _planetTypeCacheSize:
+        _planetTypeCache.popitem(last=False)
+
+    return types
+
+
+def _classifyPlanets(planets, estimate):
+
+    T = planetColumns(planets, estimate)['T'].values
+    M_p = paramColumn(planets, 'mass', aq.M_j)
+    R_p = paramColumn(planets, 'radius', aq.R_j)
+
+    columns = OrderedDict()
+    columns['type'] = assum.planetTypes(T, M_p, R_p)
+    columns['massType'] = assum.planetMassTypes(M_p, aq.M_j)
+    columns['radiusType'] = assum.planetRadiusTypes(R_p, aq.R_j)
+    columns['tempType'] = assum.planetTempTypes(T, aq.K)
+
+    return columns
+
+
+def starColumns(stars, estimate=None):
+    """ Calculates the derived parameters for every star in stars in one pass
+
+    :param stars: list of Star objects
+    :param estimate: calculate missing values, defaults to the objects setting (see params.estimating)
+
+    :return: OrderedDict of Column(values, provenance, unit) with the keys
+        * 'T' - Star.T in K
+        * 'd' - Star.d in pc
+    """
+
+    estimate = _estimateMode(estimate, stars)
+
+    n = len(stars)
+    nans = np.full(n, np.nan)
+
+    T_meas, T_est = _stellarTemperature(stars, estimate)
+    T = np.where(np.isnan(T_meas), T_est, T_meas)
+
+    if estimate:
+        d_meas = paramColumn(_parents(stars, 'System'), 'distance', aq.pc)
+        missing = np.isnan(d_meas)
+
+        magV = magnitudeColumns(stars, 'V', estimate)['V'].values
+        absMag = nans.copy()
+        index = np.flatnonzero(missing)
+        absMag[index] = eq.estimateAbsoluteMagnitudes([stars[i].spectralType for i in index])
+
+        d_est = np.where(missing, feq.estimateDistance(magV, absMag), np.nan)
+        d = np.where(missing, d_est, d_meas)
+    else:  # Star.d returns nan for every star when not estimating
+        d_meas = d_est = d = nans
+
+    columns = OrderedDict()
+    columns['T'] = Column(T, _provenance(T_meas, T_est, ESTIMATED), aq.K)
+    columns['d'] = Column(d, _provenance(d_meas, d_est, ESTIMATED), aq.pc)
+
+    return columns
+
+
+def magnitudeColumns(stars, bands='UBVJIHKLMN', estimate=None):
+    """ The magnitudes of every star in stars, converting missing bands from the catalogue magnitudes (B, V, I, J, H
+    and K) as Star.magV etc do. Conversions are done for all stars at once using astroclasses.convertMagnitudes.
+
+    :param stars: list of Star objects
+    :param bands: the magnitude letters to return
+    :param estimate: convert missing magnitudes, defaults to the objects setting (see params.estimating)
+
+    :return: OrderedDict of Column(values, provenance, unit) for each band ie 'V'
+    """
+
+    from .astroclasses import convertMagnitudes, _columnForVConversion
+
+    estimate = _estimateMode(estimate, stars)
+
+    catalogueMags = dict(('mag' + letter, paramColumn(stars, 'mag' + letter)) for letter in 'BVIJHK')
+    spectralTypes = None
+
+    columns = OrderedDict()
+    for letter in bands:
+        measured = catalogueMags.get('mag' + letter)
+        if measured is None:
+            measured = paramColumn(stars, 'mag' + letter)
+
+        missing = np.isnan(measured)
+        converted = np.full(len(stars), np.nan)
+
+        # there is no conversion for I
+        if estimate and missing.any() and (letter == 'V' or letter in _columnForVConversion):
+            if spectralTypes is None:
+                spectralTypes = [star.spectralType for star in stars]
+            index = np.flatnonzero(missing)
+            converted[index] = convertMagnitudes(letter, [spectralTypes[i] for i in index],
+                                                 **dict((key, mags[index]) for key, mags in catalogueMags.items()))
+
+        columns[letter] = Column(np.where(missing, converted, measured), _provenance(measured, converted, ESTIMATED),
+                                 aq.dimensionless)
+
+    return columns
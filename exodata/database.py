@@ -7,7 +7,7 @@ import glob
 import os.path
 import io
 import gzip
-import requests
+import hashlib
 
 from .astroclasses import System, Binary, Star, Planet, Parameters, BinaryParameters, StarParameters, PlanetParameters
 
@@ -18,7 +18,7 @@ class OECDatabase(object):
     """ This Class Handles the OEC database including search functions.
     """
 
-    def __init__(self, databaseLocation, stream=False):
+    def __init__(self, databaseLocation, stream=False, estimateMissingValues=None):
         """ Holds the Open Exoplanet Catalogue database in python
 
         :param databaseLocation: file path to the Open Exoplanet Catalogue systems folder ie
@@ -26,9 +26,15 @@ class OECDatabase(object):
             get the catalogue from https://github.com/hannorein/open_exoplanet_catalogue
             OR the stream object (used by load_db_from_url)
         :param stream: if true treats the databaseLocation as a stream object
+        :param estimateMissingValues: whether the objects in this database estimate missing values, None (default)
+            follows params.estimateMissingValues. params.estimation() overrides this inside its with block
+
+        The fingerprint attribute is a hash of the catalogue xml, it is the same each time an unchanged catalogue is
+        loaded (see render.FigureCache)
         """
 
         self._loadDatabase(databaseLocation, stream)
+        self.estimateMissingValues = estimateMissingValues
         self._planetSearchDict = self._generatePlanetSearchDict()
 
         self.systemDict = dict((system.name, system) for system in self.systems)
@@ -40,6 +46,18 @@ class OECDatabase(object):
         return 'OECDatabase({} Systems, {} Binaries, {} Stars, {} Planets)'.format(len(self.systems), len(self.binaries),
                                                                                    len(self.stars), len(self.planets))
 
+    @property
+    def estimateMissingValues(self):
+        return self._estimateMissingValues
+
+    @estimateMissingValues.setter
+    def estimateMissingValues(self, estimate):
+        self._estimateMissingValues = estimate
+
+        for objects in (self.systems, self.binaries, self.stars, self.planets):
+            for obj in objects:
+                obj.estimateMissingValues = estimate
+
     def searchPlanet(self, name):
         """ Searches the database for a planet. Input can be complete ie GJ1214b, alternate name variations or even
         just 1214.
@@ -51,15 +69,15 @@ class OECDatabase(object):
         searchName = compactString(name)
         returnDict = {}
 
-        for altname, planetObj in self._planetSearchDict.iteritems():
+        for altname, planetObj in self._planetSearchDict.items():
             if re.search(searchName, altname):
                 returnDict[planetObj.name] = planetObj
 
         if returnDict:
             if len(returnDict) == 1:
-                return returnDict.values()[0]
+                return list(returnDict.values())[0]
             else:
-                return returnDict.values()
+                return list(returnDict.values())
 
         else:
             return False
@@ -112,7 +130,10 @@ class OECDatabase(object):
         self.planets = []
 
         if stream:
-            tree = ET.parse(databaseLocation)
+            content = databaseLocation.read()
+            self.fingerprint = hashlib.sha1(content).hexdigest()
+
+            tree = ET.parse(io.BytesIO(content))
             for system in tree.findall(".//system"):
                 self._loadSystem(system)
         else:
@@ -121,10 +142,14 @@ class OECDatabase(object):
                 raise LoadDataBaseError('could not find the database xml files. Have you given the correct location '
                                         'to the open exoplanet catalogues /systems folder?')
 
+            fileDigests = []
             for filename in databaseXML:
+                with open(filename, 'rb') as f:
+                    content = f.read()
+                fileDigests.append((os.path.basename(filename), hashlib.sha1(content).hexdigest()))
+
                 try:
-                    with open(filename, 'r') as f:
-                        tree = ET.parse(f)
+                    tree = ET.parse(io.BytesIO(content))
                 except ET.ParseError as e:  # this is sometimes raised rather than the root.tag system check
                     raise LoadDataBaseError(e)
 
@@ -137,6 +162,9 @@ class OECDatabase(object):
 
                 self._loadSystem(root)
 
+            # the order glob finds the files in can vary
+            self.fingerprint = hashlib.sha1(repr(sorted(fileDigests)).encode('utf-8')).hexdigest()
+
     def _loadSystem(self, root):
         systemParams = Parameters()
         for systemXML in root:
@@ -170,6 +198,7 @@ class OECDatabase(object):
 
             binary = Binary(binaryParams.params)
             binary.parent = parent
+            binary._resolveAncestors()
 
             parent._addChild(binary)  # Add star to the system
 
@@ -196,6 +225,7 @@ class OECDatabase(object):
 
             star = Star(starParams.params)
             star.parent = parent
+            star._resolveAncestors()
 
             parent._addChild(star)  # Add star to the system
 
@@ -221,6 +251,7 @@ class OECDatabase(object):
 
             planet = Planet(planetParams.params)
             planet.parent = parent
+            planet._resolveAncestors()
 
             parent._addChild(planet)  # Add planet to the star
             self.planets.append(planet)  # Add planet to the index
@@ -236,6 +267,8 @@ def load_db_from_url(url="https://github.com/OpenExoplanetCatalogue/oec_gzip/raw
     :return: OECDatabase objected initialised with latest OEC Version
     """
 
+    import requests  # only needed here, slow to import
+
     catalogue = gzip.GzipFile(fileobj=io.BytesIO(requests.get(url).content))
     database = OECDatabase(catalogue, stream=True)
 
@@ -14,10 +14,17 @@ Equations are named based on their main purpose or common name. I.e the equation
 scale height is :math:`H = \frac{k T_{eff}}{\mu g}` even though we could use it
 to calculate g, given the other parameters.
 
+Every input can also be a quantity array, in which case the equation is solved
+for every element at once (with the usual numpy broadcasting). Missing entries
+should be given as nan and will give nan in the output.
+
+    >>> KeplersThirdLaw(a=np.array([0.01488, 0.05, np.nan])*aq.au, M_s=0.176*aq.M_s).P
+    array([ 1.57969614,  9.73025377,         nan]) * d
+
 Equations are designed to be user friendly and accurate --- not fast. This means
 if you are using this as part of a large simulation and use ExoData to generate
 initial parameters you'll be fine. If however you are running a certain equation
-millions of times it may be worth using your own optimised version.
+millions of times it may be worth using the float versions in fastequations.
 
 **Abbreviations used in this module**
 
@@ -43,12 +50,13 @@ from numpy import sqrt, arcsin, sin, cos, log10, nan
 import numpy as np
 import os
 import sys
-from pkg_resources import resource_stream, resource_filename
 import math
 
 import quantities.constants as const
 from . import astroquantities as aq
 from . import params
+from . import instrumentation as instr
+from ._lazy import LazyAttributes
 
 
 pi = const.pi
@@ -58,10 +66,19 @@ G = const.Newtonian_constant_of_gravitation
 _rootdir = os.path.dirname(__file__)
 
 
+def _countNone(*args):
+    """ counts the arguments that are None. tuple.count(None) can't be used as it compares with == which is ambiguous
+    for arrays
+    """
+    return sum(1 for arg in args if arg is None)
+
+
 class _ExoDataEqn(object):
 
     def __init__(self):
         self.vars = (None,)
+        if instr.enabled:
+            instr.count('equations.' + type(self).__name__)
 
     def __repr__(self):
         vs = ['{}={}'.format(v, eval('self._{}'.format(v)), self)
@@ -100,7 +117,7 @@ class ScaleHeight(_ExoDataEqn):
 
         self.vars = ('H', 'T_eff', 'mu', 'g')  # list of input variables
 
-        if (T_eff, mu, g, H).count(None) > 1:
+        if _countNone(T_eff, mu, g, H) > 1:
             raise EqnInputError("You must give all parameters bar one")
 
     @property
@@ -114,7 +131,7 @@ class ScaleHeight(_ExoDataEqn):
         if H is None:
             H = (const.k * T_eff) / (mu * g)
 
-        return H.rescale(aq.m)
+        return aq.rescale(H, aq.m)
 
     @property
     def T_eff(self):
@@ -127,7 +144,7 @@ class ScaleHeight(_ExoDataEqn):
         if T_eff is None:
             T_eff = (H * mu * g) / const.k
 
-        return T_eff.rescale(aq.K)
+        return aq.rescale(T_eff, aq.K)
 
     @property
     def mu(self):
@@ -140,7 +157,7 @@ class ScaleHeight(_ExoDataEqn):
         if mu is None:
             mu = (const.k * T_eff) / (H * g)
 
-        return mu.rescale(aq.atomic_mass_unit)
+        return aq.rescale(mu, aq.atomic_mass_unit)
 
     @property
     def g(self):
@@ -153,7 +170,7 @@ class ScaleHeight(_ExoDataEqn):
         if g is None:
             g = (const.k * T_eff) / (H * mu)
 
-        return g.rescale(aq.m / aq.s**2)
+        return aq.rescale(g, aq.m / aq.s**2)
 
 
 class MeanPlanetTemp(_ExoDataEqn):
@@ -177,7 +194,7 @@ class MeanPlanetTemp(_ExoDataEqn):
         self.vars = ('A', 'T_s', 'T_p', 'R_s', 'a',
                      'epsilon')  # list of input variables
 
-        if (A, T_s, R_s, a, epsilon, T_p).count(None) > 1:
+        if _countNone(A, T_s, R_s, a, epsilon, T_p) > 1:
             raise EqnInputError("You must give all parameters bar one")
 
     @property
@@ -193,7 +210,7 @@ class MeanPlanetTemp(_ExoDataEqn):
         if T_p is None:
             T_p = T_s * ((1 - A) / epsilon)**(1 / 4) * sqrt(R_s / (2 * a))
 
-        return T_p.rescale(aq.degK)
+        return aq.rescale(T_p, aq.degK)
 
     @property
     def A(self):
@@ -208,7 +225,7 @@ class MeanPlanetTemp(_ExoDataEqn):
         if A is None:
             A = 1 - epsilon * (T_p / (T_s * sqrt(R_s / (2 * a))))**4
 
-        return A.rescale(aq.dimensionless)
+        return aq.rescale(A, aq.dimensionless)
 
     @property
     def T_s(self):
@@ -223,7 +240,7 @@ class MeanPlanetTemp(_ExoDataEqn):
         if T_s is None:
             T_s = T_p / (((1 - A) / epsilon)**(1 / 4) * sqrt(R_s / (2 * a)))
 
-        return T_s.rescale(aq.K)
+        return aq.rescale(T_s, aq.K)
 
     @property
     def R_s(self):
@@ -238,7 +255,7 @@ class MeanPlanetTemp(_ExoDataEqn):
         if R_s is None:
             R_s = 2 * a * (T_p / (T_s * ((1 - A) / epsilon)**(1 / 4)))**2
 
-        return R_s.rescale(aq.R_s)
+        return aq.rescale(R_s, aq.R_s)
 
     @property
     def a(self):
@@ -253,7 +270,7 @@ class MeanPlanetTemp(_ExoDataEqn):
         if a is None:
             a = R_s / (2 * (T_p / (T_s * ((1 - A) / epsilon)**(1 / 4)))**2)
 
-        return a.rescale(aq.au)
+        return aq.rescale(a, aq.au)
 
     @property
     def epsilon(self):
@@ -268,7 +285,7 @@ class MeanPlanetTemp(_ExoDataEqn):
         if epsilon is None:
             epsilon = (1 - A) / (T_p / (T_s * sqrt(R_s / (2 * a)))) ** 4
 
-        return epsilon.rescale(aq.dimensionless)
+        return aq.rescale(epsilon, aq.dimensionless)
 
 
 class StellarLuminosity(_ExoDataEqn):
@@ -296,7 +313,7 @@ class StellarLuminosity(_ExoDataEqn):
 
         self.vars = ('R', 'T', 'L')  # list of input variables
 
-        if (R, T, L).count(None) > 1:
+        if _countNone(R, T, L) > 1:
             raise EqnInputError("You must give all parameters bar one")
 
     @property
@@ -309,7 +326,7 @@ class StellarLuminosity(_ExoDataEqn):
         if L is None:
             L = 4 * pi * R**2 * sigma * T**4
 
-        return L.rescale(aq.W)
+        return aq.rescale(L, aq.W)
 
     @property
     def R(self):
@@ -321,7 +338,7 @@ class StellarLuminosity(_ExoDataEqn):
         if R is None:
             R = sqrt(L / (4 * pi * sigma * T**4))
 
-        return R.rescale(aq.R_s)
+        return aq.rescale(R, aq.R_s)
 
     @property
     def T(self):
@@ -333,7 +350,7 @@ class StellarLuminosity(_ExoDataEqn):
         if T is None:
             T = (L / (4 * pi * sigma * R**2))**0.25
 
-        return T.rescale(aq.K)
+        return aq.rescale(T, aq.K)
 
 
 class KeplersThirdLaw(_ExoDataEqn):
@@ -353,7 +370,7 @@ class KeplersThirdLaw(_ExoDataEqn):
         self._P = P
         self._M_p = M_p
 
-        if (a, M_s, P).count(None) > 1:
+        if _countNone(a, M_s, P) > 1:
             raise EqnInputError("You must give all parameters bar one")
 
     @property
@@ -367,7 +384,7 @@ class KeplersThirdLaw(_ExoDataEqn):
         if P is None:
             P = 2 * pi * sqrt(a**3 / (G * (M_s + M_p)))
 
-        return P.rescale(aq.day)
+        return aq.rescale(P, aq.day)
 
     @property
     def a(self):
@@ -380,7 +397,7 @@ class KeplersThirdLaw(_ExoDataEqn):
         try:
             if a is None:
                 a = ((P**2 * G * (M_s + M_p)) / (4 * pi**2))**(1. / 3)
-            return a.rescale(aq.au)
+            return aq.rescale(a, aq.au)
         except ValueError:
             return np.nan
 
@@ -395,7 +412,7 @@ class KeplersThirdLaw(_ExoDataEqn):
         if M_s is None:
             M_s = ((4 * pi**2 * a**3) / (G * P**2)) - M_p
 
-        return M_s.rescale(aq.M_s)
+        return aq.rescale(M_s, aq.M_s)
 
     @property
     def M_p(self):
@@ -408,7 +425,7 @@ class KeplersThirdLaw(_ExoDataEqn):
         if M_p is None:
             M_p = ((4 * pi**2 * a**3) / (G * P**2)) - M_s
 
-        return M_p.rescale(aq.M_j)
+        return aq.rescale(M_p, aq.M_j)
 
 
 class SurfaceGravity(_ExoDataEqn):
@@ -434,7 +451,7 @@ class SurfaceGravity(_ExoDataEqn):
         self._R = R
         self._g = g
 
-        if (M, R, g).count(None) > 1:
+        if _countNone(M, R, g) > 1:
             raise EqnInputError("You must give all parameters bar one")
 
     @property
@@ -447,7 +464,7 @@ class SurfaceGravity(_ExoDataEqn):
         if g is None:
             g = (G * M) / (R**2)
 
-        return g.rescale(aq.m / aq.s**2)
+        return aq.rescale(g, aq.m / aq.s**2)
 
     @property
     def M(self):
@@ -459,7 +476,7 @@ class SurfaceGravity(_ExoDataEqn):
         if M is None:
             M = (g * R**2) / G
 
-        return M.rescale(aq.M_j)
+        return aq.rescale(M, aq.M_j)
 
     @property
     def R(self):
@@ -471,7 +488,7 @@ class SurfaceGravity(_ExoDataEqn):
         if R is None:
             R = sqrt(M * G / g)
 
-        return R.rescale(aq.R_j)
+        return aq.rescale(R, aq.R_j)
 
 
 class Logg(_ExoDataEqn):
@@ -488,7 +505,7 @@ class Logg(_ExoDataEqn):
         self._R = R
         self._logg = logg
 
-        if (M, R, logg).count(None) > 1:
+        if _countNone(M, R, logg) > 1:
             raise EqnInputError("You must give all parameters bar one")
 
     @property
@@ -500,8 +517,8 @@ class Logg(_ExoDataEqn):
 
         if logg is None:
             g = SurfaceGravity(M, R).g
-            # the float wrapper is needed to remove dimensionality
-            logg = log10(float(g.rescale(aq.cm / aq.s**2)))
+            # taking the magnitude removes the dimensionality
+            logg = log10(aq.rescaledMagnitude(g, aq.cm / aq.s**2))
 
         return logg
 
@@ -516,7 +533,7 @@ class Logg(_ExoDataEqn):
             g = (10**logg) * aq.cm / aq.s**2
             M = SurfaceGravity(None, R, g).M
 
-        return M.rescale(aq.M_j)
+        return aq.rescale(M, aq.M_j)
 
     @property
     def R(self):
@@ -529,7 +546,7 @@ class Logg(_ExoDataEqn):
             g = (10**logg) * aq.cm / aq.s**2
             R = SurfaceGravity(M, None, g).R
 
-        return R.rescale(aq.R_j)
+        return aq.rescale(R, aq.R_j)
 
 
 class TransitDepth(_ExoDataEqn):
@@ -542,7 +559,7 @@ class TransitDepth(_ExoDataEqn):
         self._R_p = R_p
         self._depth = depth
 
-        if (R_s, R_p, depth).count(None) > 1:
+        if _countNone(R_s, R_p, depth) > 1:
             raise EqnInputError("You must give all parameters bar one")
 
     @property
@@ -555,7 +572,7 @@ class TransitDepth(_ExoDataEqn):
         if depth is None:
             depth = (R_p / R_s)**2
 
-        return depth.rescale(aq.dimensionless)
+        return aq.rescale(depth, aq.dimensionless)
 
     @property
     def R_s(self):
@@ -579,7 +596,7 @@ class TransitDepth(_ExoDataEqn):
         if R_p is None:
             R_p = R_s * sqrt(depth)
 
-        return R_p.rescale(aq.R_j)
+        return aq.rescale(R_p, aq.R_j)
 
 
 class Density(_ExoDataEqn):
@@ -597,7 +614,7 @@ class Density(_ExoDataEqn):
         self._R = R
         self._density = density
 
-        if (M, R, density).count(None) > 1:
+        if _countNone(M, R, density) > 1:
             raise EqnInputError("You must give all parameters bar one")
 
     @property
@@ -611,7 +628,7 @@ class Density(_ExoDataEqn):
             volume = 4. / 3 * pi * R**3
             density = (M / volume)
 
-        return density.rescale(aq.g / aq.cm**3)
+        return aq.rescale(density, aq.g / aq.cm**3)
 
     @property
     def M(self):
@@ -624,7 +641,7 @@ class Density(_ExoDataEqn):
             volume = 4. / 3 * pi * R**3
             M = density * volume
 
-        return M.rescale(aq.M_j)
+        return aq.rescale(M, aq.M_j)
 
     @property
     def R(self):
@@ -636,7 +653,7 @@ class Density(_ExoDataEqn):
         if R is None:
             R = (M / (density * 4. / 3 * pi))**(1. / 3)
 
-        return R.rescale(aq.R_j)
+        return aq.rescale(R, aq.R_j)
 
 
 class TransitDuration(_ExoDataEqn):
@@ -669,22 +686,22 @@ class TransitDuration(_ExoDataEqn):
         self.e = e
         Td = None
 
-        if w == 0:
-            self.w = 0 * aq.rad
+        if w is not None and np.all(w == 0):
+            self.w = np.zeros(np.shape(w)) * aq.rad
         else:
             self.w = w
 
-        if (P, a, Rp, Rs, i, e, w, Td).count(None) > 1:
+        if _countNone(P, a, Rp, Rs, i, e, w, Td) > 1:
             raise EqnInputError("You must give all parameters bar one")
 
     @property
     def Td(self):
 
-        a = (self.a / self.Rs).rescale(aq.dimensionless)
-        i = self.i.rescale(aq.rad)
-        w = self.w.rescale(aq.rad)
+        a = aq.rescale(self.a / self.Rs, aq.dimensionless)
+        i = aq.rescale(self.i, aq.rad)
+        w = aq.rescale(self.w, aq.rad)
         P = self.P
-        RpRs = (self.Rp / self.Rs).rescale(aq.dimensionless)
+        RpRs = aq.rescale(self.Rp / self.Rs, aq.dimensionless)
         e = self.e
 
         ro_pt = (1 - e**2) / (1 + e * np.sin(w))
@@ -695,7 +712,7 @@ class TransitDuration(_ExoDataEqn):
 
         duration = (P * (ro_pt**2)) / (np.pi * np.sqrt(1 - e**2)) * df
 
-        return duration.rescale(aq.min)
+        return aq.rescale(duration, aq.min)
 
 
 class ImpactParameter(_ExoDataEqn):
@@ -717,7 +734,7 @@ class ImpactParameter(_ExoDataEqn):
         self._i = i
         self._b = b
 
-        if (a, R_s, i, b).count(None) > 1:
+        if _countNone(a, R_s, i, b) > 1:
             raise EqnInputError("You must give all parameters bar one")
 
     @property
@@ -727,9 +744,9 @@ class ImpactParameter(_ExoDataEqn):
         R_s = self._R_s
         i = self._i
 
-        b = (a / R_s) * cos(i.rescale(aq.rad))
+        b = (a / R_s) * cos(aq.rescale(i, aq.rad))
 
-        return b.rescale(aq.dimensionless)
+        return aq.rescale(b, aq.dimensionless)
 
     @property
     def a(self):
@@ -738,9 +755,9 @@ class ImpactParameter(_ExoDataEqn):
         R_s = self._R_s
         i = self._i
 
-        a = (b * R_s) / cos(i.rescale(aq.rad))
+        a = (b * R_s) / cos(aq.rescale(i, aq.rad))
 
-        return a.rescale(aq.au)
+        return aq.rescale(a, aq.au)
 
     @property
     def R_s(self):
@@ -749,9 +766,9 @@ class ImpactParameter(_ExoDataEqn):
         b = self._b
         i = self._i
 
-        R_s = (a / b) * cos(i.rescale(aq.rad))
+        R_s = (a / b) * cos(aq.rescale(i, aq.rad))
 
-        return R_s.rescale(aq.R_s)
+        return aq.rescale(R_s, aq.R_s)
 
     @property
     def i(self):
@@ -760,9 +777,9 @@ class ImpactParameter(_ExoDataEqn):
         b = self._b
         R_s = self._R_s
 
-        i = np.arccos((R_s * b / a).rescale(aq.dimensionless))
+        i = np.arccos(aq.rescale(R_s * b / a, aq.dimensionless))
 
-        return i.rescale(aq.deg)
+        return aq.rescale(i, aq.deg)
 
 
 def ratioTerminatorToStar(H_p, R_p, R_s):  # TODO add into planet class
@@ -826,14 +843,14 @@ def transitDurationCircular(P, R_s, R_p, a, i):
     if i is nan:
         i = 90 * aq.deg
 
-    i = i.rescale(aq.rad)
+    i = aq.rescale(i, aq.rad)
     k = R_p / R_s  # lit reference for eclipsing binaries
     b = (a * cos(i)) / R_s
 
     duration = (P / pi) * arcsin(((R_s * sqrt((1 + k) **
                                               2 - b ** 2)) / (a * sin(i))).simplified)
 
-    return duration.rescale(aq.min)
+    return aq.rescale(duration, aq.min)
 
 
 def estimateStellarTemperature(M_s):
@@ -842,7 +859,7 @@ def estimateStellarTemperature(M_s):
     """
     # TODO improve with more x and k values from Cox 2000
     try:
-        temp = (5800 * aq.K * float(M_s.rescale(aq.M_s) ** 0.65)).rescale(aq.K)
+        temp = 5800 * aq.K * float(aq.rescale(M_s, aq.M_s) ** 0.65)
     except AttributeError:
         temp = np.nan
     return temp
@@ -881,6 +898,8 @@ def _createAbsMagEstimationDict():
     creates a dict in the form [Classletter][ClassNumber][List of values for
     each L Class]
     """
+    from pkg_resources import resource_filename
+
     magnitude_estimation_filepath = resource_filename(
         __name__, 'data/magnitude_estimation.dat')
     raw_table = np.loadtxt(magnitude_estimation_filepath, '|S5')
@@ -917,7 +936,29 @@ def _createAbsMagEstimationDict():
 
     return absMagDict, LClassRef
 
-absMagDict, LClassRef = _createAbsMagEstimationDict()
+
+
+def _createAbsMagInterpTables(absMagDict):
+    """ sorted class numbers and the absolute magnitude for each luminosity class (columns as LClassRef) of each class
+    letter in absMagDict for interpolating between class numbers
+
+    :return: dict of classLetter: (classNumbers, absMags)
+    """
+
+    tables = {}
+    for classLet, classLookup in absMagDict.items():
+        classNumbers = sorted(classLookup)
+        tables[classLet] = (np.array(classNumbers, dtype=float),
+                            np.array([classLookup[classNum] for classNum in classNumbers]))
+
+    return tables
+
+
+
+def _loadAbsMagTables():
+    absMagDict, LClassRef = _createAbsMagEstimationDict()
+    return {'absMagDict': absMagDict, 'LClassRef': LClassRef,
+            '_absMagInterpTables': _createAbsMagInterpTables(absMagDict)}
 
 
 def estimateAbsoluteMagnitude(spectralType):
@@ -937,26 +978,80 @@ def estimateAbsoluteMagnitude(spectralType):
     if specType.lumType == '':
         specType.lumType = 'V'  # assume main sequence
 
-    LNum = LClassRef[specType.lumType]
+    LNum = _lazyTables('LClassRef')[specType.lumType]
     classNum = specType.classNumber
     classLet = specType.classLetter
 
     try:
-        return absMagDict[classLet][classNum][LNum]
+        return _lazyTables('absMagDict')[classLet][classNum][LNum]
     # value not in table. Assume the number isn't there (Key p2.7, Ind p3+)
     except (KeyError, IndexError):
         try:
-            classLookup = absMagDict[classLet]
-            values = np.array(list(classLookup.values()))[
-                :, LNum]  # only select the right L Type
-            return np.interp(classNum, list(classLookup.keys()), values)
+            classNumbers, absMags = _lazyTables('_absMagInterpTables')[classLet]
+            return np.interp(classNum, classNumbers, absMags[:, LNum])
         except (KeyError, ValueError):
             return np.nan  # class not covered in table
 
 
+def estimateAbsoluteMagnitudes(spectralTypes):
+    """ estimateAbsoluteMagnitude for a list of spectral types at once
+
+    :param spectralTypes: list of spectral type strings
+    :return: float array of the absolute magnitudes, nan where they can't be estimated
+    """
+
+    from .astroclasses import parseSpectralTypes
+
+    classLetters, classNumbers, lumTypes = parseSpectralTypes(spectralTypes)
+
+    classNumbers[np.isnan(classNumbers)] = 5  # approximation using mid magnitude value
+    LClassRef = _lazyTables('LClassRef')
+    LNums = np.array([LClassRef[lumType or 'V'] for lumType in lumTypes], dtype=int)  # assume main sequence
+
+    absMags = np.full(len(spectralTypes), np.nan)
+    for classLet, (tableNumbers, tableMags) in _lazyTables('_absMagInterpTables').items():
+        inClass = np.flatnonzero(classLetters == classLet)
+        if not len(inClass):
+            continue
+
+        classNum = classNumbers[inClass]
+        LNum = LNums[inClass]
+
+        # values in the table are used directly, the interpolation would give nan next to a missing value
+        nodeIndex = np.clip(np.searchsorted(tableNumbers, classNum), 0, len(tableNumbers) - 1)
+        onNode = tableNumbers[nodeIndex] == classNum
+        classMags = np.where(onNode, tableMags[nodeIndex, LNum], np.nan)
+
+        for lumColumn in np.unique(LNum[~onNode]):
+            between = ~onNode & (LNum == lumColumn)
+            classMags[between] = np.interp(classNum[between], tableNumbers, tableMags[:, lumColumn])
+
+        absMags[inClass] = classMags
+
+    return absMags
+
+
+def estimateDistances(m, M, Av=0.0):
+    """ estimateDistance for arrays of apparent and absolute magnitudes
+
+    :param m: apparent magnitudes
+    :param M: absolute magnitudes
+    :param Av: absorbtion / extinction
+
+    :return: d (distance to each object) array in parsecs, nan where m or M are nan
+    """
+
+    m = np.asarray(m, dtype=float)
+    M = np.asarray(M, dtype=float)
+
+    return 10 ** ((m - M + 5 - Av) / 5) * aq.pc
+
+
 def _createMagConversionDict():
     """Loads magnitude_conversion.dat which is table A% 1995ApJS..101..117K
     """
+    from pkg_resources import resource_stream
+
     magnitude_conversion_filepath = resource_stream(
         __name__, 'data/magnitude_conversion.dat')
     raw_table = np.loadtxt(magnitude_conversion_filepath, '|S5')
@@ -974,7 +1069,15 @@ def _createMagConversionDict():
 
     return magDict
 
-magDict = _createMagConversionDict()
+
+# The data tables are read on first use rather than when exodata is imported
+_lazyTables = LazyAttributes(globals(), {
+    'absMagDict': _loadAbsMagTables,
+    'LClassRef': _loadAbsMagTables,
+    '_absMagInterpTables': _loadAbsMagTables,
+    'magDict': lambda: {'magDict': _createMagConversionDict()},
+})
+__getattr__ = _lazyTables.moduleGetattr
 
 
 def magKtoMagV(*args, **kwargs):
@@ -986,3 +1089,27 @@ def magKtoMagV(*args, **kwargs):
 
 class EqnInputError(params.ExoDataError):
     pass
+
+
+def _timedEquationProperties():
+    """ (class, name, property, timed property) of every variable of the equations, the timed versions time the
+    evaluation as equations.<Equation>.<variable>
+    """
+
+    for eqnClass in _ExoDataEqn.__subclasses__():
+        for name, value in list(vars(eqnClass).items()):
+            if isinstance(value, property):
+                fget = instr.timed('equations.{0}.{1}'.format(eqnClass.__name__, name))(value.fget)
+                yield eqnClass, name, value, property(fget, value.fset, value.fdel, value.__doc__)
+
+_equationProperties = list(_timedEquationProperties())
+
+
+def _timeEquations(enabled):
+    """ installs the timed properties while instrumentation is enabled, so the equations cost nothing extra otherwise
+    """
+
+    for eqnClass, name, plain, timed in _equationProperties:
+        setattr(eqnClass, name, timed if enabled else plain)
+
+instr.addToggleHook(_timeEquations)
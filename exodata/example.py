@@ -6,6 +6,7 @@
 
 from .astroclasses import Planet, Star, Binary, System, Parameters, PlanetParameters, StarParameters, BinaryParameters
 from . import astroclasses as ac
+from ._lazy import LazyAttributes
 
 
 def genExampleSystem():
@@ -113,6 +114,29 @@ def genExamplePlanet(binaryLetter=''):
     return examplePlanet
 
 
-examplePlanet = genExamplePlanet()
-exampleStar = examplePlanet.parent
-exampleSystem = exampleStar.parent
+# examplePlanet, exampleStar and exampleSystem are made on first use. They keep the number (1) they had when they
+# were made at import, whatever has been generated since
+_exampleNumber = ac._ExampleSystemCount
+ac._ExampleSystemCount += 1
+
+
+def _genDefaultExamples():
+    nextCount = ac._ExampleSystemCount
+    ac._ExampleSystemCount = _exampleNumber
+    try:
+        examplePlanet = genExamplePlanet()
+    finally:
+        ac._ExampleSystemCount = nextCount
+
+    return {
+        'examplePlanet': examplePlanet,
+        'exampleStar': examplePlanet.parent,
+        'exampleSystem': examplePlanet.parent.parent,
+    }
+
+_lazyExamples = LazyAttributes(globals(), {
+    'examplePlanet': _genDefaultExamples,
+    'exampleStar': _genDefaultExamples,
+    'exampleSystem': _genDefaultExamples,
+})
+__getattr__ = _lazyExamples.moduleGetattr
@@ -0,0 +1,289 @@
+"""
+Plain float / numpy versions of the equations in the equations module. These
+are for when you are evaluating an equation millions of times and the overhead
+of quantities in the equations classes (every evaluation allocates Quantity
+objects and rescales them) is too much.
+
+Each equation class in equations has a namespace here with the same name
+containing a function for every rearrangement the class supports. Arguments
+have the same names as the class arguments but are plain floats (or numpy
+arrays) in fixed units, the output is also in a fixed unit. These units are the
+same as the units the equations classes return the values in and are listed
+below.
+
+    >>> from exodata import fastequations as feq
+    >>> feq.KeplersThirdLaw.P(a=0.01488, M_s=0.176)
+    1.5796961419409112
+
+is equivalent to
+
+    >>> KeplersThirdLaw(a=0.01488*aq.au, M_s=0.176*aq.M_s).P
+    array(1.57969614) * d
+
+No unit checking is done so it is up to you to give the values in the right
+units.
+
+**Units used in this module**
+
+* *P* - orbital period (days)
+* *a* - semi-major axis (au)
+* *M_s* - stellar mass (M_s)
+* *R_s*, *Rs* - stellar radius (R_s)
+* *M_p*, *M* - planetary mass (M_j)
+* *R_p*, *Rp*, *R* - planetary radius (R_j), *R* in StellarLuminosity is the stellar radius (R_s)
+* *T_s*, *T_p*, *T_eff*, *T* - temperatures (K)
+* *L* - stellar luminosity (W)
+* *H* - scale height (m)
+* *mu* - mean molecular weight (atomic mass units)
+* *g* - surface gravity (m/s^2)
+* *logg* - log10 of the surface gravity in cgs units
+* *density* - density (g/cm^3)
+* *i*, *w* - inclination and argument of periastron (degrees)
+* *Td* - transit duration (minutes)
+* *A*, *epsilon*, *e*, *b*, *depth* - dimensionless
+"""
+
+from __future__ import division
+
+import numpy as np
+import quantities.constants as const
+
+from . import astroquantities as aq
+
+# SI values of the constants and units, taken from quantities so the results match the equations module
+pi = np.pi
+G = float(const.G.simplified)
+k = float(const.k.simplified)
+sigma = float(const.sigma.simplified)
+
+_u = float(aq.atomic_mass_unit.rescale(aq.kg))
+_AU = float(aq.au.rescale(aq.m))
+_R_S = float(aq.R_s.rescale(aq.m))
+_R_J = float(aq.R_j.rescale(aq.m))
+_M_S = float(aq.M_s.rescale(aq.kg))
+_M_J = float(aq.M_j.rescale(aq.kg))
+_DAY = float(aq.day.rescale(aq.s))
+_MINUTE = float(aq.min.rescale(aq.s))
+_GCM3 = float((aq.g / aq.cm**3).rescale(aq.kg / aq.m**3))
+_DEG = pi / 180.
+
+
+class ScaleHeight(object):
+    """ H = k T_eff / (mu g), see :py:class:`equations.ScaleHeight`
+    """
+
+    @staticmethod
+    def H(T_eff, mu, g):
+        return (k * T_eff) / (mu * _u * g)
+
+    @staticmethod
+    def T_eff(mu, g, H):
+        return (H * mu * _u * g) / k
+
+    @staticmethod
+    def mu(T_eff, g, H):
+        return (k * T_eff) / (H * g) / _u
+
+    @staticmethod
+    def g(T_eff, mu, H):
+        return (k * T_eff) / (H * mu * _u)
+
+
+class MeanPlanetTemp(object):
+    """ Equilibrium planet temperature, see :py:class:`equations.MeanPlanetTemp`
+    """
+
+    @staticmethod
+    def T_p(A, T_s, R_s, a, epsilon=0.7):
+        return T_s * ((1 - A) / epsilon)**(1 / 4) * np.sqrt((R_s * _R_S) / (2 * a * _AU))
+
+    @staticmethod
+    def A(T_s, R_s, a, T_p, epsilon=0.7):
+        return 1 - epsilon * (T_p / (T_s * np.sqrt((R_s * _R_S) / (2 * a * _AU))))**4
+
+    @staticmethod
+    def T_s(A, R_s, a, T_p, epsilon=0.7):
+        return T_p / (((1 - A) / epsilon)**(1 / 4) * np.sqrt((R_s * _R_S) / (2 * a * _AU)))
+
+    @staticmethod
+    def R_s(A, T_s, a, T_p, epsilon=0.7):
+        return 2 * a * _AU * (T_p / (T_s * ((1 - A) / epsilon)**(1 / 4)))**2 / _R_S
+
+    @staticmethod
+    def a(A, T_s, R_s, T_p, epsilon=0.7):
+        return (R_s * _R_S) / (2 * (T_p / (T_s * ((1 - A) / epsilon)**(1 / 4)))**2) / _AU
+
+    @staticmethod
+    def epsilon(A, T_s, R_s, a, T_p):
+        return (1 - A) / (T_p / (T_s * np.sqrt((R_s * _R_S) / (2 * a * _AU))))**4
+
+
+class StellarLuminosity(object):
+    """ L = 4 pi R^2 sigma T^4, see :py:class:`equations.StellarLuminosity`
+    """
+
+    @staticmethod
+    def L(R, T):
+        return 4 * pi * (R * _R_S)**2 * sigma * T**4
+
+    @staticmethod
+    def R(T, L):
+        return np.sqrt(L / (4 * pi * sigma * T**4)) / _R_S
+
+    @staticmethod
+    def T(R, L):
+        return (L / (4 * pi * sigma * (R * _R_S)**2))**0.25
+
+
+class KeplersThirdLaw(object):
+    """ Keplers third law, see :py:class:`equations.KeplersThirdLaw`
+    """
+
+    @staticmethod
+    def P(a, M_s, M_p=0.):
+        return 2 * pi * np.sqrt((a * _AU)**3 / (G * (M_s * _M_S + M_p * _M_J))) / _DAY
+
+    @staticmethod
+    def a(M_s, P, M_p=0.):
+        return (((P * _DAY)**2 * G * (M_s * _M_S + M_p * _M_J)) / (4 * pi**2))**(1. / 3) / _AU
+
+    @staticmethod
+    def M_s(a, P, M_p=0.):
+        return (((4 * pi**2 * (a * _AU)**3) / (G * (P * _DAY)**2)) - M_p * _M_J) / _M_S
+
+    @staticmethod
+    def M_p(a, M_s, P):
+        return (((4 * pi**2 * (a * _AU)**3) / (G * (P * _DAY)**2)) - M_s * _M_S) / _M_J
+
+
+class SurfaceGravity(object):
+    """ g = G M / R^2, see :py:class:`equations.SurfaceGravity`
+    """
+
+    @staticmethod
+    def g(M, R):
+        return (G * M * _M_J) / (R * _R_J)**2
+
+    @staticmethod
+    def M(R, g):
+        return (g * (R * _R_J)**2) / G / _M_J
+
+    @staticmethod
+    def R(M, g):
+        return np.sqrt(M * _M_J * G / g) / _R_J
+
+
+class Logg(object):
+    """ log10 of the surface gravity in cgs, see :py:class:`equations.Logg`
+    """
+
+    @staticmethod
+    def logg(M, R):
+        return np.log10(SurfaceGravity.g(M, R) * 100)
+
+    @staticmethod
+    def M(R, logg):
+        return SurfaceGravity.M(R, (10**logg) / 100)
+
+    @staticmethod
+    def R(M, logg):
+        return SurfaceGravity.R(M, (10**logg) / 100)
+
+
+class TransitDepth(object):
+    """ depth = (R_p / R_s)^2, see :py:class:`equations.TransitDepth`
+    """
+
+    @staticmethod
+    def depth(R_s, R_p):
+        return ((R_p * _R_J) / (R_s * _R_S))**2
+
+    @staticmethod
+    def R_s(R_p, depth):
+        return (R_p * _R_J) / np.sqrt(depth) / _R_S
+
+    @staticmethod
+    def R_p(R_s, depth):
+        return (R_s * _R_S) * np.sqrt(depth) / _R_J
+
+
+class Density(object):
+    """ density of a sphere, see :py:class:`equations.Density`
+    """
+
+    @staticmethod
+    def density(M, R):
+        volume = 4. / 3 * pi * (R * _R_J)**3
+        return (M * _M_J / volume) / _GCM3
+
+    @staticmethod
+    def M(R, density):
+        volume = 4. / 3 * pi * (R * _R_J)**3
+        return density * _GCM3 * volume / _M_J
+
+    @staticmethod
+    def R(M, density):
+        return (M * _M_J / (density * _GCM3 * 4. / 3 * pi))**(1. / 3) / _R_J
+
+
+class TransitDuration(object):
+    """ Eccentric transit duration from Kipping (2011), see :py:class:`equations.TransitDuration`
+    """
+
+    @staticmethod
+    def Td(P, a, Rp, Rs, i, e, w):
+        aRs = (a * _AU) / (Rs * _R_S)
+        RpRs = (Rp * _R_J) / (Rs * _R_S)
+
+        ro_pt = (1 - e**2) / (1 + e * np.sin(w * _DEG))
+        b_pt = aRs * ro_pt * np.cos(i * _DEG)
+        s_ps = 1.0 + RpRs
+        df = np.arcsin(np.sqrt((s_ps**2 - b_pt**2) / ((aRs**2) * (ro_pt**2) - b_pt**2)))
+
+        return (P * _DAY * (ro_pt**2)) / (pi * np.sqrt(1 - e**2)) * df / _MINUTE
+
+
+class ImpactParameter(object):
+    """ b = a / R_s cos(i), see :py:class:`equations.ImpactParameter`
+    """
+
+    @staticmethod
+    def b(a, R_s, i):
+        return ((a * _AU) / (R_s * _R_S)) * np.cos(i * _DEG)
+
+    @staticmethod
+    def a(R_s, i, b):
+        return (b * R_s * _R_S) / np.cos(i * _DEG) / _AU
+
+    @staticmethod
+    def R_s(a, i, b):
+        return ((a * _AU) / b) * np.cos(i * _DEG) / _R_S
+
+    @staticmethod
+    def i(a, R_s, b):
+        return np.arccos((R_s * _R_S) * b / (a * _AU)) / _DEG
+
+
+def transitDurationCircular(P, R_s, R_p, a, i):
+    """ see :py:func:`equations.transitDurationCircular`, returns minutes. NaN inclinations are taken as 90 degrees.
+    """
+
+    i = np.where(np.isnan(i), 90., i) * _DEG
+    k = (R_p * _R_J) / (R_s * _R_S)
+    b = (a * _AU * np.cos(i)) / (R_s * _R_S)
+
+    return (P * _DAY / pi) * np.arcsin(((R_s * _R_S) * np.sqrt((1 + k)**2 - b**2)) / (a * _AU * np.sin(i))) / _MINUTE
+
+
+def estimateStellarTemperature(M_s):
+    """ see :py:func:`equations.estimateStellarTemperature`, returns K
+    """
+
+    return 5800. * M_s**0.65
+
+
+def estimateDistance(m, M, Av=0.0):
+    """ see :py:func:`equations.estimateDistance`, returns pc
+    """
+
+    return 10 ** ((m - M + 5 - Av) / 5)
@@ -0,0 +1,197 @@
+""" Counters and timers on the hot paths of the package, for finding out what a piece of code actually does ie how
+often missing values are estimated or how many equations are built. It is off by default, when off each instrumented
+point costs a single flag check.
+
+    >>> from exodata import instrumentation
+    >>> with instrumentation.capture() as report:
+    ...     temperatures = [planet.T for planet in exocat.planets]
+    >>> print(report)
+    >>> report.counters['estimate.calcTemperature']
+
+The instrumented points are
+
+* estimate.<value> - counts of missing values estimated (ie estimate.calcTemperature) and timers of the calculations
+  that weren't cached
+* equations.<Equation> - counts of the equation classes built and equations.<Equation>.<variable> timers of their
+  evaluation
+* astroclasses.ancestor / astroclasses.walkParents - ancestor lookups (ie planet.star) and the steps taken walking
+  up the hierarchy by the ones that weren't cached
+* astroquantities.rescale / astroquantities.rescaledMagnitude / astroquantities.conversionFactor.miss - unit
+  conversions
+* magnitude.* - timers of magnitude conversions
+* limbdarkening.* - timers of limb darkening lookups
+
+For a long running process use enable() and take a report() of everything counted since, or since reset(). Counts are
+shared by all threads and not locked so a count made at the same time in two threads can be missed.
+"""
+import functools
+from collections import namedtuple
+from contextlib import contextmanager
+from timeit import default_timer
+
+enabled = False
+
+counters = {}  # name -> count
+timers = {}  # name -> [calls, total seconds]
+
+# nested capture() blocks keep instrumentation enabled until the outermost exits
+_captures = 0
+
+# called with enabled whenever it changes, see addToggleHook
+_toggleHooks = []
+
+
+def count(name, n=1):
+    """ adds n to the counter name, callers check enabled first
+    """
+    counters[name] = counters.get(name, 0) + n
+
+
+def addTime(name, seconds):
+    """ records a call of the timer name taking seconds, callers check enabled first
+    """
+    try:
+        timer = timers[name]
+    except KeyError:
+        timers[name] = [1, seconds]
+    else:
+        timer[0] += 1
+        timer[1] += seconds
+
+
+def timeCall(name, function, *args, **kwargs):
+    """ calls function timing it as the timer name, callers check enabled first
+    """
+    start = default_timer()
+    try:
+        return function(*args, **kwargs)
+    finally:
+        addTime(name, default_timer() - start)
+
+
+def timed(name):
+    """ Decorator timing each call of the function as the timer name when instrumentation is enabled
+    """
+
+    def decorator(function):
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not enabled:
+                return function(*args, **kwargs)
+
+            return timeCall(name, function, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def addToggleHook(hook):
+    """ Calls hook(enabled) now and whenever instrumentation is enabled or disabled, for instrumentation that is
+    installed only while enabled so it costs nothing otherwise (ie the equation timers)
+    """
+
+    _toggleHooks.append(hook)
+    hook(enabled)
+
+
+def _setEnabled(value):
+    global enabled
+
+    if value != enabled:
+        enabled = value
+        for hook in _toggleHooks:
+            hook(value)
+
+
+def enable():
+    _setEnabled(True)
+
+
+def disable():
+    _setEnabled(False)
+
+
+def reset():
+    """ clears all the counts and times
+    """
+    counters.clear()
+    timers.clear()
+
+
+Timer = namedtuple('Timer', ('calls', 'seconds'))
+
+
+class Report(object):
+    """ The counts (counters, name -> count) and times (timers, name -> Timer(calls, seconds)) over a period
+    """
+
+    def __init__(self, counters=None, timers=None):
+        self.counters = counters or {}
+        self.timers = timers or {}
+
+    def asDict(self):
+        """ the report as a dict of builtin types, ie for json
+        """
+        return {
+            'counters': dict(self.counters),
+            'timers': dict((name, {'calls': timer.calls, 'seconds': timer.seconds})
+                           for name, timer in self.timers.items()),
+        }
+
+    def __str__(self):
+        lines = ['{0:<50}{1:>12}'.format('counter', 'count')]
+        for name in sorted(self.counters):
+            lines.append('{0:<50}{1:>12}'.format(name, self.counters[name]))
+
+        lines.append('')
+        lines.append('{0:<50}{1:>12}{2:>14}{3:>14}'.format('timer', 'calls', 'total (ms)', 'mean (us)'))
+        for name, timer in sorted(self.timers.items(), key=lambda item: item[1].seconds, reverse=True):
+            lines.append('{0:<50}{1:>12}{2:>14.3f}{3:>14.2f}'.format(name, timer.calls, timer.seconds * 1e3,
+                                                                    timer.seconds / timer.calls * 1e6))
+
+        return '\n'.join(lines)
+
+    def __repr__(self):
+        return 'Report({0} counters, {1} timers)'.format(len(self.counters), len(self.timers))
+
+
+def report():
+    """ a Report of everything counted since instrumentation was enabled or reset()
+    """
+
+    return Report(dict(counters), dict((name, Timer(*timer)) for name, timer in timers.items()))
+
+
+@contextmanager
+def capture():
+    """ Enables instrumentation inside a with block. Yields a Report which is filled in with the counts and times from
+    inside the block when it exits.
+    """
+
+    global _captures
+
+    captured = Report()
+    startCounters = dict(counters)
+    startTimers = dict((name, tuple(timer)) for name, timer in timers.items())
+
+    wasEnabled = enabled
+    _captures += 1
+    _setEnabled(True)
+    try:
+        yield captured
+    finally:
+        _captures -= 1
+        if not _captures:
+            _setEnabled(wasEnabled)
+
+        for name, value in counters.items():
+            value -= startCounters.get(name, 0)
+            if value:
+                captured.counters[name] = value
+
+        for name, (calls, seconds) in timers.items():
+            startCalls, startSeconds = startTimers.get(name, (0, 0.))
+            if calls - startCalls:
+                captured.timers[name] = Timer(calls - startCalls, seconds - startSeconds)
@@ -0,0 +1,282 @@
+""" Quadratic limb darkening coefficients from the table in data/quadratic.dat
+
+The table is loaded once, the first time it is needed, into a grid indexed by (logg, T, [M/H], coefficient,
+wavelength) so a lookup is an index operation rather than a scan of the table. The grid is saved as
+data/quadratic.npy so later sessions can skip parsing the text table. It is written to a temporary file and moved into
+place so other processes never read a partly written grid. If the package directory isn't writable the grid is just
+kept in memory.
+
+    >>> from exodata import limbdarkening
+    >>> limbdarkening.quadraticCoeffs(5800, 4.44, 0., wavelength=1.22)
+    (0.2541, 0.3254)
+
+For many stars and wavelengths use quadraticCoeffsBatch which interpolates between the nodes of the table
+
+    >>> u1, u2 = limbdarkening.quadraticCoeffsBatch(T_array, logg_array, Z_array, np.linspace(0.5, 2.5, 200))
+"""
+
+import os
+import tempfile
+
+import numpy as np
+
+from . import instrumentation as instr
+
+# The intervals of values in the table, lookups choose the node nearest to the star
+temperatures = np.array([
+    3500., 3750., 4000., 4250., 4500., 4750., 5000., 5250., 5500., 5750., 6000., 6250.,
+    6500., 6750., 7000., 7250., 7500., 7750., 8000., 8250., 8500., 8750., 9000., 9250.,
+    9500., 9750., 10000., 10250., 10500., 10750., 11000., 11250., 11500., 11750., 12000., 12250.,
+    12500., 12750., 13000., 14000., 15000., 16000., 17000., 19000., 20000., 21000., 22000., 23000.,
+    24000., 25000., 26000., 27000., 28000., 29000., 30000., 31000., 32000., 33000., 34000., 35000.,
+    36000., 37000., 38000., 39000., 40000., 41000., 42000., 43000., 44000., 45000., 46000., 47000.,
+    48000., 49000., 50000.])
+loggs = np.array([0., 0.5, 1., 1.5, 2., 2.5, 3., 3.5, 4., 4.5, 5.])
+metallicities = np.array([-5., -4.5, -4., -3.5, -3., -2.5, -2., -1.5, -1., -0.5, -0.3, -0.2, -0.1, 0., 0.1, 0.2, 0.3,
+                          0.5, 1.])
+wavelengths = np.array([0.365, 0.445, 0.551, 0.658, 0.806, 1.22, 1.63, 2.19, 3.45])  # microns
+
+_grid = None
+
+
+def _tablePath():
+    from pkg_resources import resource_filename
+    return resource_filename(__name__, 'data/quadratic.dat')
+
+
+def _gridPath():
+    from pkg_resources import resource_filename
+    return resource_filename(__name__, 'data/quadratic.npy')
+
+
+def _axisIndex(axis, values):
+    """ index of each value in axis, -1 where the value isn't a node of the axis
+    """
+    index = np.searchsorted(axis, values)
+    index[index == len(axis)] = 0
+    index[axis[index] != values] = -1
+
+    return index
+
+
+def _buildGrid(table):
+    """ Turns the rows of quadratic.dat into the coefficient grid. Columns are 0 - coefficient (1 or 2), 2 - logg,
+    3 - T, 4 - [M/H] and 8: - the coefficient at each of the wavelengths. Nodes not in the table are nan.
+    """
+
+    grid = np.full((len(loggs), len(temperatures), len(metallicities), 2, len(wavelengths)), np.nan)
+
+    loggIndex = _axisIndex(loggs, table[:, 2])
+    tempIndex = _axisIndex(temperatures, table[:, 3])
+    mhIndex = _axisIndex(metallicities, table[:, 4])
+    coeffIndex = table[:, 0].astype(int) - 1
+
+    onGrid = (loggIndex >= 0) & (tempIndex >= 0) & (mhIndex >= 0)
+    grid[loggIndex[onGrid], tempIndex[onGrid], mhIndex[onGrid], coeffIndex[onGrid]] = table[onGrid, 8:]
+
+    return grid
+
+
+def _loadCachedGrid():
+    """ returns the grid saved in quadratic.npy or None if there isn't one or it is older than the table
+    """
+
+    try:
+        if os.path.getmtime(_gridPath()) < os.path.getmtime(_tablePath()):
+            return None
+        grid = np.load(_gridPath())
+    except (IOError, OSError, ValueError):
+        return None
+
+    if grid.shape != (len(loggs), len(temperatures), len(metallicities), 2, len(wavelengths)):
+        return None
+
+    return grid
+
+
+def _saveGrid(grid):
+    """ saves the grid as quadratic.npy, writing it to a temporary file in the same directory first and then replacing
+    quadratic.npy with it so a process loading the grid at the same time sees the old file or the whole new one
+    """
+
+    path = _gridPath()
+    fd, tempPath = tempfile.mkstemp(suffix='.npy', prefix='.quadratic-', dir=os.path.dirname(path))
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            np.save(f, grid)
+        getattr(os, 'replace', os.rename)(tempPath, path)  # os.replace is python 3.3+, rename replaces on posix
+    except BaseException:
+        os.remove(tempPath)
+        raise
+
+
+def loadGrid():
+    """ Returns the limb darkening coefficient grid, loading it on the first call
+
+    :return: array with shape (logg, T, [M/H], 2, wavelength), nan where the table has no values
+    """
+
+    global _grid
+
+    if _grid is None:
+        grid = _loadCachedGrid()
+
+        if grid is None:
+            grid = _buildGrid(np.loadtxt(_tablePath()))
+            try:
+                _saveGrid(grid)
+            except (IOError, OSError):  # ie installed somewhere read only, keep the grid in memory only
+                pass
+
+        _grid = grid
+
+    return _grid
+
+
+def _nearestIndex(axis, value):
+    """ index of the node in axis closest to value
+    """
+    return (abs(axis - value)).argmin()
+
+
+def quadraticCoeffs(T, logg, Z, wavelength=1.22):
+    """ Looks up the quadratic limb darkening coefficients for the table node nearest to T, logg and Z, interpolated
+    to the wavelength.
+
+    :param T: stellar temperature (K)
+    :param logg: log10 of the stellar surface gravity in cgs
+    :param Z: metallicity [M/H]
+    :param wavelength: microns, values outside the table give 0
+
+    :raises ValueError: if the table doesn't have values for the nearest node
+    :return: limb darkening coefficients 1 and 2
+    """
+
+    coeffs = loadGrid()[_nearestIndex(loggs, logg), _nearestIndex(temperatures, T), _nearestIndex(metallicities, Z)]
+
+    if np.isnan(coeffs).any():
+        raise ValueError('No limb darkening values could be found')
+
+    u1AtWavelength = np.interp(wavelength, wavelengths, coeffs[0], left=0, right=0)
+    u2AtWavelength = np.interp(wavelength, wavelengths, coeffs[1], left=0, right=0)
+
+    return u1AtWavelength, u2AtWavelength
+
+
+def _linearWeights(axis, values):
+    """ lower node index and the fractional distance to the next node of each value along axis, values outside the
+    axis are clamped to the first / last node
+    """
+    lower = np.clip(np.searchsorted(axis, values, side='right') - 1, 0, len(axis) - 2)
+    with np.errstate(invalid='ignore'):
+        frac = np.clip((values - axis[lower]) / (axis[lower + 1] - axis[lower]), 0., 1.)
+
+    return lower, frac
+
+
+def _nearestIndices(axis, values):
+    """ vectorised _nearestIndex
+    """
+    return abs(axis[np.newaxis, :] - values[:, np.newaxis]).argmin(axis=1)
+
+
+def _interpolateGrid(grid, T, logg, Z):
+    """ multilinear interpolation of the grid in logg, T and [M/H]. Returns an (n, 2, wavelength) array, nan where a
+    node that contributes to the value has no coefficients
+    """
+
+    corners = []
+    for axis, values in ((loggs, logg), (temperatures, T), (metallicities, Z)):
+        lower, frac = _linearWeights(axis, values)
+        corners.append(((lower, 1 - frac), (lower + 1, frac)))
+
+    coeffs = np.zeros((len(T), 2, len(wavelengths)))
+    for (loggIndex, loggWeight) in corners[0]:
+        for (tempIndex, tempWeight) in corners[1]:
+            for (mhIndex, mhWeight) in corners[2]:
+                weight = (loggWeight * tempWeight * mhWeight)[:, np.newaxis, np.newaxis]
+                nodeCoeffs = grid[loggIndex, tempIndex, mhIndex]
+                # nodes with no weight shouldn't make the result nan
+                coeffs += np.where(weight > 0, weight * nodeCoeffs, 0.)
+
+    return coeffs
+
+
+def _interpolateWavelengths(coeffs, wavelength):
+    """ vectorised np.interp(wavelength, wavelengths, coeffs, left=0, right=0) along the last axis of coeffs
+    """
+
+    lower, frac = _linearWeights(wavelengths, wavelength)
+    result = coeffs[..., lower] * (1 - frac) + coeffs[..., lower + 1] * frac
+    result[..., (wavelength < wavelengths[0]) | (wavelength > wavelengths[-1])] = 0
+
+    return result
+
+
+def quadraticCoeffsBatch(T, logg, Z, wavelength=1.22, method='linear'):
+    """ Limb darkening coefficients for many stars at many wavelengths at once.
+
+    :param T: array of stellar temperatures (K)
+    :param logg: array of log10 stellar surface gravities in cgs
+    :param Z: array of metallicities [M/H]
+    :param wavelength: array of wavelengths in microns, values outside the table give 0
+    :param method: 'linear' interpolates between the nodes of the table in logg, T and [M/H], 'nearest' uses the
+        nearest node as quadraticCoeffs does. Values outside the table are clamped to its edges.
+
+    T, logg and Z are broadcast together. Unlike quadraticCoeffs a ValueError is not raised where the table has no
+    values, the coefficients are nan for those stars (as they are for stars with nan parameters)
+
+    :return: u1, u2 arrays of shape (number of stars, number of wavelengths)
+    """
+
+    T, logg, Z = [np.atleast_1d(np.asarray(values, dtype=float)) for values in np.broadcast_arrays(T, logg, Z)]
+    wavelength = np.atleast_1d(np.asarray(wavelength, dtype=float))
+    grid = loadGrid()
+
+    if method == 'linear':
+        coeffs = _interpolateGrid(grid, T, logg, Z)
+    elif method == 'nearest':
+        coeffs = grid[_nearestIndices(loggs, logg), _nearestIndices(temperatures, T),
+                      _nearestIndices(metallicities, Z)]
+    else:
+        raise ValueError("method must be 'linear' or 'nearest' not {0!r}".format(method))
+
+    coeffs[np.isnan(T) | np.isnan(logg) | np.isnan(Z)] = np.nan
+
+    result = _interpolateWavelengths(coeffs, wavelength)
+    result[np.isnan(coeffs).any(axis=-1)] = np.nan  # rather than 0 for wavelengths outside the table
+
+    return result[:, 0], result[:, 1]
+
+
+_lookups = [(name, plain, instr.timed('limbdarkening.' + name)(plain))
+            for name, plain in (('quadraticCoeffs', quadraticCoeffs), ('quadraticCoeffsBatch', quadraticCoeffsBatch))]
+
+
+def _timeLookups(enabled):
+    """ installs the timed lookups while instrumentation is enabled, as with the equations
+    """
+
+    for name, plain, timed in _lookups:
+        globals()[name] = timed if enabled else plain
+
+instr.addToggleHook(_timeLookups)
+
+
+def clearCache():
+    """ Forgets the loaded grid, it is loaded again on the next lookup
+    """
+
+    global _grid
+    _grid = None
+
+
+def removeGridFile():
+    """ Removes quadratic.npy so the grid is rebuilt from the table the next time it is loaded, ie after editing
+    quadratic.dat by hand in the same second as the grid was saved
+    """
+
+    try:
+        os.remove(_gridPath())
+    except (IOError, OSError):
+        pass
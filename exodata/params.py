@@ -1,9 +1,70 @@
 """ Global parameters for the oecpy package are stored here
 """
+from contextlib import contextmanager
+import threading
+
+try:
+    from contextvars import ContextVar
+except ImportError:  # python < 3.7
+    ContextVar = None
 
 estimateMissingValues = True
 
 
+class _ThreadScope(threading.local):
+    """ stands in for a ContextVar where they aren't available, the scope is then per thread
+    """
+
+    value = None
+
+    def get(self):
+        return self.value
+
+    def set(self, value):
+        previous = self.value
+        self.value = value
+        return previous
+
+    def reset(self, previous):
+        self.value = previous
+
+
+if ContextVar is not None:
+    _estimateScope = ContextVar('estimateMissingValues', default=None)
+else:
+    _estimateScope = _ThreadScope()
+
+
+def estimating(default=None):
+    """ Returns whether missing values should be estimated. This is the mode set with estimation() in the current
+    context if there is one, otherwise default (used for the per database setting) and finally estimateMissingValues
+    """
+
+    scoped = _estimateScope.get()
+    if scoped is not None:
+        return scoped
+    elif default is not None:
+        return default
+    else:
+        return estimateMissingValues
+
+
+@contextmanager
+def estimation(enabled):
+    """ Sets whether missing values are estimated inside a with block. This only applies to the current thread (or
+    asyncio task) so other threads can use the catalogue with a different mode at the same time.
+
+        >>> with exodata.params.estimation(False):
+        ...     planet.T  # the catalogue value or nan
+    """
+
+    token = _estimateScope.set(bool(enabled))
+    try:
+        yield
+    finally:
+        _estimateScope.reset(token)
+
+
 # here be dragons
 class ExoDataError(Exception):
-    pass
\ No newline at end of file
+    pass
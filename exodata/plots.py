@@ -4,18 +4,64 @@ import os
 import sys
 import math
 from collections import OrderedDict
+from contextlib import contextmanager
 
 import numpy as np
+import matplotlib
+import matplotlib.image
 import matplotlib.pyplot as plt
 from matplotlib import rcParams
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 import time
 
 from . import astroquantities as aq
 from . import astroclasses as ac
+from . import columns
+from .params import ContextVar, _ThreadScope
 
 
 rcParams.update({'figure.autolayout': True})
 
+# whether figures are created headless, set by headless() for the current thread (or asyncio task)
+if ContextVar is not None:
+    _headlessScope = ContextVar('headless', default=False)
+else:
+    _headlessScope = _ThreadScope()
+
+
+@contextmanager
+def headless():
+    """ Figures created inside a with block use the Agg canvas directly instead of pyplot, so they aren't shown, aren't
+    redrawn after every change and are freed as soon as they are no longer referenced. render.py uses this to render
+    figures in batches. This only applies to the current thread so threads can render figures at the same time.
+    """
+
+    token = _headlessScope.set(True)
+    try:
+        yield
+    finally:
+        _headlessScope.reset(token)
+
+
+def _newFigure(figsize=None):
+    """ a new figure, through pyplot so it can be shown unless rendering headless
+    """
+
+    if _headlessScope.get():
+        fig = Figure(figsize=figsize)
+        FigureCanvasAgg(fig)
+        return fig
+    else:
+        return plt.figure(figsize=figsize)
+
+
+def _getCmap(name):
+    try:
+        return matplotlib.colormaps[name]
+    except AttributeError:  # matplotlib < 3.5
+        return plt.cm.get_cmap(name)
+
 
 class _GlobalFigure(object):
     """ sets up the figure and subfigure object with all the global parameters.
@@ -39,14 +85,14 @@ class _GlobalFigure(object):
             raise ValueError('Size must be large or small')
 
     def _set_size_small(self):
-        self.fig = plt.figure(figsize=(5, 4))
+        self.fig = _newFigure(figsize=(5, 4))
         self.ax = self.fig.add_subplot(1, 1, 1)
         self.set_title_size(10)
         self.set_axis_label_size(12)
         self.set_axis_tick_label_size(12)
 
     def _set_size_large(self):
-        self.fig = plt.figure(figsize=(10, 7.5))
+        self.fig = _newFigure(figsize=(10, 7.5))
         self.ax = self.fig.add_subplot(1, 1, 1)
         self.set_title_size(20)
         self.set_axis_label_size(20)
@@ -56,21 +102,21 @@ class _GlobalFigure(object):
         ax = self.ax
         for item in ([ax.title, ax.xaxis.label, ax.yaxis.label] + ax.get_xticklabels() + ax.get_yticklabels()):
             item.set_fontsize(fontsize)
-        plt.draw()
+        self._draw()
 
     def set_title_size(self, fontsize):
         self.ax.title.set_fontsize(fontsize)
-        plt.draw()
+        self._draw()
 
     def set_axis_label_size(self, fontsize):
         for axis in (self.ax.xaxis.label, self.ax.yaxis.label):
             axis.set_fontsize(fontsize)
-        plt.draw()
+        self._draw()
 
     def set_axis_tick_label_size(self, fontsize):
         for axis in self.ax.get_xticklabels() + self.ax.get_yticklabels():
             axis.set_fontsize(fontsize)
-        plt.draw()
+        self._draw()
 
     # set_foregroundcolor / set_backgroundcolor from Jasonmc https://gist.github.com/jasonmc/1160951
     def set_foregroundcolor(self, color):
@@ -104,7 +150,7 @@ class _GlobalFigure(object):
              tl.set_color(color)
          for tl in ax.get_yticklabels():
              tl.set_color(color)
-         plt.draw()
+         self._draw()
 
     def set_backgroundcolor(self, color):
          '''Sets the background color of the current axes (and legend).
@@ -118,7 +164,13 @@ class _GlobalFigure(object):
          if lh != None:
              lh.legendPatch.set_facecolor(color)
 
-         plt.draw()
+         self._draw()
+
+    def _draw(self):
+        """ redraws an interactive figure after a change, headless figures are only drawn when they are saved
+        """
+        if not _headlessScope.get():
+            self.fig.canvas.draw_idle()
 
     def set_y_axis_log(self, logscale=True):
         if logscale:
@@ -196,7 +248,8 @@ class _AstroObjectFigs(_GlobalFigure):
 class _BaseDataPerClass(_AstroObjectFigs):  # hangover from ETLOS's multiple child plot classes
     """ Base class for plots counting the results by a attribute. Child classes must modify
     * _classVariables (self._allowedKeys, )
-    * _getSortKey (take the planet, turn it into a key)
+    * _sortKeys (the key of every object as a column ie from columns.planetTypeColumns) or _getSortKey (take the
+      planet, turn it into a key)
     """
 
     def __init__(self, astroObjectList, unit=None, size='small'):  # added unit here as class will break without it anyway
@@ -220,7 +273,7 @@ class _BaseDataPerClass(_AstroObjectFigs):  # hangover from ETLOS's multiple chi
         must set
         *self._allowedKeys = (tuple of keys)
         """
-        self._allowedKeys = ('Class')
+        self._allowedKeys = ('Class',)
 
     def _getSortKey(self, planet):
         """ Takes a planet and turns it into a key to be sorted by
@@ -230,16 +283,27 @@ class _BaseDataPerClass(_AstroObjectFigs):  # hangover from ETLOS's multiple chi
 
         return 'Class'
 
+    def _sortKeys(self):
+        """ The sort key of every object as a column (array, list or assumptions.Categorical) for columns.groupBy.
+        Child classes should build it in bulk ie columns.planetTypeColumns(self.objectList)['type'] or from
+        columns.paramColumn, by default it calls _getSortKey on each object.
+        """
+
+        return [self._getSortKey(astroObject) for astroObject in self.objectList]
+
     def _processResults(self):
-        """ Checks each result can meet SNR requirments, adds to count
+        """ Counts the objects with each sort key in one pass with columns.groupBy
         :return:
         """
 
         resultsByClass = self._genEmptyResults()
 
-        for astroObject in self.objectList:
-            sortKey = self._getSortKey(astroObject)
-            resultsByClass[sortKey] += 1
+        counts = columns.groupBy([self._sortKeys()]).asDict()
+
+        for sortKey, count in counts.items():
+            if sortKey not in resultsByClass:
+                raise KeyError(sortKey)
+            resultsByClass[sortKey] += count
 
         return resultsByClass
 
@@ -288,16 +352,17 @@ class _BaseDataPerClass(_AstroObjectFigs):  # hangover from ETLOS's multiple chi
         self._yaxis_unit = self.unit
 
         if xlabel is None:
-            plt.xlabel(self._gen_label(self._planetProperty, self.unit))
+            ax.set_xlabel(self._gen_label(self._planetProperty, self.unit))
         else:
-            plt.xlabel(xlabel)
+            ax.set_xlabel(xlabel)
 
         if label_rotation:
-            plt.xticks(rotation=label_rotation)
-        plt.ylabel('Number of Planets')  # TODO could be stars, binaries etc
-        plt.title(title)
-        plt.xlim([min(ind)-gap, max(ind)+(gap*2)])
-        plt.draw()
+            for label in ax.get_xticklabels():
+                label.set_rotation(label_rotation)
+        ax.set_ylabel('Number of Planets')  # TODO could be stars, binaries etc
+        ax.set_title(title)
+        ax.set_xlim([min(ind)-gap, max(ind)+(gap*2)])
+        self._draw()
 
     def plotPieChart(self, title=None, cmap_name='Pastel2'):
         if sys.hexversion >= 0x02700000:
@@ -311,9 +376,9 @@ class _BaseDataPerClass(_AstroObjectFigs):  # hangover from ETLOS's multiple chi
         explode = np.zeros(len(fracs))  # non zero makes the slices come out of the pie
 
         # plot pie chart
-        cmap = plt.cm.get_cmap(cmap_name)
+        cmap = _getCmap(cmap_name)
         colors = cmap(np.linspace(0., 0.9, len(fracs)))
-        plt.pie(fracs, explode=explode, labels=labels, autopct='%1.1f%%', shadow=False, startangle=90,
+        self.ax.pie(fracs, explode=explode, labels=labels, autopct='%1.1f%%', shadow=False, startangle=90,
                 colors=colors)
 
         # generate plot / axis labels
@@ -327,12 +392,12 @@ class _BaseDataPerClass(_AstroObjectFigs):  # hangover from ETLOS's multiple chi
         if title is None:
             title = 'Planet {0} Bins'.format(self._gen_label(self._planetProperty, self.unit))  # NOTE not always planet
 
-        plt.title(title)
-        plt.xlim(-1.5, 1.5)
+        self.ax.set_title(title)
+        self.ax.set_xlim(-1.5, 1.5)
 
     def saveAllBarChart(self, filepath, *args, **kwargs):
         self.plotBarChart(*args, **kwargs)
-        plt.savefig(os.path.join(filepath))
+        self.fig.savefig(os.path.join(filepath))
 
     def _genEmptyResults(self):
         """ Uses allowed keys to generate a empty dict to start counting from
@@ -368,19 +433,26 @@ class DataPerParameterBin(_BaseDataPerClass):
         self._genKeysBins()  # Generate the bin keys/labels (must do before base class processes results)
         _BaseDataPerClass.__init__(self, results, unit, size)
 
+    def _processResults(self):
+        """ Bins every object at once with countPerParameterBin
+        """
+
+        return countPerParameterBin(self.objectList, [(self._planetProperty, self._binlimits, self.unit)])[
+            self._planetProperty]
+
     def _getSortKey(self, planet):
         """ Takes a planet and turns it into a key to be sorted by
         :param planet:
         :return:
         """
 
-        value = eval('planet.'+self._planetProperty)
+        value = columns.accessor(self._planetProperty)(planet)
 
         # TODO some sort of data validation, either before or using try except
 
         if self.unit is not None:
             try:
-                value = value.rescale(self.unit)
+                value = aq.rescale(value, self.unit)
             except AttributeError:  # either nan or unitless
                 pass
 
@@ -392,32 +464,38 @@ class DataPerParameterBin(_BaseDataPerClass):
     def _genKeysBins(self):
         """ Generates keys from bins, sets self._allowedKeys normally set in _classVariables
         """
-        binlimits = self._binlimits
+        self._allowedKeys = _binKeys(self._binlimits)
 
-        allowedKeys = []
-        midbinlimits = binlimits
 
-        if binlimits[0] == -float('inf'):
-            midbinlimits = binlimits[1:]  # remove the bottom limit
-            allowedKeys.append('<{0}'.format(midbinlimits[0]))
+def _binKeys(binlimits):
+    """ Generates the bin keys (labels) from the bin limits, including the 'Uncertain' key for nan values
+    """
 
-        if binlimits[-1] == float('inf'):
-            midbinlimits = midbinlimits[:-1]
+    allowedKeys = []
+    midbinlimits = binlimits
 
-        lastbin = midbinlimits[0]
+    if binlimits[0] == -float('inf'):
+        midbinlimits = binlimits[1:]  # remove the bottom limit
+        allowedKeys.append('<{0}'.format(midbinlimits[0]))
 
-        for binlimit in midbinlimits[1:]:
-            if lastbin == binlimit:
-                allowedKeys.append('{0}'.format(binlimit))
-            else:
-                allowedKeys.append('{0} to {1}'.format(lastbin, binlimit))
-            lastbin = binlimit
+    if binlimits[-1] == float('inf'):
+        midbinlimits = midbinlimits[:-1]
+
+    lastbin = midbinlimits[0]
+
+    for binlimit in midbinlimits[1:]:
+        if lastbin == binlimit:
+            allowedKeys.append('{0}'.format(binlimit))
+        else:
+            allowedKeys.append('{0} to {1}'.format(lastbin, binlimit))
+        lastbin = binlimit
 
-        if binlimits[-1] == float('inf'):
-            allowedKeys.append('{0}+'.format(binlimits[-2]))
+    if binlimits[-1] == float('inf'):
+        allowedKeys.append('{0}+'.format(binlimits[-2]))
 
-        allowedKeys.append('Uncertain')
-        self._allowedKeys = allowedKeys
+    allowedKeys.append('Uncertain')
+
+    return allowedKeys
 
 
 class GeneralPlotter(_AstroObjectFigs):
@@ -468,17 +546,62 @@ class GeneralPlotter(_AstroObjectFigs):
         _AstroObjectFigs._set_size_large(self)
         self.set_marker_size(60)
 
-    def plot(self):
-        xaxis = [float(x) for x in self._xaxis]
-        yaxis = [float(y) for y in self._yaxis]
+    # above this many objects plot() draws a density map rather than a marker per object
+    densityThreshold = 20000
+
+    def plot(self, mode='auto', bins=100, cmap_name='Blues'):
+        """ Plots the y axis against the x axis
+
+        :param mode: 'scatter' to draw a marker for each object, 'density' to draw the number of objects in each bin
+            of a 2D histogram or 'auto' to draw a density map when there are more than densityThreshold objects.
+            The density map takes the same time to draw however many objects there are
+        :param bins: number of bins along each axis of the density map, bins are log spaced on log axes
+        :param cmap_name: colormap of the density map
+        """
+        xaxis = np.asarray(self._xaxis, dtype=float)
+        yaxis = np.asarray(self._yaxis, dtype=float)
 
         assert(len(xaxis) == len(yaxis))
 
-        plt.scatter(xaxis, yaxis, marker=self.marker, facecolor=self._marker_color, edgecolor=self._edge_color,
-                    s=self._marker_size)
+        if mode == 'auto':
+            mode = 'density' if len(xaxis) > self.densityThreshold else 'scatter'
+
+        if mode == 'scatter':
+            self.ax.scatter(xaxis, yaxis, marker=self.marker, facecolor=self._marker_color, edgecolor=self._edge_color,
+                            s=self._marker_size)
+        elif mode == 'density':
+            self._plotDensity(xaxis, yaxis, bins, cmap_name)
+        else:
+            raise ValueError("mode must be 'auto', 'scatter' or 'density'")
+
+        self.ax.set_xlabel(self.xlabel)
+        self.ax.set_ylabel(self.ylabel)
+
+    def _plotDensity(self, xaxis, yaxis, bins, cmap_name):
 
-        plt.xlabel(self.xlabel)
-        plt.ylabel(self.ylabel)
+        xlog = self.ax.get_xscale() == 'log'
+        ylog = self.ax.get_yscale() == 'log'
+
+        # values that can't be placed on the axes (nan, or <= 0 on a log axis) aren't counted
+        valid = np.isfinite(xaxis) & np.isfinite(yaxis)
+        if xlog:
+            valid &= xaxis > 0
+        if ylog:
+            valid &= yaxis > 0
+        xaxis = xaxis[valid]
+        yaxis = yaxis[valid]
+
+        if not len(xaxis):
+            return
+
+        xedges = _binEdges(xaxis, bins, xlog)
+        yedges = _binEdges(yaxis, bins, ylog)
+        counts, xedges, yedges = np.histogram2d(xaxis, yaxis, (xedges, yedges))
+
+        counts = np.ma.masked_equal(counts.T, 0)  # empty bins are left blank
+        mesh = self.ax.pcolormesh(xedges, yedges, counts, cmap=_getCmap(cmap_name),
+                                  norm=matplotlib.colors.LogNorm(vmin=1, vmax=max(counts.max(), 1)))
+        self.fig.colorbar(mesh, ax=self.ax, label='Number of objects')
 
     def set_xaxis(self, param, unit=None, label=None):
         """ Sets the value of use on the x axis
@@ -524,24 +647,15 @@ class GeneralPlotter(_AstroObjectFigs):
             self.ylabel = label
 
     def _set_axis(self, param, unit):
-        """ this should take a variable or a function and turn it into a list by evaluating on each planet
+        """ this should take a variable or a function and turn it into an array by evaluating on each planet, the array
+        is a quantity if the values have units
         """
-        axisValues = []
-        for astroObject in self.objectList:
-            try:
-                value = eval('astroObject.{0}'.format(param))
-            except ac.HierarchyError:  # ie trying to call planet.star and one planet is a lone ranger
-                value = np.nan
+        values, valueUnit = columns.attributeColumn(self.objectList, param, unit)
 
-            if unit is None:  # no unit to rescale (a aq.unitless quanitity would otherwise fail with ValueError)
-                axisValues.append(value)
-            else:
-                try:
-                    axisValues.append(value.rescale(unit))
-                except AttributeError:  # either nan or unitless
-                    axisValues.append(value)
-
-        return axisValues
+        if valueUnit is None:
+            return values
+        else:
+            return values * valueUnit
 
     def set_marker_color(self, color='#3ea0e4', edgecolor='k'):
         """ set the marker color used in the plot
@@ -560,6 +674,16 @@ class GeneralPlotter(_AstroObjectFigs):
 
 class DiscoveryMethodByYear(object):
 
+    # output from seaborn.color_palette("Set1", n_colors=8)
+    colors = [(0.89411765336990356, 0.10196078568696976, 0.10980392247438431),
+              (0.21602460800432691, 0.49487120380588606, 0.71987698697576341),
+              (0.30426760128900115, 0.68329106055054012, 0.29293349969620797),
+              (0.60083047361934883, 0.30814303335021526, 0.63169552298153153),
+              (1.0, 0.50591311045721465, 0.0031372549487095253),
+              (0.99315647868549117, 0.9870049982678657, 0.19915417450315812),
+              (0.65845446095747107, 0.34122261685483596, 0.1707958535236471),
+              (0.95850826852461868, 0.50846600392285513, 0.74492888871361229)]
+
     def __init__(self, planet_list, methods_to_plot=('RV', 'transit', 'Other'), skip_solar_system_planets=True):
         """ Produces a labelled stacked bar chart of planet discovery methods
 
@@ -574,59 +698,62 @@ class DiscoveryMethodByYear(object):
         self.skip_solar_system_planets = skip_solar_system_planets
         self.methods_to_plot = methods_to_plot
 
+    def _columns(self):
+        """ the discovery year and method of every planet, and which to include
+        """
+
+        planets = self.planet_list
+        years = columns.valueColumn(planets, 'discoveryYear')
+        methods = columns.valueColumn(planets, 'discoveryMethod')
+
+        if self.skip_solar_system_planets:
+            include = np.array(['Solar System' not in planet.params['list'] for planet in planets], dtype=bool)
+        else:
+            include = np.ones(len(planets), dtype=bool)
+
+        return years, methods, include
+
     def setup_keys(self):
         """ Build the initial data dictionary to store the values
         """
 
-        discovery_methods = {}
-        discovery_years = {}
-        nan_list = []
+        years, methods, include = self._columns()
 
-        # Initial Loop to get keys
-        for planet in self.planet_list:
-            if 'Solar System' in planet.params['list'] and self.skip_solar_system_planets:
-                continue
-            try:
-                discovery_methods[planet.discoveryMethod] += 1
-            except KeyError:
-                discovery_methods[planet.discoveryMethod] = 1
+        self.nan_list = [planet for planet, method, included in zip(self.planet_list, methods, include)
+                         if included and method is np.nan]
 
-            try:
-                discovery_years[planet.discoveryYear] += 1
-            except KeyError:
-                discovery_years[planet.discoveryYear] = 1
+        return self._yearCounts(years, include)
 
-            if planet.discoveryMethod is np.nan:
-                nan_list.append(planet)
+    def _yearCounts(self, years, include):
+        """ number of planets discovered each year, including nan for planets without a year
+        """
 
-        self.nan_list = nan_list
+        discovery_years = {}
+        for year, count in columns.groupBy([years], mask=include).asDict().items():
+            discovery_years[np.nan if year != year else int(year)] = count
 
         return discovery_years
 
     def generate_data(self):
 
-        discovery_years = self.setup_keys()
+        years, methods, include = self._columns()
+        discovery_years = self._yearCounts(years, include)
 
         _year_list = np.array([year for year in discovery_years.keys() if year is not np.nan])
         year_list = range(_year_list.min(), _year_list.max()+1)  # +1 needed as its < not <=
 
-        discovery_methods = {k:0 for k in self.methods_to_plot}
-        plot_matrix = {k:discovery_methods.copy() for k in year_list}
+        # every method not being plotted is grouped as 'Other', which is only counted if it is plotted
+        methodGroups = np.array([method if method in self.methods_to_plot else 'Other' for method in methods],
+                                dtype=object)
+        table = columns.groupBy([years, methodGroups], mask=include)
 
-        # TODO (ryan) the same sort of  loop as setup_keys again? really?
-        for planet in self.planet_list:
-            if 'Solar System' in planet.params['list'] and self.skip_solar_system_planets:
+        plot_matrix = {year: {method: 0 for method in self.methods_to_plot} for year in year_list}
+        for i, year in enumerate(table.keys[0]):
+            if year != year:  # nan year
                 continue
-
-            if planet.discoveryMethod in self.methods_to_plot:
-                discovery_method = planet.discoveryMethod
-            else:
-                discovery_method = 'Other'
-
-            try:
-                plot_matrix[planet.discoveryYear][discovery_method] += 1
-            except KeyError:  # nan year
-                pass
+            for j, method in enumerate(table.keys[1]):
+                if method in self.methods_to_plot:
+                    plot_matrix[int(year)][method] += int(table.values[i, j])
 
         return plot_matrix, year_list, discovery_years
 
@@ -643,34 +770,26 @@ class DiscoveryMethodByYear(object):
 
         plot_matrix, year_list, discovery_years = self.generate_data()
 
-        fig = plt.figure()
+        fig = _newFigure()
         ax = fig.add_subplot(1, 1, 1)
 
         ind = np.arange(len(year_list))
-
-        # output from seaborn.color_palette("Set1", n_colors=8)
-        colors = [(0.89411765336990356, 0.10196078568696976, 0.10980392247438431),
-                  (0.21602460800432691, 0.49487120380588606, 0.71987698697576341),
-                  (0.30426760128900115, 0.68329106055054012, 0.29293349969620797),
-                  (0.60083047361934883, 0.30814303335021526, 0.63169552298153153),
-                  (1.0, 0.50591311045721465, 0.0031372549487095253),
-                  (0.99315647868549117, 0.9870049982678657, 0.19915417450315812),
-                  (0.65845446095747107, 0.34122261685483596, 0.1707958535236471),
-                  (0.95850826852461868, 0.50846600392285513, 0.74492888871361229)]
+        colors = self.colors
 
         width = 0.9
         bottom = np.zeros_like(year_list)
         for i, method in enumerate(self.methods_to_plot):
             bar_data = [plot_matrix[year][method] for year in year_list]
-            plt.bar(ind, bar_data, width, color=colors[i], bottom=bottom, label=method_labels[i], linewidth=0)
+            ax.bar(ind, bar_data, width, color=colors[i], bottom=bottom, label=method_labels[i], linewidth=0)
 
             bottom += np.array(bar_data) # plot the next bar stacked
 
-        plt.ylabel('Number of planets', fontsize=14)
-        plt.xlabel('Year', fontsize=14)
-        plt.xticks(ind+width/2., year_list, rotation=70, fontsize=13)
-        plt.xlim(0, ind[-1]+1)
-        plt.legend(loc=2, fontsize=13)
+        ax.set_ylabel('Number of planets', fontsize=14)
+        ax.set_xlabel('Year', fontsize=14)
+        ax.set_xticks(ind+width/2.)
+        ax.set_xticklabels(year_list, rotation=70, fontsize=13)
+        ax.set_xlim(0, ind[-1]+1)
+        ax.legend(loc=2, fontsize=13)
 
         if exodata_credit is True:
             ax.text(2, 420, 'Generated by ExoData on {}'.format(time.strftime("%d/%m/%Y")), fontsize=11)
@@ -685,10 +804,137 @@ class DiscoveryMethodByYear(object):
 
             ax.text(x_pos, y_pos, '{}'.format(total_planets), fontsize=9)
 
-        plt.grid(b=True, which='both', color='0.9', linestyle='-')
+        ax.grid(True, which='both', color='0.9', linestyle='-')
 
         return fig
 
+    def cumulative_counts(self):
+        """ The number of planets discovered with each method each year and the running totals
+
+        :return: (year_list, counts, cumulative, year_totals) where counts and cumulative are arrays of shape
+            (len(methods_to_plot), len(year_list)) and year_totals is the number of planets discovered each year by any
+            method
+        """
+
+        plot_matrix, year_list, discovery_years = self.generate_data()
+
+        counts = np.array([[plot_matrix[year][method] for year in year_list] for method in self.methods_to_plot],
+                          dtype=int).reshape(len(self.methods_to_plot), len(year_list))
+        cumulative = np.cumsum(counts, axis=1)
+        year_totals = np.array([discovery_years.get(year, 0) for year in year_list], dtype=int)
+
+        return year_list, counts, cumulative, year_totals
+
+    def animate(self, filename=None, frame_directory=None, method_labels=None, fps=2, dpi=None):
+        """ Animates the discovery history with one frame per year, each frame adds that years bars and the legend
+        gives the number of planets discovered with each method up to that year. The figure is drawn once and only the
+        bar heights and labels are changed for each frame so the time per frame doesn't depend on the number of
+        planets. Frames are rendered headless (see headless()).
+
+        :param filename: movie file to write ie 'discovery.gif' or 'discovery.mp4' (mp4 needs ffmpeg)
+        :param frame_directory: directory to write each frame to as frame_0000.png etc
+        :param method_labels: list of legend labels for the methods, as plot()
+        :param fps: frames per second of the movie
+        :param dpi: resolution of the frames, None for the matplotlib default
+
+        :return: list of frame files written (empty if frame_directory is None)
+        """
+
+        if filename is None and frame_directory is None:
+            raise ValueError('give a filename and/or frame_directory to write the animation to')
+
+        if method_labels is None:
+            method_labels = self.methods_to_plot
+
+        year_list, counts, cumulative, year_totals = self.cumulative_counts()
+        bottoms = np.cumsum(counts, axis=0) - counts  # each method is stacked on the ones before
+        tops = counts.sum(axis=0)
+        ymax = max(tops.max(), 1) * 1.1 + 1
+
+        with headless():
+            fig = _newFigure()
+            if dpi is not None:
+                fig.set_dpi(dpi)
+            ax = fig.add_subplot(1, 1, 1)
+
+            ind = np.arange(len(year_list))
+            width = 0.9
+
+            bars = [ax.bar(ind, np.zeros(len(year_list)), width, color=self.colors[i], label=method_labels[i],
+                           linewidth=0) for i in range(len(self.methods_to_plot))]
+            totals = [ax.text(i, top + ymax * 0.01, '{}'.format(total), fontsize=9, visible=False)
+                      for i, (top, total) in enumerate(zip(tops, year_totals))]
+
+            ax.set_ylabel('Number of planets', fontsize=14)
+            ax.set_xlabel('Year', fontsize=14)
+            ax.set_xticks(ind+width/2.)
+            ax.set_xticklabels(year_list, rotation=70, fontsize=13)
+            ax.set_xlim(0, ind[-1]+1)
+            ax.set_ylim(0, ymax)  # fixed so the frames line up
+            legend_texts = ax.legend(loc=2, fontsize=13).get_texts()
+            ax.grid(True, which='both', color='0.9', linestyle='-')
+
+            # the layout is worked out once for the final frame rather than for every frame
+            for text, label, total in zip(legend_texts, method_labels, cumulative[:, -1]):
+                text.set_text('{0} ({1})'.format(label, total))
+            ax.set_title('Discoveries to {0}'.format(year_list[-1]))
+            fig.tight_layout()
+            fig.set_tight_layout(False)
+
+            def draw_frame(frame):
+                year_index = frame  # the bar for year_index is added in this frame
+                for method_bars, method_counts, method_bottoms in zip(bars, counts, bottoms):
+                    method_bars[year_index].set_height(method_counts[year_index])
+                    method_bars[year_index].set_y(method_bottoms[year_index])
+                totals[year_index].set_visible(year_totals[year_index] > 0)
+
+                for text, label, total in zip(legend_texts, method_labels, cumulative[:, year_index]):
+                    text.set_text('{0} ({1})'.format(label, total))
+                ax.set_title('Discoveries to {0}'.format(year_list[year_index]))
+
+            frames = []
+            if frame_directory is not None and not os.path.isdir(frame_directory):
+                os.makedirs(frame_directory)
+
+            def write_frame(frame):
+                # a single draw of the canvas, savefig would draw the figure twice
+                frames.append(os.path.join(frame_directory, 'frame_{0:04d}.png'.format(frame)))
+                fig.canvas.draw()
+                matplotlib.image.imsave(frames[-1], np.asarray(fig.canvas.buffer_rgba()))
+
+            if filename is None:
+                for frame in range(len(year_list)):
+                    draw_frame(frame)
+                    write_frame(frame)
+            else:
+                from matplotlib import animation
+
+                def update(frame):
+                    draw_frame(frame)
+                    if frame_directory is not None:
+                        write_frame(frame)
+
+                writer = 'pillow' if filename.lower().endswith('.gif') else None
+                anim = animation.FuncAnimation(fig, update, frames=len(year_list), init_func=lambda: None,
+                                               repeat=False)
+                anim.save(filename, writer=writer, fps=fps, dpi=dpi)
+
+        return frames
+
+
+def _binEdges(values, bins, log=False):
+    """ bins + 1 evenly spaced (or log spaced) bin edges covering values
+    """
+
+    if log:
+        return 10 ** _binEdges(np.log10(values), bins)
+
+    low, high = values.min(), values.max()
+    if low == high:  # a single value would give zero width bins
+        low, high = low - 0.5, high + 0.5
+
+    return np.linspace(low, high, bins + 1)
+
 
 def _sortValueIntoGroup(groupKeys, groupLimits, value):
     """ returns the Key of the group a value belongs to
@@ -728,6 +974,77 @@ def _sortValueIntoGroup(groupKeys, groupLimits, value):
     return groupKeys[keyIndex-1]
 
 
+def _propertyValues(objectList, properties):
+    """ evaluates each (property, unit) on every object, returning a float array per property with the values rescaled
+    to unit (if it isn't None). See columns.attributeColumn
+    """
+
+    return [columns.attributeColumn(objectList, prop, unit)[0] for prop, unit in properties]
+
+
+def _sortValuesIntoGroups(groupLimits, values):
+    """ vectorised version of _sortValueIntoGroup, returns the index of the group each value belongs to (-1 for nan
+    values which go in the 'Uncertain' group). Raises BelowLimitsError / AboveLimitsError for the first value outside
+    the limits like _sortValueIntoGroup.
+    """
+
+    limits = np.asarray(groupLimits, dtype=float)
+    values = np.asarray(values, dtype=float)
+
+    # _sortValueIntoGroup takes the first limit the value is < than, the equal to max and min cases are set after
+    keyIndex = np.searchsorted(limits, values, side='right')
+    keyIndex[values == limits[-1]] = len(limits) - 1
+    keyIndex[values == limits[0]] = 1
+
+    isNan = np.isnan(values)
+    outside = ~isNan & ((keyIndex == 0) | (keyIndex == len(limits)))
+    if outside.any():
+        first = np.argmax(outside)
+        if keyIndex[first] == 0:
+            raise BelowLimitsError('Value {0} below limit {1}'.format(values[first], groupLimits[0]))
+        else:
+            raise AboveLimitsError('Value {0} above limit {1}'.format(values[first], groupLimits[-1]))
+
+    keyIndex[isNan] = 0
+
+    return keyIndex - 1
+
+
+def countPerParameterBin(objectList, binSpecs):
+    """ Counts the objects in each bin of several properties at once. Each property is evaluated once per object and
+    binned as an array, the counts are the same as DataPerParameterBin(objectList, property, binLimits, unit)
+    .resultsByClass
+
+        >>> countPerParameterBin(exocat.planets, [('R', (0, 5, 15, float('inf')), aq.R_e), ('e', (0, 0.5, 1), None)])
+
+    :param objectList: list of planets or stars etc
+    :param binSpecs: list of (property, binLimits, unit) with the same format as DataPerParameterBin
+    :return: OrderedDict of property -> OrderedDict of bin key -> count
+    """
+
+    values = _propertyValues(objectList, [(prop, unit) for prop, binLimits, unit in binSpecs])
+
+    results = OrderedDict()
+    for (prop, binLimits, unit), propValues in zip(binSpecs, values):
+        keys = _binKeys(binLimits)
+        groupKeys = keys[:-1]
+
+        if not len(groupKeys) == len(binLimits)-1:
+            raise ValueError('len(groupKeys) must equal len(grouplimits)-1 got \nkeys:{0} \nlimits:{1}'.format(
+                groupKeys, binLimits))
+
+        counts = np.bincount(_sortValuesIntoGroups(binLimits, propValues) + 1, minlength=len(groupKeys) + 1)
+
+        resultsByClass = OrderedDict((key, 0) for key in keys)
+        resultsByClass['Uncertain'] = int(counts[0])
+        for key, count in zip(groupKeys, counts[1:]):
+            resultsByClass[key] += int(count)
+
+        results[prop] = resultsByClass
+
+    return results
+
+
 class OutOfLimitsError(Exception):
     pass
 
@@ -0,0 +1,309 @@
+""" Renders batches of figures from exodata.plots to files in parallel, ie for reports.
+
+    >>> specs = [FigureSpec('radius_mass.png', 'GeneralPlotter', ('R', 'M'), dict(yaxislog=True)),
+    ...          FigureSpec('radius_bins.png', 'DataPerParameterBin', ('R', (0, 0.5, 1, 2, float('inf'))),
+    ...                     method='plotBarChart'),
+    ...          FigureSpec('discovery.pdf', 'DiscoveryMethodByYear')]
+    >>> results = renderFigures(specs, 'figures', exocat.planets)
+    >>> print(timingReport(results))
+
+Each figure is rendered in a worker process with the Agg canvas (see plots.headless) so nothing goes through the
+pyplot state machine and figures are freed once saved. The objects are sent to each worker once rather than with every
+figure.
+
+FigureCache keeps the rendered images of figures in memory for when the same figures are asked for repeatedly.
+"""
+import os
+import io
+import threading
+import multiprocessing
+from collections import namedtuple, OrderedDict
+from timeit import default_timer
+
+import numpy as np
+import quantities as pq
+from matplotlib.figure import Figure
+
+from . import plots
+from . import params as ed_params
+from . import assumptions as assum
+from . import astroclasses as ac
+from . import astroquantities as aq
+
+
+class FigureSpec(namedtuple('FigureSpec', ('filename', 'plotter', 'args', 'kwargs', 'method', 'methodKwargs',
+                                           'objects'))):
+    """ A figure to render
+
+    :param filename: file to save the figure to, relative to the output directory. The format is from the extension
+    :param plotter: plot class from exodata.plots or its name ie 'GeneralPlotter'
+    :param args: arguments to the plot class after the object list ie ('R', 'M') for GeneralPlotter
+    :param kwargs: keyword arguments to the plot class
+    :param method: the method that draws the figure ie 'plot' or 'plotPieChart'
+    :param methodKwargs: keyword arguments to method
+    :param objects: key of the object list to use in the objects given to renderFigures
+    """
+
+    __slots__ = ()
+
+    def __new__(cls, filename, plotter, args=(), kwargs=None, method='plot', methodKwargs=None, objects='planets'):
+        return super(FigureSpec, cls).__new__(cls, filename, plotter, tuple(args), kwargs or {}, method,
+                                              methodKwargs or {}, objects)
+
+
+# path is None and error is set to 'ExceptionType: message' if the figure couldn't be rendered
+RenderResult = namedtuple('RenderResult', ('filename', 'path', 'seconds', 'error'))
+
+
+# objects, output directory and savefig keyword arguments of the worker, set by _initWorker
+_worker = {}
+
+
+def _initWorker(objects, directory, savefigKwargs):
+    _worker.update(objects=objects, directory=directory, savefigKwargs=savefigKwargs)
+
+
+def _plotterClass(plotter):
+    if isinstance(plotter, str):
+        return getattr(plots, plotter)
+    else:
+        return plotter
+
+
+def _drawSpec(spec, objects):
+    """ draws the figure of spec with objects (the object list) and returns it, must be called inside plots.headless()
+    """
+
+    plotter = _plotterClass(spec.plotter)(objects, *spec.args, **spec.kwargs)
+    fig = getattr(plotter, spec.method)(**spec.methodKwargs)
+    if not isinstance(fig, Figure):  # most plot methods draw on plotter.fig and return None
+        fig = plotter.fig
+
+    return fig
+
+
+def _renderSpec(spec):
+    """ renders and saves a single figure using the worker state
+    """
+
+    start = default_timer()
+
+    try:
+        with plots.headless():
+            fig = _drawSpec(spec, _worker['objects'][spec.objects])
+            path = os.path.join(_worker['directory'], spec.filename)
+            fig.savefig(path, **_worker['savefigKwargs'])
+        error = None
+    except Exception as e:
+        path = None
+        error = '{0}: {1}'.format(type(e).__name__, e)
+
+    return RenderResult(spec.filename, path, default_timer() - start, error)
+
+
+def renderFigures(specs, directory, objects, processes=None, savefigKwargs=None):
+    """ Renders each figure in specs and saves it to directory. A figure that can't be rendered doesn't stop the rest,
+    its error is given in the results instead.
+
+    :param specs: list of FigureSpec
+    :param directory: directory to save the figures to, created if it doesn't exist
+    :param objects: dict of object lists referred to by FigureSpec.objects ie {'planets': ..., 'stars': ...}, a list
+        is used as {'planets': objects}
+    :param processes: number of worker processes, None for one per cpu. With 1 the figures are rendered in this process
+    :param savefigKwargs: keyword arguments to Figure.savefig used for every figure ie {'dpi': 150}
+
+    :return: a RenderResult for each spec, in the same order
+    """
+
+    if not isinstance(objects, dict):
+        objects = {'planets': objects}
+
+    if not os.path.isdir(directory):
+        os.makedirs(directory)
+
+    initargs = (objects, directory, savefigKwargs or {})
+
+    if processes is None:
+        processes = multiprocessing.cpu_count()
+    processes = min(processes, len(specs))
+
+    if processes <= 1:
+        _initWorker(*initargs)
+        try:
+            return [_renderSpec(spec) for spec in specs]
+        finally:
+            _worker.clear()
+
+    pool = multiprocessing.Pool(processes, initializer=_initWorker, initargs=initargs)
+    try:
+        return pool.map(_renderSpec, specs, chunksize=1)
+    finally:
+        pool.close()
+        pool.join()
+
+
+def timingReport(results):
+    """ Formats the results of renderFigures as a table of render times, slowest first
+    """
+
+    lines = []
+    for result in sorted(results, key=lambda result: result.seconds, reverse=True):
+        status = 'ok' if result.error is None else 'FAILED {0}'.format(result.error)
+        lines.append('{0:>9.3f}s  {1}  {2}'.format(result.seconds, result.filename, status))
+
+    failed = sum(result.error is not None for result in results)
+    lines.append('{0:>9.3f}s  total for {1} figures, {2} failed'.format(sum(result.seconds for result in results),
+                                                                        len(results), failed))
+
+    return '\n'.join(lines)
+
+
+def _freeze(value):
+    """ a hashable version of a plot argument, dicts and lists become tuples and units and quantities are compared by
+    their dimensionality and magnitude
+    """
+
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    elif isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    elif isinstance(value, pq.Quantity):
+        return (aq._unitKey(value), tuple(np.asarray(value.magnitude).ravel().tolist()))
+    elif isinstance(value, np.ndarray):
+        return tuple(value.ravel().tolist())
+    else:
+        return value
+
+
+class _InFlight(object):
+    """ a figure being rendered by FigureCache.get, other threads wait for done and take image (None if it failed)
+    """
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.image = None
+
+
+class FigureCache(object):
+    """ Caches the rendered image of figures so the same figure of the same catalogue is only rendered once, ie for a
+    dashboard
+
+        >>> cache = FigureCache(maxBytes=32 * 2**20)
+        >>> png = cache.get(FigureSpec('radius_mass.png', 'GeneralPlotter', ('R', 'M')), exocat)
+
+    Figures are keyed by the catalogue fingerprint (a hash of the catalogue xml), the spec (plot class, axes, units,
+    style options and image format) and the estimation mode and assumptions in use. Loading a changed catalogue gives
+    a new fingerprint so its figures are rendered again and the old ones are evicted as the least recently used.
+    Changing a loaded catalogue in place (ie a parameter or adding a planet) also renders the figures again, as does a
+    change to any other astro object.
+
+    Figures are rendered outside the lock so threads can get cached figures (and render different ones) while a
+    figure is rendered. A thread asking for a figure that another thread is rendering waits for it rather than
+    rendering it again.
+    """
+
+    def __init__(self, maxBytes=64 * 2**20, maxFigures=None):
+        """
+        :param maxBytes: total size of the images to keep, the least recently used are evicted past this
+        :param maxFigures: number of images to keep, None for no limit
+        """
+
+        self.maxBytes = maxBytes
+        self.maxFigures = maxFigures
+
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.waits = 0  # asked for a figure while another thread was rendering it
+
+        self._figures = OrderedDict()  # key -> image bytes, least recently used first
+        self._rendering = {}  # key -> _InFlight of the figures being rendered
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._figures)
+
+    def _key(self, spec, catalogue, savefigKwargs):
+
+        format = os.path.splitext(spec.filename)[1]
+        spec = spec._replace(filename=format, plotter=_plotterClass(spec.plotter).__name__)
+        estimating = ed_params.estimating(getattr(catalogue, 'estimateMissingValues', None))
+
+        return (catalogue.fingerprint, ac._changeGeneration, _freeze(tuple(spec)), _freeze(savefigKwargs), estimating,
+                assum.assumptionsFingerprint())
+
+    def get(self, spec, catalogue, savefigKwargs=None):
+        """ Returns the image of the figure as bytes, rendering it if it isn't cached
+
+        :param spec: FigureSpec of the figure, the format is from the filename extension. spec.objects is the name of
+            the catalogue attribute to plot ie 'planets' or 'transitingPlanets'
+        :param catalogue: OECDatabase (or object with a fingerprint attribute and the object lists)
+        :param savefigKwargs: keyword arguments to Figure.savefig ie {'dpi': 150}
+        """
+
+        savefigKwargs = savefigKwargs or {}
+        key = self._key(spec, catalogue, savefigKwargs)
+
+        with self._lock:
+            try:
+                image = self._figures.pop(key)
+            except KeyError:
+                pass
+            else:
+                self.hits += 1
+                self._figures[key] = image  # most recently used
+                return image
+
+            inFlight = self._rendering.get(key)
+            if inFlight is None:
+                self.misses += 1
+                inFlight = self._rendering[key] = _InFlight()
+                rendering = True
+            else:
+                self.waits += 1
+                rendering = False
+
+        if not rendering:
+            inFlight.done.wait()
+            if inFlight.image is not None:
+                return inFlight.image
+            return self.get(spec, catalogue, savefigKwargs)  # the render failed, try it here to raise its error
+
+        try:
+            inFlight.image = self._render(spec, catalogue, savefigKwargs)
+            with self._lock:
+                self._add(key, inFlight.image)
+        finally:
+            with self._lock:
+                del self._rendering[key]
+            inFlight.done.set()
+
+        return inFlight.image
+
+    def _render(self, spec, catalogue, savefigKwargs):
+
+        format = os.path.splitext(spec.filename)[1][1:] or None
+        buffer = io.BytesIO()
+
+        with plots.headless():
+            fig = _drawSpec(spec, getattr(catalogue, spec.objects))
+            fig.savefig(buffer, format=format, **savefigKwargs)
+
+        return buffer.getvalue()
+
+    def _add(self, key, image):
+
+        if len(image) > self.maxBytes:
+            return
+
+        self._figures[key] = image
+        self.nbytes += len(image)
+
+        while self.nbytes > self.maxBytes or (self.maxFigures is not None and len(self._figures) > self.maxFigures):
+            oldKey, oldImage = self._figures.popitem(last=False)
+            self.nbytes -= len(oldImage)
+
+    def clear(self):
+        with self._lock:
+            self._figures.clear()
+            self.nbytes = 0
@@ -0,0 +1,256 @@
+""" Generates synthetic catalogues in the Open Exoplanet Catalogue format for testing and benchmarking at scale.
+
+The systems are random but physically plausible (stellar radius, temperature and magnitudes follow the mass, planet
+semi-major axes follow Keplers third law etc) and the same seed always gives the same catalogue.
+
+    >>> from exodata import synthetic
+    >>> systems = synthetic.generateSystems(50000, binaryFraction=0.2, missingRate=0.3, seed=1)
+    >>> synthetic.writeSystemsFolder('synthetic/systems', systems)
+    >>> synthetic.writeSystemsStream('synthetic/systems.xml.gz', systems)
+    >>> exocat = exodata.OECDatabase('synthetic/systems/')
+
+The folder is loaded like a clone of the catalogue and the stream like the gzipped catalogue load_db_from_url uses.
+"""
+import os
+import gzip
+import xml.etree.ElementTree as ET
+
+import numpy as np
+
+_planetLetters = 'bcdefghijklmnopqrstuvwxyz'
+
+# lower temperature limit of each spectral class
+_spectralClasses = ((30000, 'O'), (10000, 'B'), (7500, 'A'), (6000, 'F'), (5200, 'G'), (3700, 'K'), (0, 'M'))
+
+# (method, relative rate) of discovery methods for short (< 30 day) and long period planets
+_shortPeriodMethods = (('transit', 0.8), ('RV', 0.18), ('timing', 0.02))
+_longPeriodMethods = (('RV', 0.75), ('transit', 0.1), ('imaging', 0.07), ('microlensing', 0.06), ('timing', 0.02))
+
+# fields that are never left out as a missing value
+_alwaysPresent = ('name', 'list', 'discoverymethod', 'discoveryyear', 'istransiting', 'rightascension', 'declination')
+
+
+def _spectralType(temperature, rng):
+
+    for limit, spectralClass in _spectralClasses:
+        if temperature >= limit:
+            return '{0}{1}V'.format(spectralClass, rng.randint(10))
+
+
+def _choose(options, rng):
+    methods, rates = zip(*options)
+    return methods[rng.choice(len(methods), p=np.array(rates) / sum(rates))]
+
+
+class _ElementWriter(object):
+    """ adds child elements to an element, leaving out values at the missing value rate
+    """
+
+    def __init__(self, rng, missingRate):
+        self.rng = rng
+        self.missingRate = missingRate
+
+    def add(self, parent, tag, value, fmt='{0}', attrib=None):
+        if tag not in _alwaysPresent and self.missingRate and self.rng.rand() < self.missingRate:
+            return
+        element = ET.SubElement(parent, tag, attrib or {})
+        element.text = fmt.format(value)
+
+
+def _addCoordinates(writer, system, rng):
+
+    ra = rng.uniform(0, 24)
+    dec = np.degrees(np.arcsin(rng.uniform(-1, 1)))  # uniform on the sky
+
+    raMinutes, raSeconds = divmod(ra * 3600., 60)
+    raHours, raMinutes = divmod(raMinutes, 60)
+    decMinutes, decSeconds = divmod(abs(dec) * 3600., 60)
+    decDegrees, decMinutes = divmod(decMinutes, 60)
+
+    writer.add(system, 'rightascension', '{0:02.0f} {1:02.0f} {2:05.2f}'.format(raHours, raMinutes, raSeconds))
+    writer.add(system, 'declination', '{0}{1:02.0f} {2:02.0f} {3:04.1f}'.format('-' if dec < 0 else '+', decDegrees,
+                                                                                  decMinutes, decSeconds))
+
+
+def _addStar(writer, parent, name, altnames, distance, rng):
+    """ adds a main sequence star, returns its mass (M_s), radius (R_s) and temperature (K)
+    """
+
+    mass = float(np.clip(rng.lognormal(np.log(0.9), 0.4), 0.1, 3.))
+    radius = mass ** (0.8 if mass < 1 else 0.57) * rng.uniform(0.9, 1.1)
+    temperature = float(np.clip(5772 * mass ** 0.505 * rng.uniform(0.95, 1.05), 2500, 12000))
+
+    luminosity = radius ** 2 * (temperature / 5772.) ** 4
+    magV = 4.83 - 2.5 * np.log10(luminosity) + 5 * np.log10(distance / 10.)
+    colour = 5772. / temperature  # redder stars are brighter in the infrared
+
+    star = ET.SubElement(parent, 'star')
+    writer.add(star, 'name', name)
+    for altname in altnames:
+        writer.add(star, 'name', altname)
+    writer.add(star, 'mass', mass, '{0:.3f}')
+    writer.add(star, 'radius', radius, '{0:.3f}')
+    writer.add(star, 'temperature', temperature, '{0:.0f}')
+    writer.add(star, 'metallicity', rng.normal(0, 0.2), '{0:.2f}')
+    writer.add(star, 'age', rng.uniform(0.1, 12), '{0:.2f}')
+    writer.add(star, 'spectraltype', _spectralType(temperature, rng))
+    writer.add(star, 'magB', magV + 0.65 * colour, '{0:.2f}')
+    writer.add(star, 'magV', magV, '{0:.2f}')
+    writer.add(star, 'magJ', magV - 1.1 * colour, '{0:.2f}')
+    writer.add(star, 'magH', magV - 1.4 * colour, '{0:.2f}')
+    writer.add(star, 'magK', magV - 1.5 * colour, '{0:.2f}')
+
+    return star, mass, radius, temperature
+
+
+def _addPlanets(writer, parent, name, altnames, number, hostMass, hostRadius, hostTemperature, rng):
+
+    periods = np.sort(10 ** rng.uniform(np.log10(0.5), np.log10(5000), number))  # days
+
+    for letter, period in zip(_planetLetters, periods):
+        sma = (hostMass * (period / 365.25) ** 2) ** (1 / 3.)  # AU
+
+        massE = 10 ** rng.uniform(0, 3.6)  # earth masses
+        if massE < 100:
+            radius = massE ** 0.55 / 11.2 * rng.uniform(0.85, 1.15)
+        else:  # gas giants are all around a jupiter radius
+            radius = rng.uniform(0.8, 1.3) if period > 10 else rng.uniform(1., 1.8)  # hot jupiters are inflated
+
+        method = _choose(_shortPeriodMethods if period < 30 else _longPeriodMethods, rng)
+        transiting = method == 'transit'
+        temperature = hostTemperature * np.sqrt(hostRadius * 0.00465 / (2 * sma)) * 0.7 ** 0.25
+
+        planet = ET.SubElement(parent, 'planet')
+        writer.add(planet, 'name', '{0} {1}'.format(name, letter))
+        for altname in altnames:
+            writer.add(planet, 'name', '{0} {1}'.format(altname, letter))
+        writer.add(planet, 'list', 'Confirmed planets')
+        writer.add(planet, 'mass', massE / 317.83, '{0:.5f}')
+        writer.add(planet, 'radius', radius, '{0:.4f}')
+        writer.add(planet, 'period', period, '{0:.5f}')
+        writer.add(planet, 'semimajoraxis', sma, '{0:.5f}')
+        writer.add(planet, 'eccentricity', min(abs(rng.normal(0, 0.05 if period < 10 else 0.2)), 0.95), '{0:.3f}')
+        if transiting or rng.rand() < 0.3:
+            writer.add(planet, 'inclination', rng.uniform(85, 90) if transiting else rng.uniform(10, 90), '{0:.2f}')
+        writer.add(planet, 'temperature', temperature, '{0:.0f}')
+        writer.add(planet, 'discoverymethod', method)
+        writer.add(planet, 'istransiting', '1' if transiting else '0')
+        writer.add(planet, 'discoveryyear', rng.randint(1999 if transiting else 1995, 2017))
+        writer.add(planet, 'lastupdate', '16/{0:02d}/{1:02d}'.format(rng.randint(1, 13), rng.randint(1, 29)))
+
+
+def _pickSystems(fraction, systems, rng):
+    """ a boolean array choosing round(fraction * systems) of the systems at random
+    """
+
+    chosen = np.zeros(systems, dtype=bool)
+    chosen[rng.permutation(systems)[:int(round(fraction * systems))]] = True
+
+    return chosen
+
+
+def generateSystems(systems=1000, binaryFraction=0.1, multiPlanetFraction=0.3, maxPlanets=6, circumbinaryFraction=0.1,
+                    missingRate=0.1, altnameRate=0.5, coordinates=True, seed=0, namePrefix='Synth'):
+    """ Generates systems in the Open Exoplanet Catalogue format
+
+    :param systems: number of systems
+    :param binaryFraction: fraction of the systems that are a binary star, the rest have a single star
+    :param multiPlanetFraction: fraction of the systems with 2 to maxPlanets planets, the rest have 1
+    :param maxPlanets: most planets in a system
+    :param circumbinaryFraction: fraction of the binary systems whose planets orbit the binary rather than a star
+    :param missingRate: probability each value (other than names, the discovery method and year and coordinates) is
+        left out of the catalogue
+    :param altnameRate: fraction of the stars with alternate names, their planets have the same alternate names with
+        the planet letter
+    :param coordinates: whether systems have a right ascension and declination
+    :param seed: the seed of the random values, the same seed and options always gives the same systems
+    :param namePrefix: systems are named '{namePrefix} {number}'
+
+    :return: list of system xml elements (xml.etree.ElementTree.Element)
+    """
+
+    rng = np.random.RandomState(seed)
+    writer = _ElementWriter(rng, missingRate)
+
+    isBinary = _pickSystems(binaryFraction, systems, rng)
+    isMultiPlanet = _pickSystems(multiPlanetFraction, systems, rng)
+    hasAltnames = _pickSystems(altnameRate, systems, rng)
+
+    systemElements = []
+    for i in range(systems):
+        name = '{0} {1}'.format(namePrefix, i + 1)
+        altnames = ['HD {0}'.format(100000 + i), 'HIP {0}'.format(200000 + i)][:rng.randint(1, 3)] \
+            if hasAltnames[i] else []
+        planets = rng.randint(2, maxPlanets + 1) if isMultiPlanet[i] and maxPlanets > 1 else 1
+        distance = 1.3 + 800 * rng.uniform() ** (1 / 3.)  # uniform in volume, pc
+
+        system = ET.Element('system')
+        writer.add(system, 'name', name)
+        if coordinates:
+            _addCoordinates(writer, system, rng)
+        writer.add(system, 'distance', distance, '{0:.2f}')
+
+        if isBinary[i]:
+            binary = ET.SubElement(system, 'binary')
+            writer.add(binary, 'name', name + ' AB')
+            writer.add(binary, 'separation', 10 ** rng.uniform(0, 3), '{0:.2f}', {'unit': 'AU'})
+
+            stars = [_addStar(writer, binary, '{0} {1}'.format(name, letter),
+                              ['{0} {1}'.format(altname, letter) for altname in altnames], distance, rng)
+                     for letter in 'AB']
+
+            if rng.rand() < circumbinaryFraction:
+                totalMass = stars[0][1] + stars[1][1]
+                _addPlanets(writer, binary, name + ' AB', [altname + ' AB' for altname in altnames], planets,
+                            totalMass, stars[0][2], stars[0][3], rng)
+            else:
+                star, mass, radius, temperature = stars[0]
+                _addPlanets(writer, star, name + ' A', [altname + ' A' for altname in altnames], planets, mass,
+                            radius, temperature, rng)
+        else:
+            star, mass, radius, temperature = _addStar(writer, system, name, altnames, distance, rng)
+            _addPlanets(writer, star, name, altnames, planets, mass, radius, temperature, rng)
+
+        systemElements.append(system)
+
+    return systemElements
+
+
+def writeSystemsFolder(directory, systems):
+    """ Writes each system to its own xml file in directory (created if it doesn't exist) like the systems folder of
+    the catalogue
+
+    :param systems: list of system xml elements from generateSystems
+    :return: list of the file paths
+    """
+
+    if not os.path.isdir(directory):
+        os.makedirs(directory)
+
+    paths = []
+    for system in systems:
+        paths.append(os.path.join(directory, system.find('name').text + '.xml'))
+        ET.ElementTree(system).write(paths[-1], encoding='utf-8')
+
+    return paths
+
+
+def writeSystemsStream(path, systems):
+    """ Writes the systems to a single gzipped xml file like systems.xml.gz from oec_gzip, load it with
+    OECDatabase(gzip.open(path), stream=True)
+
+    :param systems: list of system xml elements from generateSystems
+    """
+
+    directory = os.path.dirname(path)
+    if directory and not os.path.isdir(directory):
+        os.makedirs(directory)
+
+    with gzip.open(path, 'wb') as f:
+        f.write(b'<systems>\n')
+        for system in systems:
+            f.write(ET.tostring(system))  # ascii with character references, so no xml declaration
+            f.write(b'\n')
+        f.write(b'</systems>\n')
+
+    return path
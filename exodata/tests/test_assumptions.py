@@ -1,5 +1,10 @@
 import unittest
+import threading
 
+import numpy as np
+
+from .. import assumptions as assum
+from .. import astroquantities as aq
 from .patches import TestCase
 
 
@@ -9,5 +14,166 @@ class Test_planetAssumptions(TestCase):
 
         pass
 
+
+class Test_arrayClassifiers(TestCase):
+
+    def setUp(self):
+        self.massTypes = list(assum.planetAssumptions['massType'])
+
+    def tearDown(self):
+        assum.planetAssumptions['massType'] = self.massTypes
+
+    def test_mass_types_match_scalar(self):
+        masses = np.array([0.001, 0.0629, float((10 * aq.M_e).rescale(aq.M_j)), 0.1, 5., np.inf, np.nan])
+
+        result = assum.planetMassTypes(masses)
+        expected = [None if mass != mass else assum.planetMassType(mass * aq.M_j) for mass in masses]
+
+        self.assertEqual(list(result.values), expected)
+        self.assertEqual(result.codes[-1], -1)
+
+    def test_limit_is_exclusive(self):
+        result = assum.planetMassTypes(np.array([10., 20.]) * aq.M_e)
+
+        self.assertEqual(list(result.values), [assum.planetMassType(10 * aq.M_e), assum.planetMassType(20 * aq.M_e)])
+
+    def test_radius_and_temp_types_match_scalar(self):
+        radii = np.array([0.1, 0.3, 0.6, 2.])
+        temps = np.array([100., 800., 1500., 2500.])
+
+        self.assertEqual(list(assum.planetRadiusTypes(radii).values),
+                         [assum.planetRadiusType(radius * aq.R_j) for radius in radii])
+        self.assertEqual(list(assum.planetTempTypes(temps).values),
+                         [assum.planetTempType(temp * aq.K) for temp in temps])
+
+    def test_planet_types_match_scalar(self):
+        temps = [500., 1500., np.nan, 3000.]
+        masses = [np.nan, 0.5, 0.01, np.nan]
+        radii = [0.1, np.nan, np.nan, np.nan]
+
+        result = assum.planetTypes(temps, masses, radii)
+
+        def quantity(value, unit):
+            return np.nan if value != value else value * unit
+
+        expected = [assum.planetType(quantity(T, aq.K), quantity(M, aq.M_j), quantity(R, aq.R_j))
+                    for T, M, R in zip(temps, masses, radii)]
+
+        self.assertEqual(list(result.values), expected)
+
+    def test_modifying_assumptions_invalidates_limits(self):
+        masses = np.array([0.01])
+        self.assertEqual(assum.planetMassTypes(masses).values[0], 'Super-Earth')
+
+        assum.planetAssumptions['massType'].insert(0, (5 * aq.M_e, 'Earth'))
+
+        self.assertEqual(assum.planetMassTypes(masses).values[0], 'Earth')
+
+    def test_fingerprint_changes(self):
+        fingerprint = assum.assumptionsFingerprint()
+        self.assertEqual(assum.assumptionsFingerprint(), fingerprint)
+
+        assum.planetAssumptions['massType'] = list(self.massTypes)
+
+        self.assertNotEqual(assum.assumptionsFingerprint(), fingerprint)
+        self.assertEqual(assum.assumptionsFingerprint(['albedo']), assum.assumptionsFingerprint(['albedo']))
+
+    def test_fingerprint_changes_when_modified_in_place(self):
+        albedos = assum.planetAssumptions['albedo']
+        fingerprint = assum.assumptionsFingerprint(['massType', 'albedo'])
+
+        assum.planetAssumptions['massType'].sort(key=lambda limit: limit[1])
+        massFingerprint = assum.assumptionsFingerprint(['massType', 'albedo'])
+        self.assertNotEqual(massFingerprint, fingerprint)
+
+        try:
+            albedos['Jupiter'] = 0.5
+            self.assertNotEqual(assum.assumptionsFingerprint(['massType', 'albedo']), massFingerprint)
+        finally:
+            albedos['Jupiter'] = 0.1
+
+
+class Test_profiles(TestCase):
+
+    def setUp(self):
+        self.profile = assum.addProfile('test', albedo=dict(assum.planetAssumptions['albedo'], Jupiter=0.5))
+
+    def tearDown(self):
+        assum.profiles.pop('test', None)
+        assum.setProfile('default')
+
+    def test_use_profile(self):
+        default = assum.planetAssumptions
+
+        with assum.useProfile('test') as profile:
+            self.assertIs(assum.currentAssumptions(), self.profile)
+            self.assertIs(profile, self.profile)
+            self.assertIs(assum.planetAssumptions, default)
+            self.assertEqual(assum.planetAlbedo('Jupiter'), 0.5)
+
+        self.assertIs(assum.currentAssumptions(), default)
+        self.assertEqual(assum.planetAlbedo('Jupiter'), 0.1)
+
+    def test_use_profile_is_per_thread(self):
+        albedos = []
+        inside = threading.Event()
+        checked = threading.Event()
+
+        def useTestProfile():
+            with assum.useProfile('test'):
+                inside.set()
+                checked.wait(5)
+                albedos.append(assum.planetAlbedo('Jupiter'))
+
+        thread = threading.Thread(target=useTestProfile)
+        thread.start()
+        inside.wait(5)
+        albedos.append(assum.planetAlbedo('Jupiter'))  # this thread keeps the default
+        checked.set()
+        thread.join()
+
+        self.assertEqual(albedos, [0.1, 0.5])
+
+    def test_profile_shares_unchanged_assumptions(self):
+        self.assertIs(self.profile['density'], assum.profiles['default']['density'])
+
+        sizeKeys = assum.assumptionsFingerprint(['density', 'massType'])
+        albedoKey = assum.assumptionsFingerprint(['albedo'])
+
+        with assum.useProfile('test'):
+            self.assertEqual(assum.assumptionsFingerprint(['density', 'massType']), sizeKeys)
+            self.assertNotEqual(assum.assumptionsFingerprint(['albedo']), albedoKey)
+
+        self.assertEqual(assum.assumptionsFingerprint(['albedo']), albedoKey)
+
+    def test_planetAssumptions_replaced_by_plain_dict(self):
+        from ..example import genExamplePlanet
+
+        planet = genExamplePlanet()
+        del planet.params['temperature']
+        defaultTemperature = planet.T
+        profile = assum.planetAssumptions
+
+        try:
+            assum.planetAssumptions = dict(profile, albedo=dict(profile['albedo'], Jupiter=0.5))
+            brightTemperature = planet.T
+            self.assertLess(brightTemperature, defaultTemperature)
+
+            assum.planetAssumptions['albedo']['Jupiter'] = 0.9  # changes to the plain dict are still picked up
+            self.assertLess(planet.T, brightTemperature)
+            self.assertNotEqual(assum.assumptionsFingerprint(), assum.assumptionsFingerprint())
+        finally:
+            assum.planetAssumptions = profile
+
+        self.assertEqual(planet.T, defaultTemperature)
+
+    def test_set_profile(self):
+        assum.setProfile('test')
+        self.assertEqual(assum.planetAlbedo('Jupiter'), 0.5)
+
+        assum.setProfile('default')
+        self.assertEqual(assum.planetAlbedo('Jupiter'), 0.1)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -4,14 +4,18 @@ ran. In future some xml could be included here for the same purpose.
 """
 
 import unittest
+import pickle
 
 import numpy as np
 
+from .. import assumptions
 from .. import astroquantities as aq
+from .. import params
 from ..astroclasses import (Parameters, Star, Planet, Binary, System,
                             _findNearest, SpectralType, _BaseObject,
-                            Magnitude, isNanOrNone, PlanetAndBinaryCommon)
-from ..example import genExamplePlanet
+                            Magnitude, isNanOrNone, PlanetAndBinaryCommon, convertMagnitudes,
+                            parseSpectralTypes, _LRUCache, HierarchyError)
+from ..example import genExamplePlanet, genExampleSystem, genExampleBinary
 from .patches import TestCase
 
 
@@ -340,6 +344,60 @@ class TestSpectralType(TestCase):
             self.assertEqual(test1.specType, '', 'specType null test for {0}'.format(testStr))
 
 
+class TestSpectralTypeParseCache(TestCase):
+
+    def setUp(self):
+        SpectralType._parseCache.clear()
+
+    def test_second_parse_is_cached(self):
+        first = SpectralType('G8.5 IV')
+        second = SpectralType('G8.5 IV')
+
+        self.assertEqual(SpectralType._parseCache.info()['hits'], 1)
+        self.assertEqual((second.classLetter, second.classNumber, second.lumType), ('G', 8.5, 'IV'))
+        self.assertEqual(first.specType, second.specType)
+
+    def test_changing_an_instance_doesnt_change_the_cache(self):
+        first = SpectralType('A8V')
+        first.lumType = 'III'
+
+        self.assertEqual(SpectralType('A8V').lumType, 'V')
+
+    def test_non_strings_are_not_cached(self):
+        SpectralType(np.nan)
+
+        self.assertEqual(len(SpectralType._parseCache), 0)
+
+    def test_LRUCache_drops_least_recently_used(self):
+        cache = _LRUCache(2)
+        cache['a'] = 1
+        cache['b'] = 2
+        cache['a']  # a is now more recent than b
+        cache['c'] = 3
+
+        self.assertTrue('a' in cache and 'c' in cache)
+        self.assertFalse('b' in cache)
+        with self.assertRaises(KeyError):
+            cache['b']
+        self.assertEqual(cache.info(), {'hits': 1, 'misses': 1, 'size': 2, 'maxsize': 2})
+
+
+class Test_parseSpectralTypes(TestCase):
+
+    def test_matches_SpectralType(self):
+        classStrings = ['A8V', 'G8.5 IV', 'K0/K1V', 'Catac. var.', np.nan, 'M', 'A8V', 'B0.5Ia']
+        classLetters, classNumbers, lumTypes = parseSpectralTypes(classStrings)
+
+        for i, classString in enumerate(classStrings):
+            specType = SpectralType(classString)
+            self.assertEqual(classLetters[i], specType.classLetter)
+            self.assertEqual(lumTypes[i], specType.lumType)
+            if specType.classNumber == '':
+                self.assertTrue(np.isnan(classNumbers[i]))
+            else:
+                self.assertEqual(classNumbers[i], specType.classNumber)
+
+
 class TestPlanetClass(TestCase):
 
     def test_isTransiting_is_true_if_tag_present(self):
@@ -369,6 +427,215 @@ class Test_Planet_Parameter_Estimation(TestCase):
         self.assertAlmostEqual(planet.a, 0.449636494929 * aq.au, 5)
 
 
+class Test_CachedValues(TestCase):
+
+    def setUp(self):
+        self.planet = genExamplePlanet()
+        self.star = self.planet.star
+
+    def tearDown(self):
+        params.estimateMissingValues = True
+
+    def _fail(self):
+        raise AssertionError('value should have been cached')
+
+    def test_calculated_value_is_cached(self):
+        del self.planet.params['temperature']
+        temperature = self.planet.T
+
+        self.planet.calcTemperature = self._fail
+        self.assertEqual(self.planet.T, temperature)
+
+    def test_planet_a_setter_invalidates_temperature(self):
+        del self.planet.params['temperature']
+        oldTemperature = self.planet.T
+
+        self.planet.a = 0.1 * aq.au
+
+        self.assertNotAlmostEqual(float(self.planet.T), float(oldTemperature), 3)
+        self.assertAlmostEqual(self.planet.T, self.planet.calcTemperature(), 7)
+
+    def test_planet_R_setter_invalidates_albedo_and_temperature(self):
+        for key in ('temperature', 'mass'):
+            del self.planet.params[key]
+        self.assertEqual(self.planet.albedo, 0.1)  # Jupiter
+        oldTemperature = self.planet.T
+
+        self.planet.R = 1 * aq.R_e
+
+        self.assertEqual(self.planet.albedo, 0.3)  # Super-Earth
+        self.assertLess(self.planet.T, oldTemperature)
+
+    def test_changing_assumptions_invalidates_albedo_and_temperature(self):
+        for key in ('temperature', 'mass'):
+            del self.planet.params[key]
+        oldTemperature = self.planet.T
+        albedos = assumptions.planetAssumptions['albedo']
+
+        try:
+            assumptions.planetAssumptions['albedo'] = dict(albedos, Jupiter=0.5)
+
+            self.assertEqual(self.planet.albedo, 0.5)
+            self.assertLess(self.planet.T, oldTemperature)
+        finally:
+            assumptions.planetAssumptions['albedo'] = albedos
+
+    def test_values_cached_per_assumption_profile(self):
+        for key in ('temperature', 'mass'):
+            del self.planet.params[key]
+        defaultTemperature = self.planet.T
+        assumptions.addProfile('dense', density={'Jupiter': 2 * aq.g / aq.cm**3})
+        assumptions.addProfile('bright', albedo=dict(assumptions.planetAssumptions['albedo'], Jupiter=0.5))
+
+        try:
+            self.planet.calcTemperature = self._fail
+            with assumptions.useProfile('dense'):  # the temperature doesn't depend on the density
+                self.assertEqual(self.planet.T, defaultTemperature)
+
+            del self.planet.calcTemperature
+            with assumptions.useProfile('bright'):
+                brightTemperature = self.planet.T
+            self.assertLess(brightTemperature, defaultTemperature)
+
+            self.planet.calcTemperature = self._fail
+            self.assertEqual(self.planet.T, defaultTemperature)
+            with assumptions.useProfile('bright'):
+                self.assertEqual(self.planet.T, brightTemperature)
+        finally:
+            for name in ('dense', 'bright'):
+                del assumptions.profiles[name]
+
+    def test_star_M_setter_invalidates_planet_sma(self):
+        del self.planet.params['semimajoraxis']
+        oldSMA = self.planet.a
+
+        self.star.M = 0.5 * aq.M_s
+
+        self.assertLess(self.planet.a, oldSMA)
+        self.assertAlmostEqual(self.planet.a, self.planet.calcSMA(), 7)
+
+    def test_star_M_setter_invalidates_star_and_planet_temperature(self):
+        del self.planet.params['temperature']
+        del self.star.params['temperature']
+        oldStarTemperature = self.star.T
+        oldTemperature = self.planet.T
+
+        self.star.M = 0.5 * aq.M_s
+
+        self.assertLess(self.star.T, oldStarTemperature)
+        self.assertLess(self.planet.T, oldTemperature)
+
+    def test_reparenting_invalidates(self):
+        del self.planet.params['temperature']
+        oldTemperature = self.planet.T
+        coolStar = genExamplePlanet().star
+        coolStar.T = 3000 * aq.K
+
+        self.planet.parent = coolStar
+
+        self.assertLess(self.planet.T, oldTemperature)
+        self.assertAlmostEqual(self.planet.T, self.planet.calcTemperature(), 7)
+
+    def test_reparenting_invalidates_children(self):
+        del self.planet.params['semimajoraxis']
+        self.planet.a
+
+        self.star.parent = genExampleSystem()
+
+        self.assertFalse('calcSMA' in self.planet._cache)
+
+    def test_unrelated_change_keeps_cached_value(self):
+        del self.planet.params['temperature']
+        self.planet.T
+
+        self.planet.e = 0.5
+        self.star.Z = 0.1
+
+        self.assertTrue('calcTemperature' in self.planet._cache)
+
+    def test_values_kept_separately_for_estimateMissingValues(self):
+        del self.planet.params['semimajoraxis']
+        sma = self.planet.a
+
+        params.estimateMissingValues = False
+        self.assertTrue(self.planet.a is np.nan)
+
+        params.estimateMissingValues = True
+        self.planet.calcSMA = self._fail
+        self.assertEqual(self.planet.a, sma)
+
+    def test_invalidation_works_after_pickling(self):
+        del self.planet.params['semimajoraxis']
+        self.planet.a
+
+        planet = pickle.loads(pickle.dumps(self.planet))
+        oldSMA = planet.a
+        planet.star.M = 0.5 * aq.M_s
+
+        self.assertLess(planet.a, oldSMA)
+
+
+class Test_AncestorCache(TestCase):
+
+    def setUp(self):
+        self.planet = genExamplePlanet()
+        self.star = self.planet.star
+
+    def _fail(self, *args):
+        raise AssertionError('ancestor should have been cached')
+
+    def test_ancestors_are_cached(self):
+        system = self.planet.system
+
+        self.planet._walkParents = self._fail
+        self.assertIs(self.planet.system, system)
+        self.assertIs(self.planet.star, self.star)
+
+    def test_missing_ancestor_raises(self):
+        with self.assertRaises(HierarchyError):
+            self.planet.binary
+        with self.assertRaises(HierarchyError):  # the cached result raises too
+            self.planet.binary
+
+        with self.assertRaises(HierarchyError):
+            Planet().star
+
+    def test_star_binary(self):
+        binary = genExampleBinary()
+        star = binary.children[0]
+
+        self.assertIs(star.binary, binary)
+        self.assertIs(binary._getParentClass(binary, 'Binary'), binary)
+
+    def test_reassigning_parent_invalidates(self):
+        oldSystem = self.planet.system
+        newStar = Star({'name': 'New Star'})
+        newSystem = genExampleSystem()
+        newStar.parent = newSystem
+        newSystem._addChild(newStar)
+
+        self.planet.parent = newStar
+
+        self.assertIs(self.planet.star, newStar)
+        self.assertIs(self.planet.system, newSystem)
+        self.assertIsNot(newSystem, oldSystem)
+
+    def test_moving_ancestor_invalidates_descendants(self):
+        self.assertIs(self.planet.system, self.star.parent)
+        with self.assertRaises(HierarchyError):
+            self.planet.binary
+
+        binary = genExampleBinary()
+        system = self.star.parent
+        binary.parent = system
+        system._addChild(binary)
+        self.star.parent = binary
+        binary._addChild(self.star)
+
+        self.assertIs(self.planet.binary, binary)
+        self.assertIs(self.planet.system, system)
+
+
 class Test_PlanetAndBinaryCommon(TestCase):
 
     def setUp(self):
@@ -428,6 +695,42 @@ class Test_Magnitude(TestCase):
             mag.convert('B', 'K')
 
 
+class Test_convertMagnitudes(TestCase):
+
+    def test_matches_Magnitude_convert(self):
+        spectralTypes = ['B6', 'F5', 'M2.5', 'G2V', 'K0III', 'M9', '', np.nan, 'A0']
+        random = np.random.RandomState(3)
+        mags = {}
+        for letter in 'UBVJHKLMN':
+            values = random.uniform(5, 15, len(spectralTypes))
+            values[random.uniform(size=len(spectralTypes)) < 0.7] = np.nan
+            mags['mag' + letter] = values
+
+        for to_mag in 'UBVJHKLMN':
+            result = convertMagnitudes(to_mag, spectralTypes, **mags)
+
+            for i, spectralType in enumerate(spectralTypes):
+                starMags = dict((key, values[i]) for key, values in mags.items())
+                try:
+                    expected = Magnitude(spectralType, **starMags).convert(to_mag)
+                except ValueError:
+                    expected = np.nan
+
+                if isNanOrNone(expected):
+                    self.assertTrue(np.isnan(result[i]))
+                else:
+                    self.assertAlmostEqual(result[i], expected, 10)
+
+    def test_accepts_None_and_missing_bands(self):
+        result = convertMagnitudes('K', ['B6', 'F5', 'F5'], magV=[12., None, None], magK=[None, 10., None])
+
+        np.testing.assert_allclose(result, [12. + .43, 10., np.nan])
+
+    def test_raises_ValueError_for_bands_without_conversions(self):
+        with self.assertRaises(ValueError):
+            convertMagnitudes('I', ['B6'], magV=[12.])
+
+
 class Test_isNanOrNone(TestCase):
 
     def test_np_nan(self):
@@ -0,0 +1,53 @@
+import unittest
+
+import numpy as np
+
+from .. import astroquantities as aq
+from .patches import TestCase
+
+
+class Test_conversionFactorCache(TestCase):
+
+    def setUp(self):
+        aq.clearConversionCache()
+
+    def test_rescale_matches_quantities(self):
+        for value, unit in ((0.05 * aq.au, aq.m), (1. * aq.R_j, aq.R_e), (np.array([1., 2., np.nan]) * aq.day, aq.min),
+                            (10. * aq.km / aq.s**2, aq.m / aq.s**2), ((2. * aq.R_s) / (1. * aq.au), aq.dimensionless)):
+            result = aq.rescale(value, unit)
+            expected = value.rescale(unit)
+
+            self.assertEqual(result.dimensionality, expected.dimensionality)
+            np.testing.assert_allclose(result.magnitude, expected.magnitude)
+
+    def test_cache_hits(self):
+        aq.rescale(1. * aq.au, aq.m)
+        aq.rescale(2. * aq.au, aq.m)
+        aq.rescale(3. * aq.au, aq.km)
+
+        info = aq.conversionCacheInfo()
+        self.assertEqual(info['hits'], 1)
+        self.assertEqual(info['misses'], 2)
+        self.assertEqual(info['size'], 2)
+        self.assertAlmostEqual(info['hitRate'], 1 / 3.)
+
+    def test_clear(self):
+        aq.rescale(1. * aq.au, aq.m)
+        aq.clearConversionCache()
+
+        self.assertEqual(aq.conversionCacheInfo(), {'hits': 0, 'misses': 0, 'size': 0, 'hitRate': 0.})
+
+    def test_incompatible_units_raise_ValueError(self):
+        with self.assertRaises(ValueError):
+            aq.rescale(1. * aq.au, aq.kg)
+
+    def test_non_quantity_raises_AttributeError(self):
+        with self.assertRaises(AttributeError):
+            aq.rescale(np.nan, aq.m)
+
+    def test_rescaledMagnitude(self):
+        self.assertAlmostEqual(aq.rescaledMagnitude(1. * aq.R_j, aq.R_e), float((1. * aq.R_j).rescale(aq.R_e)))
+
+
+if __name__ == '__main__':
+    unittest.main()
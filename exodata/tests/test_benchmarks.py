@@ -0,0 +1,29 @@
+import os
+import sys
+import unittest
+
+from .patches import TestCase
+
+_benchmarksDir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'benchmarks')
+
+
+@unittest.skipUnless(os.path.isdir(_benchmarksDir), 'benchmarks are not installed with the package')
+class Test_run_benchmarks(TestCase):
+
+    def test_smoke(self):
+        sys.path.insert(0, _benchmarksDir)
+        try:
+            import run_benchmarks
+        finally:
+            sys.path.remove(_benchmarksDir)
+
+        # circumbinary planets have no star, so path like star.d must give nan rather than raise
+        results = run_benchmarks.main(['--systems', '20', '--repeat', '1', '--binary-fraction', '0.5',
+                                       '--circumbinary-fraction', '1'])
+
+        self.assertIn('properties.star.d.cold', results['benchmarks'])
+        self.assertEqual(results['metadata']['systems'], 20)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,375 @@
+import unittest
+import warnings
+
+import numpy as np
+
+from .. import astroquantities as aq
+from .. import columns
+from .. import params
+from .. import assumptions as assum
+from ..astroclasses import Planet, HierarchyError
+from ..example import genExamplePlanet, genExampleBinary
+from .patches import TestCase
+
+
+def generate_planets_with_missing_values():
+    """ example planets with different combinations of parameters missing so each fallback is used
+    """
+
+    removals = [(), ('temperature',), ('semimajoraxis',), ('period',), ('temperature', 'semimajoraxis'),
+                ('temperature', 'mass'), ('temperature', 'mass', 'radius'), ('inclination',)]
+
+    planets = []
+    for removal in removals:
+        planet = genExamplePlanet()
+        for key in removal:
+            del planet.params[key]
+        planets.append(planet)
+
+    transiting = genExamplePlanet()  # the example planet doesn't transit so make one that does
+    transiting.params['semimajoraxis'] = 0.05 * aq.au
+    transiting.params['periastron'] = 10 * aq.deg
+    planets.append(transiting)
+
+    noStarTemp = genExamplePlanet()
+    del noStarTemp.params['temperature']
+    del noStarTemp.star.params['temperature']
+    planets.append(noStarTemp)
+
+    return planets
+
+
+def _asFloat(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _calcOrNan(func):
+    """ the engine gives nan where the method raises on missing values
+    """
+    try:
+        return _asFloat(func())
+    except (ValueError, HierarchyError):
+        return np.nan
+
+
+class Test_planetColumns(TestCase):
+
+    def tearDown(self):
+        params.estimateMissingValues = True
+
+    def assertMatchesProperties(self, planets):
+        result = columns.planetColumns(planets)
+
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            expected = {
+                'P': [_asFloat(planet.P) for planet in planets],
+                'a': [_asFloat(planet.a) for planet in planets],
+                'T': [_asFloat(planet.T) for planet in planets],
+                'transitDuration': [_asFloat(planet.calcTransitDuration()) for planet in planets],
+                'transitDepth': [_calcOrNan(planet.calcTransitDepth) for planet in planets],
+            }
+
+        for key, values in expected.items():
+            np.testing.assert_allclose(result[key].values, values, rtol=1e-7, err_msg=key)
+
+        return result
+
+    def test_matches_properties(self):
+        planets = generate_planets_with_missing_values()
+        result = self.assertMatchesProperties(planets)
+
+        self.assertTrue(np.isfinite(result['transitDuration'].values).any())
+
+    def test_matches_properties_not_estimating(self):
+        params.estimateMissingValues = False
+        self.assertMatchesProperties(generate_planets_with_missing_values())
+
+    def test_provenance(self):
+        planets = generate_planets_with_missing_values()[:4]
+        result = columns.planetColumns(planets)
+
+        self.assertEqual(list(result['T'].provenance), [columns.MEASURED, columns.CALCULATED, columns.MEASURED,
+                                                        columns.MEASURED])
+        self.assertEqual(list(result['a'].provenance), [columns.MEASURED, columns.MEASURED, columns.CALCULATED,
+                                                        columns.MEASURED])
+        self.assertEqual(list(result['P'].provenance), [columns.MEASURED, columns.MEASURED, columns.MEASURED,
+                                                        columns.CALCULATED])
+
+    def test_provenance_missing_when_not_estimating(self):
+        planet = genExamplePlanet()
+        del planet.params['temperature']
+
+        result = columns.planetColumns([planet], estimate=False)
+
+        self.assertTrue(np.isnan(result['T'].values[0]))
+        self.assertEqual(result['T'].provenance[0], columns.MISSING)
+
+    def test_planet_without_star_is_nan(self):
+        planet = Planet({'name': 'Lone b', 'radius': 1 * aq.R_j})
+        binary = genExampleBinary()
+        planet.parent = binary
+        binary._addChild(planet)
+
+        with self.assertRaises(HierarchyError):
+            planet.calcTransitDepth()
+
+        result = columns.planetColumns([planet])
+        self.assertTrue(np.isnan(result['transitDepth'].values[0]))
+        self.assertEqual(result['transitDepth'].provenance[0], columns.MISSING)
+
+
+class Test_planetTypeColumns(TestCase):
+
+    def test_matches_planet_methods(self):
+        planets = generate_planets_with_missing_values()
+        result = columns.planetTypeColumns(planets)
+
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            for key in ('type', 'massType', 'radiusType', 'tempType'):
+                self.assertEqual(list(result[key].values), [getattr(planet, key)() for planet in planets], key)
+
+    def test_cached_until_params_or_assumptions_change(self):
+        planets = [genExamplePlanet() for i in range(3)]
+        result = columns.planetTypeColumns(planets)
+
+        self.assertIs(columns.planetTypeColumns(planets), result)
+        self.assertIsNot(columns.planetTypeColumns(planets[:2]), result)
+        self.assertIsNot(columns.planetTypeColumns(planets, estimate=False), result)
+        with self.assertRaises(ValueError):
+            result['type'].codes[0] = 0  # shared, so read only
+
+        planets[0].M = 0.01 * aq.M_j
+        changed = columns.planetTypeColumns(planets)
+        self.assertIsNot(changed, result)
+        self.assertEqual(changed['massType'].values[0], 'Super-Earth')
+
+        assum.addProfile('dense', density={'Jupiter': 2 * aq.g / aq.cm**3})
+        assum.addProfile('bright', albedo=dict(assum.planetAssumptions['albedo'], Jupiter=0.9))
+        try:
+            with assum.useProfile('dense'):
+                self.assertIs(columns.planetTypeColumns(planets), changed)
+            with assum.useProfile('bright'):
+                self.assertIs(columns.planetTypeColumns(planets, estimate=False),
+                              columns.planetTypeColumns(planets, estimate=False))
+                self.assertIsNot(columns.planetTypeColumns(planets), changed)  # estimated temperatures change
+        finally:
+            del assum.profiles['dense'], assum.profiles['bright']
+
+        massTypes = assum.planetAssumptions['massType']
+        try:
+            assum.planetAssumptions['massType'] = [(float('inf'), 'Planet')]
+            self.assertEqual(list(columns.planetTypeColumns(planets)['massType'].values), ['Planet'] * 3)
+        finally:
+            assum.planetAssumptions['massType'] = massTypes
+
+
+class Test_starColumns(TestCase):
+
+    def tearDown(self):
+        params.estimateMissingValues = True
+
+    def _stars(self):
+        stars = []
+        for spectralType, removal in (('G5', ()), ('G5', ('distance',)), ('A4', ('distance',)),
+                                      ('C', ('distance',)), ('K2V', ('distance', 'magV'))):
+            star = genExamplePlanet().star
+            star.params['spectraltype'] = spectralType
+            for key in removal:
+                if key == 'distance':
+                    del star.system.params[key]
+                else:
+                    del star.params[key]
+            stars.append(star)
+
+        return stars
+
+    def test_distance_matches_properties(self):
+        stars = self._stars()
+        result = columns.starColumns(stars)
+
+        np.testing.assert_allclose(result['d'].values, [_asFloat(star.d) for star in stars])
+        self.assertEqual(list(result['d'].provenance), [columns.MEASURED, columns.ESTIMATED, columns.ESTIMATED,
+                                                        columns.MISSING, columns.ESTIMATED])
+
+    def test_distance_matches_properties_not_estimating(self):
+        params.estimateMissingValues = False
+        stars = self._stars()
+        result = columns.starColumns(stars)
+
+        np.testing.assert_allclose(result['d'].values, [_asFloat(star.d) for star in stars])
+
+    def test_magnitudes_match_properties(self):
+        stars = self._stars()
+        del stars[0].params['magV']
+        result = columns.magnitudeColumns(stars, 'UBVJHKLMN')
+
+        for letter, column in result.items():
+            np.testing.assert_allclose(column.values, [_asFloat(getattr(star, 'mag' + letter)) for star in stars],
+                                       err_msg=letter)
+
+        self.assertEqual(result['V'].provenance[0], columns.ESTIMATED)
+        self.assertEqual(result['V'].provenance[1], columns.MEASURED)
+
+    def test_magnitudes_not_estimating(self):
+        stars = self._stars()
+        result = columns.magnitudeColumns(stars, 'VL', estimate=False)
+
+        self.assertTrue(np.isnan(result['L'].values).all())
+        self.assertEqual(result['V'].provenance[4], columns.MISSING)
+
+    def test_temperature_estimated(self):
+        stars = self._stars()
+        del stars[0].params['temperature']
+        result = columns.starColumns(stars)
+
+        np.testing.assert_allclose(result['T'].values, [_asFloat(star.T) for star in stars])
+        self.assertEqual(result['T'].provenance[0], columns.ESTIMATED)
+        self.assertEqual(result['T'].provenance[1], columns.MEASURED)
+
+
+class Test_paramColumn(TestCase):
+
+    def test_rescales_and_handles_missing(self):
+        planets = [genExamplePlanet() for i in range(3)]
+        planets[0].params['radius'] = 1 * aq.R_j
+        planets[1].params['radius'] = 1 * aq.R_e
+        del planets[2].params['radius']
+
+        result = columns.paramColumn(planets + [None], 'radius', aq.R_e)
+        np.testing.assert_allclose(result[:2], [float((1 * aq.R_j).rescale(aq.R_e)), 1.])
+        self.assertTrue(np.isnan(result[2:]).all())
+
+
+class Test_attributeColumn(TestCase):
+
+    def setUp(self):
+        self.planets = generate_planets_with_missing_values()
+
+    def test_accessor(self):
+        planet = self.planets[0]
+
+        self.assertEqual(columns.accessor('R')(planet), planet.R)
+        self.assertEqual(columns.accessor('star.magV')(planet), planet.star.magV)
+        self.assertEqual(columns.accessor('star.calcLuminosity()')(planet), planet.star.calcLuminosity())
+        self.assertEqual(columns.accessor('R * 2')(planet), planet.R * 2)  # falls back to an expression
+        self.assertIs(columns.accessor('star.magV'), columns.accessor('star.magV'))
+
+    def test_accessor_expressions_see_the_plots_names(self):
+        planet = genExamplePlanet()
+
+        self.assertEqual(columns.accessor('R.rescale(aq.R_e)')(planet), planet.R.rescale(aq.R_e))
+        self.assertEqual(columns.accessor('a * np.pi')(planet), planet.a * np.pi)
+        self.assertEqual(columns.accessor('R.rescale(ed.astroquantities.R_j)')(planet), planet.R.rescale(aq.R_j))
+
+    def test_matches_eval(self):
+        for path, unit in (('R', aq.R_e), ('star.magV', None), ('calcDensity()', None), ('star.d', aq.pc)):
+            values, valueUnit = columns.attributeColumn(self.planets, path, unit)
+
+            expected = []
+            for planet in self.planets:
+                value = eval('planet.' + path)
+                if hasattr(value, 'units'):
+                    value = value.rescale(valueUnit)
+                expected.append(_asFloat(value))
+
+            np.testing.assert_allclose(values, expected, err_msg=path)
+
+    def test_unit_from_values(self):
+        values, unit = columns.attributeColumn(self.planets, 'R')
+        self.assertEqual(unit, self.planets[0].R.units)
+
+        values, unit = columns.attributeColumn(self.planets, 'e')
+        self.assertIsNone(unit)
+
+    def test_hierarchy_error_is_nan(self):
+        planet = Planet({'name': 'Lone b', 'radius': 1 * aq.R_j})
+        values, unit = columns.attributeColumn(self.planets[:1] + [planet], 'star.magV')
+
+        self.assertTrue(np.isfinite(values[0]))
+        self.assertTrue(np.isnan(values[1]))
+
+    def test_columnar_path_matches_method(self):
+        values, unit = columns.attributeColumn(self.planets, 'calcTransitDepth()')
+        expected = [_asFloat(_calcOrNan(planet.calcTransitDepth)) for planet in self.planets]
+
+        np.testing.assert_allclose(values, expected, rtol=1e-7)
+
+    def test_flags_match_evaluating_the_path(self):
+        def calculatedFlags(planets):
+            return [sorted(flag for flag in planet.flags.flags if flag.startswith('Calculated')) for planet in planets]
+
+        planets = [genExamplePlanet() for i in range(2)]
+        for planet in planets:
+            del planet.params['period']
+        expected = [genExamplePlanet() for i in range(2)]
+        for planet in expected:
+            del planet.params['period']
+            planet.calcTransitDuration()
+
+        columns.attributeColumn(planets, 'calcTransitDuration()', aq.day)
+
+        self.assertEqual(calculatedFlags(planets), calculatedFlags(expected))
+        self.assertIn('Calculated Period', calculatedFlags(planets)[0])
+
+    def test_incompatible_unit_raises(self):
+        with self.assertRaises(ValueError):
+            columns.attributeColumn(self.planets, 'R', aq.K)
+
+
+class Test_groupBy(TestCase):
+
+    def test_count_two_keys(self):
+        years = [2010, 2011, np.nan, 2010, 2010]
+        methods = ['RV', 'transit', 'RV', np.nan, 'RV']
+
+        table = columns.groupBy([years, methods])
+
+        np.testing.assert_array_equal(table.keys[0][:2], [2010, 2011])
+        self.assertTrue(np.isnan(table.keys[0][2]))
+        self.assertEqual(list(table.keys[1][:2]), ['RV', 'transit'])
+
+        counts = table.asDict()
+        self.assertEqual(counts[2010]['RV'], 2)
+        self.assertEqual(counts[2011]['transit'], 1)
+        self.assertEqual(counts[2011]['RV'], 0)
+        self.assertEqual(table.values.sum(), len(years))
+
+    def test_aggregates(self):
+        keys = ['a', 'b', 'a', 'c', 'a']
+        values = [1., 2., 3., np.nan, np.nan]
+
+        for aggregate, expected in (('count', [2, 1, 0]), ('sum', [4., 2., 0.]), ('mean', [2., 2., np.nan]),
+                                    ('min', [1., 2., np.nan]), ('max', [3., 2., np.nan])):
+            table = columns.groupBy([keys], values, aggregate)
+            self.assertEqual(list(table.keys[0]), ['a', 'b', 'c'])
+            np.testing.assert_array_equal(table.values, expected, aggregate)
+
+    def test_mask(self):
+        table = columns.groupBy([['a', 'b', 'a']], mask=[True, False, True])
+
+        self.assertEqual(table.asDict(), {'a': 2})
+
+    def test_categorical_key(self):
+        planets = generate_planets_with_missing_values()
+        types = columns.planetTypeColumns(planets)
+        table = columns.groupBy([types['tempType'], types['massType']])
+
+        self.assertEqual(list(table.keys[0]), list(types['tempType'].categories) + [None])
+        self.assertEqual(table.values.sum(), len(planets))
+        self.assertEqual(table.asDict()['Cold']['Jupiter'],
+                         sum(1 for planet in planets if planet.tempType() == 'Cold' and planet.massType() == 'Jupiter'))
+
+    def test_invalid_aggregate(self):
+        with self.assertRaises(ValueError):
+            columns.groupBy([['a']], [1.], 'median')
+        with self.assertRaises(ValueError):
+            columns.groupBy([['a']], aggregate='sum')
+
+
+if __name__ == '__main__':
+    unittest.main()
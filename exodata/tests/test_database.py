@@ -99,6 +99,31 @@ class TestDataBaseLoading(TestCase):
         self.assertEqual(system.children[0].children[0].children, [])
         self.assertEqual(system.children[0].children[1].children, [])
 
+    def test_estimate_missing_values_setting(self):
+        planet = self.oecdb.planetDict['Planet 2 b']
+        self.assertIsNone(planet.estimateMissingValues)
+
+        self.oecdb.estimateMissingValues = False
+
+        self.assertFalse(planet.estimateMissingValues)
+        self.assertFalse(self.oecdb.systemDict['System 2'].estimateMissingValues)
+        self.assertFalse(OECDatabase(self.tempDir + '/', estimateMissingValues=False).planets[0].estimateMissingValues)
+
+    def test_searchPlanet(self):
+        self.assertEqual(self.oecdb.searchPlanet('planet 2b').name, 'Planet 2 b')
+        self.assertEqual(sorted(planet.name for planet in self.oecdb.searchPlanet('Planet 3')),
+                         ['Planet 3 b', 'Planet 3 c'])
+        self.assertFalse(self.oecdb.searchPlanet('Planet 9'))
+
+    def test_fingerprint(self):
+        fingerprint = self.oecdb.fingerprint
+
+        self.assertEqual(OECDatabase(self.tempDir + '/').fingerprint, fingerprint)
+
+        with open(mkstemp('.xml', dir=self.tempDir)[1], 'w') as f:
+            f.write("<system><name>System 8</name></system>")
+        self.assertNotEqual(OECDatabase(self.tempDir + '/').fingerprint, fingerprint)
+
     def test_seperation_tag_AU_imported_only(self):  # TODO code full solution
         system = self.oecdb.systemDict['System 7']
 
@@ -2,6 +2,8 @@ import unittest
 
 import math
 
+import numpy as np
+
 from hypothesis import given, assume
 from hypothesis.strategies import floats
 
@@ -445,6 +447,38 @@ class Test_estimateAbsoluteMagnitude(TestCase):
         self.assertEqual(estimateAbsoluteMagnitude('F2Ia'), -8.0)
 
 
+class Test_estimateAbsoluteMagnitudes(TestCase):
+
+    def test_matches_estimateAbsoluteMagnitude(self):
+        spectralTypes = ['O9', 'B5', 'A5', 'G', 'A', 'A6', 'A0.5Iab', 'L1', 'O9V', 'B5III', 'F2Ia', 'O3IV', 'O3.5IV',
+                         'K2.5V', 'M5Ia0', 'M9', 'O1', 'C', '', np.nan, 'Catac. var.']
+        for letter in 'OBAFGKM':
+            for number in range(10):
+                for lumType in ('', 'V', 'IV', 'III', 'II', 'Ib', 'Iab', 'Ia', 'Ia0'):
+                    spectralTypes.append('{0}{1}{2}'.format(letter, number, lumType))
+                    spectralTypes.append('{0}{1}.5{2}'.format(letter, number, lumType))
+
+        result = eq.estimateAbsoluteMagnitudes(spectralTypes)
+
+        for spectralType, absMag in zip(spectralTypes, result):
+            expected = estimateAbsoluteMagnitude(spectralType)
+            if math.isnan(expected):
+                self.assertTrue(math.isnan(absMag), spectralType)
+            else:
+                self.assertAlmostEqual(absMag, expected, 10, spectralType)
+
+
+class Test_estimateDistances(TestCase):
+
+    def test_matches_estimateDistance(self):
+        result = eq.estimateDistances([14, 10, np.nan], [0, 2, 1], 0.1)
+
+        self.assertAlmostEqual(result[0], estimateDistance(14, 0, 0.1), 7)
+        self.assertAlmostEqual(result[1], estimateDistance(10, 2, 0.1), 7)
+        self.assertTrue(math.isnan(result[2]))
+        self.assertEqual(result.units, aq.pc)
+
+
 class Test_createMagConversionDict(TestCase):
 
     def test_works(self):
@@ -454,5 +488,71 @@ class Test_createMagConversionDict(TestCase):
         self.assertEqual(magTable['B0'][0], '30000')
         self.assertEqual(magTable['M6'][14], 'nan')
 
+
+class Test_arrayInputs(TestCase):
+    """ each equation should solve for a whole array at once, giving the same result as solving each element
+    """
+
+    def assertMatchesScalars(self, eqnClass, outName, arrayArgs, scalarArgs=None):
+        """ arrayArgs are quantity arrays of the same length, scalarArgs are broadcast against them
+        """
+        if scalarArgs is None:
+            scalarArgs = {}
+
+        kwargs = dict(arrayArgs, **scalarArgs)
+        result = getattr(eqnClass(**kwargs), outName)
+        length = len(list(arrayArgs.values())[0])
+        self.assertEqual(np.shape(result), (length,))
+
+        for index in range(length):
+            elementArgs = dict((name, value[index]) for name, value in arrayArgs.items())
+            expected = getattr(eqnClass(**dict(elementArgs, **scalarArgs)), outName)
+
+            if math.isnan(expected):
+                self.assertTrue(math.isnan(result[index]))
+            else:
+                self.assertAlmostEqual(float(result[index]), float(expected), 7)
+
+    def test_KeplersThirdLaw(self):
+        a = np.array([0.01488, 0.05, np.nan, 1.]) * aq.au
+        M_s = np.array([0.176, 1., 1., np.nan]) * aq.M_s
+        P = np.array([1.58, 3., 10., 365.]) * aq.day
+
+        self.assertMatchesScalars(KeplersThirdLaw, 'P', {'a': a, 'M_s': M_s})
+        self.assertMatchesScalars(KeplersThirdLaw, 'P', {'a': a}, {'M_s': 1. * aq.M_s})
+        self.assertMatchesScalars(KeplersThirdLaw, 'a', {'M_s': M_s, 'P': P})
+        self.assertMatchesScalars(KeplersThirdLaw, 'M_s', {'a': a, 'P': P})
+        self.assertMatchesScalars(KeplersThirdLaw, 'M_p', {'a': a, 'P': P}, {'M_s': 1. * aq.M_s, 'M_p': None})
+
+    def test_planet_equations(self):
+        M = np.array([1., 0.01, np.nan]) * aq.M_j
+        R = np.array([1., 0.1, 1.]) * aq.R_j
+
+        self.assertMatchesScalars(SurfaceGravity, 'g', {'M': M, 'R': R})
+        self.assertMatchesScalars(eq.Logg, 'logg', {'M': M, 'R': R})
+        self.assertMatchesScalars(Density, 'density', {'M': M, 'R': R})
+        self.assertMatchesScalars(Density, 'R', {'M': M}, {'density': 1.3 * aq.g / aq.cm**3})
+        self.assertMatchesScalars(eq.Logg, 'M', {'R': R, 'logg': np.array([3.4, 4., np.nan])})
+
+    def test_star_equations(self):
+        R_s = np.array([1., 0.2, np.nan]) * aq.R_s
+        T = np.array([5800., 3000., 4000.]) * aq.K
+
+        self.assertMatchesScalars(StellarLuminosity, 'L', {'R': R_s, 'T': T})
+        self.assertMatchesScalars(TransitDepth, 'depth', {'R_s': R_s}, {'R_p': 1. * aq.R_j})
+        self.assertMatchesScalars(eq.ImpactParameter, 'b', {'R_s': R_s}, {'a': 0.05 * aq.au, 'i': 88. * aq.deg})
+        self.assertMatchesScalars(ScaleHeight, 'H', {'T_eff': T},
+                                  {'mu': 2.3 * aq.atomic_mass_unit, 'g': 10. * aq.m / aq.s**2})
+
+    def test_TransitDuration(self):
+        P = np.array([1.58040482, 3., np.nan]) * aq.day
+        a = np.array([0.014, 0.04, 0.04]) * aq.au
+
+        self.assertMatchesScalars(TransitDuration, 'Td', {'P': P, 'a': a},
+                                  {'Rp': 0.02 * aq.R_j, 'Rs': 0.21 * aq.R_s, 'i': 88.17 * aq.deg, 'e': 0., 'w': 0.})
+        self.assertMatchesScalars(TransitDuration, 'Td', {'P': P, 'a': a, 'w': np.zeros(3)},
+                                  {'Rp': 0.02 * aq.R_j, 'Rs': 0.21 * aq.R_s, 'i': 88.17 * aq.deg, 'e': 0.})
+
+
 if __name__ == '__main__':
     unittest.main()
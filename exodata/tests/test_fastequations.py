@@ -0,0 +1,118 @@
+import unittest
+
+import numpy as np
+
+from .. import astroquantities as aq
+from .. import equations as eq
+from .. import fastequations as feq
+from .patches import TestCase
+
+# for each equation the units fastequations uses for each variable and a range of sensible values. The first variable
+# is the one calculated from the others to give a consistent set
+equationSpecs = (
+    (eq.ScaleHeight, feq.ScaleHeight, (
+        ('H', aq.m, None), ('T_eff', aq.K, (500, 3000)), ('mu', aq.atomic_mass_unit, (1, 40)),
+        ('g', aq.m / aq.s**2, (1, 100)))),
+    (eq.MeanPlanetTemp, feq.MeanPlanetTemp, (
+        ('T_p', aq.K, None), ('A', aq.dimensionless, (0, 0.9)), ('T_s', aq.K, (3000, 10000)),
+        ('R_s', aq.R_s, (0.1, 5)), ('a', aq.au, (0.01, 5)), ('epsilon', aq.dimensionless, (0.3, 1)))),
+    (eq.StellarLuminosity, feq.StellarLuminosity, (
+        ('L', aq.W, None), ('R', aq.R_s, (0.1, 5)), ('T', aq.K, (3000, 10000)))),
+    (eq.KeplersThirdLaw, feq.KeplersThirdLaw, (
+        ('P', aq.day, None), ('a', aq.au, (0.01, 5)), ('M_s', aq.M_s, (0.1, 3)), ('M_p', aq.M_j, (0.01, 10)))),
+    (eq.SurfaceGravity, feq.SurfaceGravity, (
+        ('g', aq.m / aq.s**2, None), ('M', aq.M_j, (0.01, 10)), ('R', aq.R_j, (0.1, 2)))),
+    (eq.Logg, feq.Logg, (
+        ('logg', None, None), ('M', aq.M_j, (0.01, 10)), ('R', aq.R_j, (0.1, 2)))),
+    (eq.TransitDepth, feq.TransitDepth, (
+        ('depth', aq.dimensionless, None), ('R_s', aq.R_s, (0.1, 5)), ('R_p', aq.R_j, (0.1, 2)))),
+    (eq.Density, feq.Density, (
+        ('density', aq.g / aq.cm**3, None), ('M', aq.M_j, (0.01, 10)), ('R', aq.R_j, (0.1, 2)))),
+    (eq.ImpactParameter, feq.ImpactParameter, (
+        ('b', aq.dimensionless, None), ('a', aq.au, (0.01, 0.05)), ('R_s', aq.R_s, (0.8, 2)),
+        ('i', aq.deg, (88, 90)))),
+)
+
+
+def _toFloat(value, unit):
+    if unit is None:  # ie logg
+        return float(value)
+    return float(value.rescale(unit))
+
+
+def _toQuantity(value, unit):
+    if unit is None:
+        return value
+    return value * unit
+
+
+class Test_fastequations(TestCase):
+    """ checks every rearrangement in fastequations against the equations classes
+    """
+
+    def _randomValues(self, variables, random):
+        return dict((name, random.uniform(*valueRange)) for name, unit, valueRange in variables[1:])
+
+    def test_matches_equations(self):
+        random = np.random.RandomState(42)
+
+        for eqnClass, fastClass, variables in equationSpecs:
+            units = dict((name, unit) for name, unit, valueRange in variables)
+
+            for trial in range(10):
+                values = self._randomValues(variables, random)
+                outName = variables[0][0]
+                quantityArgs = dict((name, _toQuantity(value, units[name])) for name, value in values.items())
+                values[outName] = _toFloat(getattr(eqnClass(**quantityArgs), outName), units[outName])
+
+                for name, unit, valueRange in variables:
+                    others = dict((other, value) for other, value in values.items() if other != name)
+                    quantityArgs = dict((other, _toQuantity(value, units[other])) for other, value in others.items())
+                    quantityArgs[name] = None  # some variables have defaults (ie M_p) or are required
+
+                    expected = _toFloat(getattr(eqnClass(**quantityArgs), name), unit)
+                    result = getattr(fastClass, name)(**others)
+
+                    self.assertAlmostEqual(result / expected, 1., 7, msg='{0}.{1}'.format(eqnClass.__name__, name))
+
+    def test_arrays(self):
+        a = np.array([0.01, 0.1, np.nan])
+        result = feq.KeplersThirdLaw.P(a=a, M_s=1.)
+
+        self.assertEqual(result.shape, (3,))
+        self.assertAlmostEqual(result[1], float(eq.KeplersThirdLaw(a=0.1 * aq.au, M_s=1. * aq.M_s).P), 7)
+        self.assertTrue(np.isnan(result[2]))
+
+
+class Test_TransitDuration(TestCase):
+
+    def test_matches_equations(self):
+        expected = eq.TransitDuration(P=3. * aq.day, a=0.04 * aq.au, Rp=1.2 * aq.R_j, Rs=1.1 * aq.R_s, i=88. * aq.deg,
+                                      e=0.1, w=30 * aq.deg).Td
+        result = feq.TransitDuration.Td(P=3., a=0.04, Rp=1.2, Rs=1.1, i=88., e=0.1, w=30.)
+
+        self.assertAlmostEqual(result, float(expected.rescale(aq.min)), 6)
+
+    def test_circular_matches_equations(self):
+        expected = eq.transitDurationCircular(3. * aq.day, 1.1 * aq.R_s, 1.2 * aq.R_j, 0.04 * aq.au, 88. * aq.deg)
+        result = feq.transitDurationCircular(3., 1.1, 1.2, 0.04, 88.)
+
+        self.assertAlmostEqual(result, float(expected), 6)
+
+    def test_circular_nan_inclination_is_edge_on(self):
+        self.assertAlmostEqual(feq.transitDurationCircular(3., 1.1, 1.2, 0.04, np.nan),
+                               feq.transitDurationCircular(3., 1.1, 1.2, 0.04, 90.), 10)
+
+
+class Test_estimates(TestCase):
+
+    def test_estimateStellarTemperature(self):
+        self.assertAlmostEqual(feq.estimateStellarTemperature(0.5),
+                               float(eq.estimateStellarTemperature(0.5 * aq.M_s)), 7)
+
+    def test_estimateDistance(self):
+        self.assertAlmostEqual(feq.estimateDistance(10, 5, 0.1), float(eq.estimateDistance(10, 5, 0.1)), 7)
+
+
+if __name__ == '__main__':
+    unittest.main()
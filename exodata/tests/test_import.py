@@ -0,0 +1,88 @@
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+from .. import astroclasses as ac
+from .. import equations as eq
+from .._lazy import LazyAttributes
+from .patches import TestCase
+
+# seconds to import exodata and the database class (what a script loading the catalogue needs). Its around 0.3s
+# without the lazy imports it was 1.5s. Timing depends on the machine so it is only checked when the environment
+# variable EXODATA_TIMING_TESTS is set
+IMPORT_TIME_BUDGET = 1.0
+
+# these should only be imported when the parts of exodata needing them are used
+DEFERRED_MODULES = ('matplotlib', 'astropy', 'requests', 'pkg_resources', 'exodata.plots', 'exodata.example')
+
+_importScript = """
+import json, sys, time
+start = time.time()
+import exodata
+exodata.OECDatabase
+duration = time.time() - start
+print(json.dumps({'time': duration, 'modules': [name for name in %r if name in sys.modules]}))
+""" % (DEFERRED_MODULES,)
+
+
+def _timeImport():
+    packageRoot = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    output = subprocess.check_output([sys.executable, '-W', 'ignore', '-c', _importScript], cwd=packageRoot)
+    return json.loads(output.decode('utf-8').strip().splitlines()[-1])
+
+
+@unittest.skipIf(sys.version_info < (3, 7), 'lazy imports need module __getattr__')
+class Test_import(TestCase):
+
+    def test_heavy_modules_are_deferred(self):
+        self.assertEqual(_timeImport()['modules'], [])
+
+    @unittest.skipUnless(os.environ.get('EXODATA_TIMING_TESTS'), 'set EXODATA_TIMING_TESTS to run timing tests')
+    def test_import_within_budget(self):
+        # best of a few runs so a busy machine doesn't fail the test
+        duration = min(_timeImport()['time'] for i in range(3))
+        self.assertLess(duration, IMPORT_TIME_BUDGET)
+
+    def test_submodules_load_on_access(self):
+        import exodata
+
+        self.assertIs(exodata.plots, sys.modules['exodata.plots'])
+        self.assertIs(exodata.load_db_from_url, sys.modules['exodata.database'].load_db_from_url)
+        self.assertIn('plots', dir(exodata))
+
+        with self.assertRaises(AttributeError):
+            exodata.notAModule
+
+
+class Test_lazyTables(TestCase):
+
+    def test_tables_load_on_access(self):
+        self.assertEqual(eq.magDict['A6'][10], '0.44')
+        self.assertEqual(eq.LClassRef['V'], 0)
+
+    def test_magnitude_table_is_only_read_once(self):
+        self.assertIs(ac.magDict, eq.magDict)
+
+    def test_missing_attribute(self):
+        with self.assertRaises(AttributeError):
+            eq.notATable
+
+    def test_loadAll(self):  # how the attributes are created on python < 3.7
+        calls = []
+
+        def loadTable():
+            calls.append('table')
+            return {'table': 1, 'index': 2}
+
+        moduleGlobals = {'__name__': 'module'}
+        lazy = LazyAttributes(moduleGlobals, {'table': loadTable, 'index': loadTable, 'other': lambda: {'other': 3}})
+        lazy.loadAll()
+
+        self.assertEqual(moduleGlobals, {'__name__': 'module', 'table': 1, 'index': 2, 'other': 3})
+        self.assertEqual(calls, ['table'])
+
+
+if __name__ == '__main__':
+    unittest.main()
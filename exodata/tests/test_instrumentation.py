@@ -0,0 +1,131 @@
+import unittest
+
+import numpy as np
+
+from .patches import TestCase
+
+from .. import instrumentation
+from .. import astroquantities as aq
+from .. import equations as eq
+from .. import astroclasses as ac
+from .. import limbdarkening
+from ..example import genExamplePlanet
+
+
+class Test_capture(TestCase):
+
+    def setUp(self):
+        instrumentation.disable()
+        instrumentation.reset()
+
+    def tearDown(self):
+        instrumentation.disable()
+        instrumentation.reset()
+
+    def test_estimation(self):
+        planet = genExamplePlanet()
+        planet.params['temperature'] = np.nan
+
+        with instrumentation.capture() as report:
+            planet.T
+            planet.T  # cached
+
+        self.assertEqual(report.counters['estimate.calcTemperature'], 2)
+        self.assertEqual(report.timers['estimate.calcTemperature'].calls, 1)
+        self.assertTrue(report.counters['equations.MeanPlanetTemp'] >= 1)
+        self.assertTrue(report.counters['astroclasses.ancestor'] >= 1)
+
+    def test_equations(self):
+        with instrumentation.capture() as report:
+            eq.KeplersThirdLaw(a=0.05 * aq.au, M_s=1. * aq.M_s).P
+            eq.KeplersThirdLaw(a=0.05 * aq.au, M_s=1. * aq.M_s).P
+
+        self.assertEqual(report.counters['equations.KeplersThirdLaw'], 2)
+        timer = report.timers['equations.KeplersThirdLaw.P']
+        self.assertEqual(timer.calls, 2)
+        self.assertTrue(timer.seconds > 0)
+
+    def test_rescale(self):
+        with instrumentation.capture() as report:
+            aq.rescale(2. * aq.km, aq.m)
+            aq.rescaledMagnitude(2. * aq.km, aq.m)
+
+        self.assertEqual(report.counters['astroquantities.rescale'], 1)
+        self.assertEqual(report.counters['astroquantities.rescaledMagnitude'], 1)
+
+    def test_equation_timers_only_installed_while_enabled(self):
+        plain = eq.KeplersThirdLaw.__dict__['P'].fget
+
+        with instrumentation.capture():
+            self.assertIsNot(eq.KeplersThirdLaw.__dict__['P'].fget, plain)
+
+        self.assertIs(eq.KeplersThirdLaw.__dict__['P'].fget, plain)
+
+    def test_conversion_and_lookup_timers_only_installed_while_enabled(self):
+        def installed():
+            return (ac.Magnitude.__dict__['convert'], ac.convertMagnitudes, limbdarkening.quadraticCoeffs,
+                    limbdarkening.quadraticCoeffsBatch)
+
+        plain = installed()
+        with instrumentation.capture() as report:
+            timed = installed()
+            ac.convertMagnitudes('K', ['G5V'], magV=[10.2])
+
+        self.assertTrue(all(timedFunction is not plainFunction for timedFunction, plainFunction in zip(timed, plain)))
+        self.assertEqual(report.timers['magnitude.convertMagnitudes'].calls, 1)
+        self.assertEqual(installed(), plain)
+
+    def test_disabled_records_nothing(self):
+        planet = genExamplePlanet()
+        planet.params['temperature'] = np.nan
+        planet.T
+        eq.KeplersThirdLaw(a=0.05 * aq.au, M_s=1. * aq.M_s).P
+
+        self.assertEqual(instrumentation.counters, {})
+        self.assertEqual(instrumentation.timers, {})
+
+    def test_nested(self):
+        with instrumentation.capture() as outer:
+            aq.rescale(1. * aq.km, aq.m)
+            with instrumentation.capture() as inner:
+                aq.rescale(1. * aq.km, aq.m)
+            self.assertTrue(instrumentation.enabled)
+            aq.rescale(1. * aq.km, aq.m)
+
+        self.assertFalse(instrumentation.enabled)
+        self.assertEqual(inner.counters, {'astroquantities.rescale': 1})
+        self.assertEqual(outer.counters['astroquantities.rescale'], 3)
+
+    def test_enable_and_report(self):
+        instrumentation.enable()
+        aq.rescale(1. * aq.km, aq.m)
+        with instrumentation.capture():
+            aq.rescale(1. * aq.km, aq.m)
+        self.assertTrue(instrumentation.enabled)
+
+        self.assertEqual(instrumentation.report().counters['astroquantities.rescale'], 2)
+
+    def test_timed(self):
+
+        @instrumentation.timed('test.add')
+        def add(a, b):
+            return a + b
+
+        self.assertEqual(add(1, 2), 3)
+        with instrumentation.capture() as report:
+            self.assertEqual(add(1, b=2), 3)
+
+        self.assertEqual(report.timers['test.add'].calls, 1)
+        self.assertEqual(add.__name__, 'add')
+
+    def test_report_output(self):
+        with instrumentation.capture() as report:
+            eq.Logg(M=1. * aq.M_s, R=1. * aq.R_s).logg
+
+        self.assertIn('equations.Logg.logg', str(report))
+        self.assertEqual(report.asDict()['counters']['equations.Logg'], 1)
+        self.assertEqual(report.asDict()['timers']['equations.Logg.logg']['calls'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
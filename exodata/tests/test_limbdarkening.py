@@ -0,0 +1,149 @@
+import os
+import shutil
+import unittest
+from tempfile import mkdtemp
+
+import numpy as np
+
+from .. import limbdarkening as ld
+from .patches import TestCase
+
+
+def _scanTable(table, T, logg, Z, wavelength):
+    """ the row by row search Star.getLimbdarkeningCoeff used to do, for checking the grid against
+    """
+    T = ld.temperatures[ld._nearestIndex(ld.temperatures, T)]
+    logg = ld.loggs[ld._nearestIndex(ld.loggs, logg)]
+    Z = ld.metallicities[ld._nearestIndex(ld.metallicities, Z)]
+
+    for i in range(len(table)):
+        if table[i, 2] == logg and table[i, 3] == T and table[i, 4] == Z and table[i, 0] == 1:
+            return (np.interp(wavelength, ld.wavelengths, table[i, 8:], left=0, right=0),
+                    np.interp(wavelength, ld.wavelengths, table[i + 1, 8:], left=0, right=0))
+
+    raise ValueError('No limb darkening values could be found')
+
+
+class Test_quadraticCoeffs(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.table = np.loadtxt(ld._tablePath())
+
+    def test_matches_table_scan(self):
+        random = np.random.RandomState(1)
+
+        for T, logg, Z, wavelength in zip(random.uniform(3000, 51000, 40), random.uniform(0, 5.5, 40),
+                                          random.uniform(-5, 1, 40), random.uniform(0.3, 3.5, 40)):
+            try:
+                expected = _scanTable(self.table, T, logg, Z, wavelength)
+            except ValueError:
+                with self.assertRaises(ValueError):
+                    ld.quadraticCoeffs(T, logg, Z, wavelength)
+            else:
+                self.assertEqual(ld.quadraticCoeffs(T, logg, Z, wavelength), expected)
+
+    def test_missing_node_raises_ValueError(self):
+        with self.assertRaises(ValueError):
+            ld.quadraticCoeffs(50000, 0., 0.)
+
+    def test_wavelength_outside_table_is_zero(self):
+        self.assertEqual(ld.quadraticCoeffs(5800, 4.5, 0., wavelength=10.), (0, 0))
+
+
+
+class Test_gridFile(TestCase):
+
+    def setUp(self):  # the grid is saved in a temporary directory rather than the package
+        self.tempDir = mkdtemp()
+        self.gridPath = os.path.join(self.tempDir, 'quadratic.npy')
+        self._gridPath = ld._gridPath
+        ld._gridPath = lambda: self.gridPath
+        ld.clearCache()
+
+    def tearDown(self):
+        ld._gridPath = self._gridPath
+        ld.clearCache()
+        shutil.rmtree(self.tempDir)
+
+    def test_grid_is_cached_to_disk_and_reloaded(self):
+        grid = ld.loadGrid()
+        self.assertTrue(os.path.exists(self.gridPath))
+        self.assertEqual(os.listdir(self.tempDir), ['quadratic.npy'])  # the temporary file was moved into place
+
+        ld.clearCache()
+        self.assertTrue(os.path.exists(self.gridPath))
+        np.testing.assert_array_equal(ld.loadGrid(), grid)
+
+    def test_removeGridFile(self):
+        ld.loadGrid()
+        ld.removeGridFile()
+
+        self.assertFalse(os.path.exists(self.gridPath))
+        ld.removeGridFile()  # no error when there isn't one
+
+    def test_unwritable_directory_keeps_grid_in_memory(self):
+        ld._gridPath = lambda: os.path.join(self.tempDir, 'missing', 'quadratic.npy')
+
+        self.assertEqual(ld.loadGrid().shape[-1], len(ld.wavelengths))
+        self.assertEqual(os.listdir(self.tempDir), [])
+
+
+class Test_quadraticCoeffsBatch(TestCase):
+
+    def setUp(self):
+        random = np.random.RandomState(2)
+        self.T = random.uniform(3000, 51000, 50)
+        self.logg = random.uniform(0, 5.5, 50)
+        self.Z = random.uniform(-5, 1, 50)
+        self.wavelengths = np.array([0.2, 0.365, 0.5, 1.22, 2.0, 3.45, 4.])
+
+    def test_nearest_matches_quadraticCoeffs(self):
+        u1, u2 = ld.quadraticCoeffsBatch(self.T, self.logg, self.Z, self.wavelengths, method='nearest')
+        self.assertEqual(u1.shape, (50, 7))
+
+        for star, (T, logg, Z) in enumerate(zip(self.T, self.logg, self.Z)):
+            for index, wavelength in enumerate(self.wavelengths):
+                try:
+                    expected = ld.quadraticCoeffs(T, logg, Z, wavelength)
+                except ValueError:
+                    self.assertTrue(np.isnan(u1[star, index]) and np.isnan(u2[star, index]))
+                else:
+                    self.assertAlmostEqual(u1[star, index], expected[0], 12)
+                    self.assertAlmostEqual(u2[star, index], expected[1], 12)
+
+    def test_linear_on_nodes_matches_nearest(self):
+        T = np.array([5750., 6000., 4000.])
+        logg = np.array([4.5, 4., 5.])
+        Z = np.array([0., -0.5, 0.3])
+
+        linear = ld.quadraticCoeffsBatch(T, logg, Z, self.wavelengths)
+        nearest = ld.quadraticCoeffsBatch(T, logg, Z, self.wavelengths, method='nearest')
+
+        np.testing.assert_allclose(linear, nearest)
+
+    def test_linear_interpolates_between_nodes(self):
+        lower = ld.quadraticCoeffsBatch(5750., 4.5, 0., self.wavelengths)
+        upper = ld.quadraticCoeffsBatch(6000., 4.5, 0., self.wavelengths)
+        middle = ld.quadraticCoeffsBatch(5875., 4.5, 0., self.wavelengths)
+
+        np.testing.assert_allclose(middle, (np.array(lower) + np.array(upper)) / 2)
+
+    def test_scalars_broadcast(self):
+        u1, u2 = ld.quadraticCoeffsBatch(np.array([5800., 6100.]), 4.5, 0., 1.22)
+
+        self.assertEqual(u1.shape, (2, 1))
+
+    def test_nan_parameters_give_nan(self):
+        u1, u2 = ld.quadraticCoeffsBatch(np.array([np.nan, 5800.]), 4.5, 0., self.wavelengths)
+
+        self.assertTrue(np.isnan(u1[0]).all())
+        self.assertFalse(np.isnan(u1[1]).any())
+
+    def test_invalid_method(self):
+        with self.assertRaises(ValueError):
+            ld.quadraticCoeffsBatch(5800., 4.5, 0., method='cubic')
+
+
+if __name__ == '__main__':
+    unittest.main()
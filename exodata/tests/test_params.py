@@ -2,6 +2,7 @@
 here. just that the calculation is performed.
 """
 import unittest
+import threading
 
 import numpy as np
 
@@ -113,4 +114,58 @@ class estimateMissingValuesBinary(estimateMissingValues):
         params.estimateMissingValues = False
         del self.binary.params['period']
         self.assertTrue(self.binary.P is np.nan)
-        self.assertTrue('Calculated Period' not in self.binary.flags.flags)
\ No newline at end of file
+        self.assertTrue('Calculated Period' not in self.binary.flags.flags)
+
+
+class estimationScope(estimateMissingValues):
+
+    def setUp(self):
+        self.planet = ex.genExamplePlanet()
+        del self.planet.params['temperature']
+
+    def test_scoped_mode_overrides_global(self):
+        with params.estimation(False):
+            self.assertTrue(self.planet.T is np.nan)
+            self.assertFalse(params.estimating())
+
+        self.assertAlmostEqual(self.planet.T, 402.175111 * aq.K, 4)
+
+        params.estimateMissingValues = False
+        with params.estimation(True):
+            self.assertAlmostEqual(self.planet.T, 402.175111 * aq.K, 4)
+        self.assertTrue(self.planet.T is np.nan)
+
+    def test_scopes_nest(self):
+        with params.estimation(False):
+            with params.estimation(True):
+                self.assertTrue(params.estimating())
+            self.assertFalse(params.estimating())
+
+    def test_object_setting(self):
+        self.planet.estimateMissingValues = False
+        self.assertTrue(self.planet.T is np.nan)
+
+        with params.estimation(True):
+            self.assertAlmostEqual(self.planet.T, 402.175111 * aq.K, 4)
+
+    def test_scope_is_per_thread(self):
+        inside = threading.Event()
+        release = threading.Event()
+        results = {}
+
+        def raw():
+            with params.estimation(False):
+                inside.set()
+                release.wait(5)
+                results['raw'] = self.planet.T
+
+        thread = threading.Thread(target=raw)
+        thread.start()
+        inside.wait(5)
+        results['estimated'] = self.planet.T  # while the other thread is in its with block
+        release.set()
+        thread.join()
+
+        self.assertTrue(results['raw'] is np.nan)
+        self.assertAlmostEqual(results['estimated'], 402.175111 * aq.K, 4)
+
@@ -1,4 +1,7 @@
+import os
 import unittest
+from tempfile import mkdtemp
+import shutil
 
 from .patches import TestCase
 
@@ -6,8 +9,11 @@ import numpy as np
 
 
 from ..example import genExamplePlanet
-from ..plots import DataPerParameterBin, GeneralPlotter, _AstroObjectFigs, _GlobalFigure, _planetPars, _starPars
+from ..plots import (DataPerParameterBin, DiscoveryMethodByYear, GeneralPlotter, _AstroObjectFigs, _GlobalFigure, _planetPars, _starPars,
+                     countPerParameterBin, _sortValueIntoGroup, _sortValuesIntoGroups, BelowLimitsError,
+                     AboveLimitsError, _BaseDataPerClass)
 from .. import astroquantities as aq
+from .. import columns
 
 
 class Test_GlobalFigure(TestCase):
@@ -139,6 +145,143 @@ class Test_DataPerParameterBin(TestCase):
             DataPerParameterBin(starlist, param, (-float('inf'), 0, 5, float('inf'))).plotPieChart()
 
 
+class _PlanetTypeKeysPerObject(_BaseDataPerClass):
+
+    def _classVariables(self):
+        self._allowedKeys = ('Super-Earth', 'Neptune', 'Jupiter', None)
+
+    def _getSortKey(self, planet):
+        return planet.massType()
+
+
+class _PlanetTypeKeysInBulk(_PlanetTypeKeysPerObject):
+
+    def _getSortKey(self, planet):
+        raise AssertionError('the keys should be built in bulk')
+
+    def _sortKeys(self):
+        return columns.planetTypeColumns(self.objectList)['massType']
+
+
+class Test_BaseDataPerClass(TestCase):
+
+    def setUp(self):
+        self.planets = generate_list_of_planets(4)
+        self.planets[1].params['mass'] = 0.01 * aq.M_j
+        self.planets[2].params['mass'] = 0.05 * aq.M_j
+        del self.planets[3].params['mass']
+        del self.planets[3].params['radius']
+
+    def test_bulk_keys_match_per_object_keys(self):
+        expected = _PlanetTypeKeysPerObject(self.planets).resultsByClass
+
+        self.assertEqual(_PlanetTypeKeysInBulk(self.planets).resultsByClass, expected)
+        self.assertEqual(list(expected.values()), [1, 1, 1, 1])
+
+    def test_default_key(self):
+        self.assertEqual(dict(_BaseDataPerClass(self.planets).resultsByClass), {'Class': 4})
+
+
+class Test_countPerParameterBin(TestCase):
+
+    def test_matches_sortValueIntoGroup(self):
+        keys = ('a', 'b', 'c', 'd')
+        for limits in ((0, 0.2, 0.4, 0.6, 1.), (-float('inf'), 0, 0.5, 5, float('inf')), (0, 0.2, 0.2, 0.6, 1.)):
+            values = [0, 0.1, 0.2, 0.3, 0.4, 0.45, 0.6, 0.9, 1., limits[0], limits[-1], np.nan]
+            expected = [_sortValueIntoGroup(keys, limits, value) for value in values]
+
+            indices = _sortValuesIntoGroups(limits, values)
+            self.assertEqual([keys[i] if i >= 0 else 'Uncertain' for i in indices], expected, limits)
+
+    def test_out_of_limits_raises(self):
+        with self.assertRaises(BelowLimitsError):
+            _sortValuesIntoGroups((0, 1, 2), [0.5, np.nan, -1, 5])
+        with self.assertRaises(AboveLimitsError):
+            _sortValuesIntoGroups((0, 1, 2), [0.5, np.nan, 5, -1])
+
+    def test_several_properties(self):
+        planets = generate_list_of_planets(4)
+        for planet, e, R in zip(planets, (0, 0.1, 0.5, np.nan), (0.1, 0.5, 1, 2)):
+            planet.params['eccentricity'] = e
+            planet.params['radius'] = R * aq.R_j
+
+        binSpecs = [('e', (0, 0.2, 0.6), None), ('R', (0, 5, 15, float('inf')), aq.R_e), ('star.M', (0, 1, 2), None)]
+        result = countPerParameterBin(planets, binSpecs)
+
+        self.assertEqual(list(result), ['e', 'R', 'star.M'])
+        for prop, binLimits, unit in binSpecs:
+            self.assertDictEqual(result[prop], DataPerParameterBin(planets, prop, binLimits, unit).resultsByClass)
+        self.assertDictEqual(result['R'], {'0 to 5': 1, '5 to 15': 2, '15+': 1, 'Uncertain': 0})
+
+
+class Test_DiscoveryMethodByYear(TestCase):
+
+    def setUp(self):
+        self.planets = generate_list_of_planets(7)
+        for planet, year, method in zip(self.planets, (2009, 2010, 2010, 2012, 2012, np.nan, 2000),
+                                        ('RV', 'transit', 'imaging', 'RV', np.nan, 'RV', 'RV')):
+            planet.params['discoveryyear'] = year
+            planet.params['discoverymethod'] = method
+        self.planets[-1].params['list'] = ['Solar System']
+
+    def test_generate_data(self):
+        plot_matrix, year_list, discovery_years = DiscoveryMethodByYear(self.planets).generate_data()
+
+        self.assertEqual(list(year_list), [2009, 2010, 2011, 2012])
+        self.assertEqual(plot_matrix[2010], {'RV': 0, 'transit': 1, 'Other': 1})
+        self.assertEqual(plot_matrix[2012], {'RV': 1, 'transit': 0, 'Other': 1})
+        self.assertEqual(plot_matrix[2011], {'RV': 0, 'transit': 0, 'Other': 0})
+        self.assertEqual(discovery_years[2010], 2)
+        self.assertEqual(sum(discovery_years.values()), 6)
+
+    def test_without_other(self):
+        plot_matrix, year_list, discovery_years = DiscoveryMethodByYear(self.planets, ('RV',)).generate_data()
+
+        self.assertEqual(plot_matrix[2010], {'RV': 0})
+        self.assertEqual(plot_matrix[2012], {'RV': 1})
+
+    def test_include_solar_system(self):
+        data = DiscoveryMethodByYear(self.planets, skip_solar_system_planets=False)
+        plot_matrix, year_list, discovery_years = data.generate_data()
+
+        self.assertEqual(year_list[0], 2000)
+        self.assertEqual(plot_matrix[2000]['RV'], 1)
+
+    def test_cumulative_counts(self):
+        year_list, counts, cumulative, year_totals = DiscoveryMethodByYear(self.planets).cumulative_counts()
+
+        self.assertEqual(list(year_list), [2009, 2010, 2011, 2012])
+        np.testing.assert_array_equal(counts, [[1, 0, 0, 1], [0, 1, 0, 0], [0, 1, 0, 1]])
+        np.testing.assert_array_equal(cumulative, [[1, 1, 1, 2], [0, 1, 1, 1], [0, 1, 1, 2]])
+        np.testing.assert_array_equal(year_totals, [1, 2, 0, 2])
+
+    def test_animate_frames(self):
+        tempDir = mkdtemp()
+        try:
+            frames = DiscoveryMethodByYear(self.planets).animate(frame_directory=os.path.join(tempDir, 'frames'),
+                                                                 dpi=20)
+
+            self.assertEqual([os.path.basename(frame) for frame in frames],
+                             ['frame_0000.png', 'frame_0001.png', 'frame_0002.png', 'frame_0003.png'])
+            self.assertTrue(all(os.path.getsize(frame) for frame in frames))
+
+            filename = os.path.join(tempDir, 'discovery.gif')
+            self.assertEqual(DiscoveryMethodByYear(self.planets).animate(filename, dpi=20), [])
+            self.assertTrue(os.path.getsize(filename))
+        finally:
+            shutil.rmtree(tempDir)
+
+    def test_animate_needs_output(self):
+        with self.assertRaises(ValueError):
+            DiscoveryMethodByYear(self.planets).animate()
+
+    def test_setup_keys(self):
+        data = DiscoveryMethodByYear(self.planets)
+        data.setup_keys()
+
+        self.assertEqual(data.nan_list, [self.planets[4]])
+
+
 def generate_list_of_planets(number):
     planetList = []
     for i in range(number):
@@ -241,6 +384,42 @@ class Test_GeneralPlotter(TestCase):
             # print(param, [eval('star.'+param) for star in starlist])
             fig = GeneralPlotter(starlist, param, 'R').plot()
 
+    def density_plotter(self, xaxislog=False, yaxislog=False):
+        fig = GeneralPlotter(generate_list_of_planets(1), 'R', 'M', xaxislog=xaxislog, yaxislog=yaxislog)
+        fig._xaxis = np.array([1., 2., 2., 10., np.nan, -1.])
+        fig._yaxis = np.array([1., 1., 1., 100., 5., 5.])
+        return fig
+
+    def test_plot_density(self):
+        fig = self.density_plotter()
+        fig.plot(mode='density', bins=4)
+
+        mesh, = fig.ax.collections
+        self.assertEqual(mesh.get_array().count(), 3)  # non empty bins
+        self.assertEqual(mesh.get_array().sum(), 5)  # the nan is dropped
+
+    def test_plot_density_log_axes(self):
+        fig = self.density_plotter(xaxislog=True, yaxislog=True)
+        fig.plot(mode='density', bins=2)
+
+        mesh, = fig.ax.collections
+        self.assertEqual(mesh.get_array().sum(), 4)  # -1 can't be placed on a log axis
+        np.testing.assert_allclose(mesh.get_coordinates()[0, :, 0], (1, 10**0.5, 10))
+
+    def test_plot_auto_mode(self):
+        fig = self.density_plotter()
+        fig.densityThreshold = 5
+        fig.plot()
+        self.assertEqual(type(fig.ax.collections[0]).__name__, 'QuadMesh')
+
+        fig = self.density_plotter()
+        fig.plot()
+        self.assertEqual(type(fig.ax.collections[0]).__name__, 'PathCollection')
+
+    def test_plot_invalid_mode(self):
+        with self.assertRaises(ValueError):
+            self.density_plotter().plot(mode='hexagons')
+
     def test_mix_of_planet_and_star_classes_on_input_raises_TypeError(self):
         planetlist = generate_list_of_planets(3)
         starlist = [planet.star for planet in planetlist]
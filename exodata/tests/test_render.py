@@ -0,0 +1,246 @@
+import os
+import time
+import threading
+import unittest
+from tempfile import mkdtemp
+import shutil
+
+from .patches import TestCase
+
+from ..example import genExamplePlanet
+from ..plots import GeneralPlotter
+from ..render import FigureSpec, renderFigures, timingReport, RenderResult, FigureCache
+from .. import plots
+from .. import params as ed_params
+from .. import astroquantities as aq
+
+
+class Test_renderFigures(TestCase):
+
+    def setUp(self):
+        self.tempDir = mkdtemp()
+        self.planets = [genExamplePlanet() for i in range(3)]
+        for planet, year in zip(self.planets, (2001, 2003, 2004)):
+            planet.params['discoveryyear'] = year
+            planet.params['discoverymethod'] = 'RV'
+
+        self.specs = [FigureSpec('scatter.png', 'GeneralPlotter', ('R', 'M')),
+                      FigureSpec('bins.png', 'DataPerParameterBin', ('R', (0, 1, float('inf'))),
+                                 method='plotPieChart'),
+                      FigureSpec(os.path.join('sub', 'discovery.pdf'), 'DiscoveryMethodByYear',
+                                 methodKwargs={'exodata_credit': False}),
+                      FigureSpec('stars.png', GeneralPlotter, ('R', 'M'), objects='stars')]
+
+    def tearDown(self):
+        shutil.rmtree(self.tempDir)
+
+    def check_results(self, results):
+        self.assertEqual([result.filename for result in results], [spec.filename for spec in self.specs])
+
+        for result in results[:2]:
+            self.assertIsNone(result.error)
+            self.assertTrue(os.path.getsize(result.path) > 0)
+            self.assertTrue(result.seconds >= 0)
+
+        self.assertIn('No such file or directory', results[2].error)  # sub doesn't exist
+        self.assertIsNone(results[2].path)
+        self.assertEqual(results[3].error, "KeyError: 'stars'")
+
+    def test_serial(self):
+        self.check_results(renderFigures(self.specs, self.tempDir, self.planets, processes=1))
+        self.assertFalse(plots._headlessScope.get())
+
+    def test_process_pool(self):
+        self.check_results(renderFigures(self.specs, self.tempDir, {'planets': self.planets}, processes=2))
+
+    def test_savefig_kwargs(self):
+        spec = FigureSpec('scatter.png', 'GeneralPlotter', ('R', 'M'))
+        small, = renderFigures([spec], os.path.join(self.tempDir, 'small'), self.planets, savefigKwargs={'dpi': 20})
+        large, = renderFigures([spec], os.path.join(self.tempDir, 'large'), self.planets, savefigKwargs={'dpi': 200})
+
+        self.assertTrue(os.path.getsize(small.path) < os.path.getsize(large.path))
+
+
+class Test_headless(TestCase):
+
+    def test_figure_not_tracked_by_pyplot(self):
+        import matplotlib.pyplot as plt
+
+        before = plt.get_fignums()
+        with plots.headless():
+            fig = GeneralPlotter([genExamplePlanet()], 'R', 'M')
+            fig.plot()
+        self.assertEqual(plt.get_fignums(), before)
+        self.assertFalse(plots._headlessScope.get())
+
+    def test_headless_is_per_thread(self):
+        inThread = []
+        with plots.headless():
+            thread = threading.Thread(target=lambda: inThread.append(plots._headlessScope.get()))
+            thread.start()
+            thread.join()
+
+        self.assertEqual(inThread, [False])
+
+
+class FakeCatalogue(object):
+
+    def __init__(self, fingerprint, planets):
+        self.fingerprint = fingerprint
+        self.planets = planets
+
+
+class Test_FigureCache(TestCase):
+
+    def setUp(self):
+        self.catalogue = FakeCatalogue('a', [genExamplePlanet() for i in range(3)])
+        self.spec = FigureSpec('scatter.png', 'GeneralPlotter', ('R', 'M'), dict(xunit=aq.R_e))
+
+    def test_hit_returns_same_bytes(self):
+        cache = FigureCache()
+        image = cache.get(self.spec, self.catalogue)
+
+        self.assertTrue(image.startswith(b'\x89PNG'))
+        self.assertIs(cache.get(self.spec._replace(filename='other.png'), self.catalogue), image)
+        self.assertEqual((cache.hits, cache.misses, len(cache)), (1, 1, 1))
+        self.assertEqual(cache.nbytes, len(image))
+
+    def test_key_includes_spec_catalogue_and_mode(self):
+        cache = FigureCache()
+        cache.get(self.spec, self.catalogue)
+
+        cache.get(self.spec._replace(kwargs=dict(xunit=aq.R_j)), self.catalogue)
+        cache.get(self.spec._replace(filename='scatter.svg'), self.catalogue)
+        cache.get(self.spec, FakeCatalogue('b', self.catalogue.planets))  # reloaded with changes
+        cache.get(self.spec, self.catalogue, savefigKwargs={'dpi': 20})
+        with ed_params.estimation(False):
+            cache.get(self.spec, self.catalogue)
+
+        self.assertEqual((cache.hits, cache.misses), (0, 6))
+
+    def test_changing_the_catalogue_in_place(self):
+        cache = FigureCache()
+        image = cache.get(self.spec, self.catalogue)
+
+        self.catalogue.planets[0].R = 5 * aq.R_j
+
+        self.assertIsNot(cache.get(self.spec, self.catalogue), image)
+        self.assertEqual((cache.hits, cache.misses), (0, 2))
+
+    def test_lru_eviction(self):
+        cache = FigureCache(maxFigures=2)
+        specs = [self.spec._replace(args=args, kwargs={}) for args in (('R', 'M'), ('M', 'R'), ('R', 'R'))]
+
+        cache.get(specs[0], self.catalogue)
+        cache.get(specs[1], self.catalogue)
+        cache.get(specs[0], self.catalogue)  # now most recently used
+        cache.get(specs[2], self.catalogue)  # evicts specs[1]
+        self.assertEqual(len(cache), 2)
+
+        cache.get(specs[0], self.catalogue)
+        self.assertEqual(cache.hits, 2)
+        cache.get(specs[1], self.catalogue)
+        self.assertEqual(cache.misses, 4)
+
+    def test_max_bytes(self):
+        cache = FigureCache(maxBytes=10)
+        image = cache.get(self.spec, self.catalogue)
+
+        self.assertTrue(len(image) > 10)
+        self.assertEqual((len(cache), cache.nbytes), (0, 0))
+
+        cache = FigureCache(maxBytes=int(len(image) * 1.5))
+        cache.get(self.spec, self.catalogue)
+        cache.get(self.spec._replace(args=('M', 'R'), kwargs={}), self.catalogue)
+        self.assertEqual(len(cache), 1)
+        self.assertTrue(cache.nbytes <= cache.maxBytes)
+
+        cache.clear()
+        self.assertEqual((len(cache), cache.nbytes), (0, 0))
+
+
+class BlockingFigureCache(FigureCache):
+    """ renders wait for release to be set, counting the renders
+    """
+
+    def __init__(self, *args, **kwargs):
+        FigureCache.__init__(self, *args, **kwargs)
+        self.rendering = threading.Event()
+        self.release = threading.Event()
+        self.renders = 0
+
+    def _render(self, spec, catalogue, savefigKwargs):
+        self.renders += 1
+        self.rendering.set()
+        self.release.wait(10)
+        return FigureCache._render(self, spec, catalogue, savefigKwargs)
+
+
+class Test_FigureCacheThreads(TestCase):
+
+    def setUp(self):
+        self.catalogue = FakeCatalogue('a', [genExamplePlanet() for i in range(3)])
+        self.spec = FigureSpec('scatter.png', 'GeneralPlotter', ('R', 'M'), {})
+        self.cache = BlockingFigureCache()
+        self.images = []
+
+    def getInThread(self, spec):
+        thread = threading.Thread(target=lambda: self.images.append(self.cache.get(spec, self.catalogue)))
+        thread.start()
+        return thread
+
+    def test_hit_doesnt_wait_for_a_render(self):
+        self.cache.release.set()
+        cached = self.cache.get(self.spec, self.catalogue)
+        self.cache.release.clear()
+
+        thread = self.getInThread(self.spec._replace(args=('M', 'R')))
+        self.cache.rendering.wait(10)
+        try:
+            self.assertIs(self.cache.get(self.spec, self.catalogue), cached)  # while the other figure is rendered
+            self.assertEqual(self.images, [])
+        finally:
+            self.cache.release.set()
+            thread.join()
+
+        self.assertEqual(len(self.cache), 2)
+
+    def test_same_figure_rendered_once(self):
+        first = self.getInThread(self.spec)
+        self.cache.rendering.wait(10)
+        second = self.getInThread(self.spec)
+        deadline = time.time() + 10
+        while not self.cache.waits and time.time() < deadline:  # until the second thread waits for the render
+            time.sleep(0.001)
+
+        self.cache.release.set()
+        first.join()
+        second.join()
+
+        self.assertEqual(self.cache.renders, 1)
+        self.assertIs(self.images[0], self.images[1])
+        self.assertEqual((self.cache.hits, self.cache.misses, self.cache.waits), (0, 1, 1))
+
+    def test_failed_render_isnt_cached(self):
+        self.cache.release.set()
+        spec = self.spec._replace(objects='stars')
+
+        with self.assertRaises(AttributeError):
+            self.cache.get(spec, self.catalogue)
+
+        self.assertEqual((len(self.cache), self.cache._rendering), (0, {}))
+
+
+class Test_timingReport(TestCase):
+
+    def test_report(self):
+        results = [RenderResult('a.png', 'out/a.png', 0.5, None), RenderResult('b.png', None, 1.5, 'KeyError: x')]
+        report = timingReport(results).splitlines()
+
+        self.assertEqual(report[0], '    1.500s  b.png  FAILED KeyError: x')
+        self.assertEqual(report[1], '    0.500s  a.png  ok')
+        self.assertEqual(report[2], '    2.000s  total for 2 figures, 1 failed')
+
+
+if __name__ == '__main__':
+    unittest.main()
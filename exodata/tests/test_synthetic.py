@@ -0,0 +1,89 @@
+import os
+import gzip
+import unittest
+from tempfile import mkdtemp
+import shutil
+import xml.etree.ElementTree as ET
+
+from .patches import TestCase
+
+from .. import OECDatabase
+from .. import synthetic
+
+
+class Test_generateSystems(TestCase):
+
+    def test_reproducible(self):
+        first = [ET.tostring(system) for system in synthetic.generateSystems(20, seed=3)]
+
+        self.assertEqual(first, [ET.tostring(system) for system in synthetic.generateSystems(20, seed=3)])
+        self.assertNotEqual(first, [ET.tostring(system) for system in synthetic.generateSystems(20, seed=4)])
+
+    def test_counts(self):
+        systems = synthetic.generateSystems(40, binaryFraction=0.25, multiPlanetFraction=0.5, maxPlanets=3,
+                                            circumbinaryFraction=0)
+
+        self.assertEqual(len(systems), 40)
+        self.assertEqual(sum(system.find('binary') is not None for system in systems), 10)
+
+        planetCounts = [len(system.findall('.//planet')) for system in systems]
+        self.assertEqual(sum(count > 1 for count in planetCounts), 20)
+        self.assertEqual(max(planetCounts), 3)
+        self.assertEqual(sum(len(system.findall('binary/planet')) for system in systems), 0)
+
+    def test_circumbinary(self):
+        systems = synthetic.generateSystems(10, binaryFraction=1, circumbinaryFraction=1)
+
+        self.assertTrue(all(system.findall('binary/planet') for system in systems))
+
+    def test_missing_values(self):
+        complete = synthetic.generateSystems(20, missingRate=0)
+        self.assertTrue(all(planet.find('mass') is not None for system in complete for planet in system.iter('planet')))
+
+        empty = synthetic.generateSystems(20, binaryFraction=0, missingRate=1)
+        for system in empty:
+            self.assertEqual(sorted(element.tag for element in system), ['declination', 'name', 'rightascension', 'star'])
+            for planet in system.iter('planet'):
+                self.assertEqual(set(element.tag for element in planet),
+                                 {'name', 'list', 'discoverymethod', 'istransiting', 'discoveryyear'})
+
+    def test_altnames_and_coordinates(self):
+        systems = synthetic.generateSystems(10, binaryFraction=0, altnameRate=1, coordinates=False)
+
+        for system in systems:
+            self.assertIsNone(system.find('rightascension'))
+            self.assertTrue(len(system.find('star').findall('name')) > 1)
+
+        self.assertTrue(all(len(system.find('star').findall('name')) == 1
+                            for system in synthetic.generateSystems(10, binaryFraction=0, altnameRate=0)))
+
+
+class Test_writeSystems(TestCase):
+
+    def setUp(self):
+        self.tempDir = mkdtemp()
+        self.systems = synthetic.generateSystems(30, binaryFraction=0.2, altnameRate=1, seed=1)
+
+    def tearDown(self):
+        shutil.rmtree(self.tempDir)
+
+    def test_folder_and_stream_load_the_same_catalogue(self):
+        paths = synthetic.writeSystemsFolder(os.path.join(self.tempDir, 'systems'), self.systems)
+        streamPath = synthetic.writeSystemsStream(os.path.join(self.tempDir, 'systems.xml.gz'), self.systems)
+        self.assertEqual(len(paths), 30)
+
+        folder = OECDatabase(os.path.join(self.tempDir, 'systems', ''))
+        with gzip.open(streamPath) as f:
+            stream = OECDatabase(f, stream=True)
+
+        self.assertEqual(len(folder.systems), 30)
+        self.assertEqual(len(folder.binaries), 6)
+        self.assertEqual(sorted(folder.planetDict), sorted(stream.planetDict))
+
+        planet = folder.planetDict['Synth 1 b']
+        self.assertEqual(planet.star.name, stream.planetDict['Synth 1 b'].star.name)
+        self.assertEqual(folder.searchPlanet(planet.params['altnames'][0]), planet)
+
+
+if __name__ == '__main__':
+    unittest.main()